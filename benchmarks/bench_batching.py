@@ -0,0 +1,68 @@
+"""
+Throughput of many concurrent small predict calls: direct Deployable.predict per request
+against a MicroBatcher coalescing them into vectorized calls.
+
+    python benchmarks/bench_batching.py --requests 5000 --threads 32 --max-wait 0.002
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from common import timed
+from mlopslite.artifacts.batching import MicroBatcher
+from mlopslite.artifacts.dataset import create_dataset
+from mlopslite.artifacts.deployable import create_deployable
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rows", type=int, default=4, help="rows per request")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--max-wait", type=float, default=0.002)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    columns = [f"x{i}" for i in range(args.features)]
+    train = pd.DataFrame(rng.normal(size=(5000, args.features)), columns=columns)
+    train["target"] = rng.choice(["a", "b", "c"], size=len(train))
+
+    model = make_pipeline(StandardScaler(), LogisticRegression()).fit(train[columns], train["target"])
+    deployable = create_deployable(model, create_dataset(train, name="bench"), name="bench", target="target")
+
+    requests = [
+        pd.DataFrame(rng.normal(size=(args.rows, args.features)), columns=columns).to_dict("records")
+        for _ in range(args.requests)
+    ]
+
+    def run(predict):
+        with ThreadPoolExecutor(args.threads) as pool:
+            list(pool.map(predict, requests))
+
+    direct = timed(run, deployable.predict)
+
+    with MicroBatcher(deployable, max_batch_size=args.max_batch_size, max_wait=args.max_wait) as batcher:
+        batched = timed(run, batcher.predict)
+        metrics = batcher.metrics()
+
+    print(f"{'':>10}{'seconds':>10}{'req/s':>10}")
+    print(f"{'direct':>10}{direct:>10.2f}{args.requests / direct:>10.0f}")
+    print(f"{'batched':>10}{batched:>10.2f}{args.requests / batched:>10.0f}")
+    print(
+        f"batches: {metrics['batches']}, mean rows {metrics['mean_batch_rows']:.1f}, "
+        f"mean requests {metrics['mean_batch_requests']:.1f}, max queue depth {metrics['max_queue_depth']}, "
+        f"mean wait {metrics['mean_wait_ms']:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Offline scoring of a Parquet file: single Deployable.predict on the whole frame against
+chunked predict_batch across a process pool, written to a Parquet sink.
+
+    python benchmarks/bench_bulk.py --rows 2000000 --workers 4
+"""
+
+import argparse
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from common import timed
+from mlopslite.artifacts.bulk import predict_batch
+from mlopslite.artifacts.dataset import create_dataset
+from mlopslite.artifacts.deployable import create_deployable
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    columns = [f"x{i}" for i in range(args.features)]
+    train = pd.DataFrame(rng.normal(size=(5000, args.features)), columns=columns)
+    train["target"] = rng.choice(["a", "b", "c"], size=len(train))
+
+    model = make_pipeline(StandardScaler(), RandomForestClassifier(n_estimators=50, n_jobs=1, random_state=1))
+    model.fit(train[columns], train["target"])
+    deployable = create_deployable(model, create_dataset(train, name="bench"), name="bench", target="target")
+
+    directory = tempfile.mkdtemp(prefix="mlopslite-bench-")
+    source = os.path.join(directory, "input.parquet")
+    pd.DataFrame(rng.normal(size=(args.rows, args.features)), columns=columns).to_parquet(source, index=False)
+
+    def single():
+        deployable.predict(pd.read_parquet(source), output="arrays").to_frame().to_parquet(os.path.join(directory, "single.parquet"))
+
+    print(f"{'':>22}{'seconds':>10}{'rows/s':>12}")
+    for name, fn in [
+        ("single predict", single),
+        ("chunked, in process", lambda: predict_batch(deployable, source, os.path.join(directory, "out0.parquet"), chunk_size=args.chunk_size, workers=0)),
+        (f"chunked, {args.workers} workers", lambda: predict_batch(deployable, source, os.path.join(directory, "outn.parquet"), chunk_size=args.chunk_size, workers=args.workers)),
+    ]:
+        seconds = timed(fn)
+        print(f"{name:>22}{seconds:>10.2f}{args.rows / seconds:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
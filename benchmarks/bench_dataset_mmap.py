@@ -0,0 +1,52 @@
+"""
+Memory mapped dataset pulls: time and peak Python heap (tracemalloc, includes numpy buffers)
+of a regular pull against the first (spilling) and later mmap pulls of a numeric dataset.
+
+    python benchmarks/bench_dataset_mmap.py --rows 2000000 --cols 20
+"""
+
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from common import temp_sqlite_config, timed
+from mlopslite.artifacts.dataset import create_dataset
+from mlopslite.registry.registry import Registry
+
+
+def measure(fn) -> tuple[float, float]:
+    tracemalloc.start()
+    elapsed = timed(fn)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--cols", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    data = pd.DataFrame(rng.normal(size=(args.rows, args.cols)), columns=[f"col_{i}" for i in range(args.cols)])
+    print(f"{args.rows} rows x {args.cols} float columns, {data.memory_usage().sum() / 1e6:.0f} MB in memory")
+
+    config = temp_sqlite_config(dataset_cache_dir=os.path.join(tempfile.mkdtemp(prefix="mlopslite-bench-"), "datasets"))
+    registry = Registry(config=config)
+    id = registry.push_dataset_to_registry(create_dataset(data, name="bench"))["id"]
+    del data
+
+    print(f"{'pull':<14}{'time (s)':>10}{'peak heap (MB)':>16}")
+    for name, mmap in [("regular", False), ("mmap, first", True), ("mmap, cached", True)]:
+        elapsed, peak = measure(lambda: registry.pull_dataset_from_registry(id, mmap=mmap))
+        print(f"{name:<14}{elapsed:>10.3f}{peak:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Dataset storage benchmark: push/pull time and SQLite file size per dataset format.
+
+    python benchmarks/bench_dataset_storage.py --rows 500000 --cols 20
+"""
+
+import argparse
+import importlib.util
+
+from common import make_data, sqlite_file_size, temp_sqlite_config, timed
+from mlopslite.artifacts.dataset import create_dataset
+from mlopslite.registry.registry import Registry
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--cols", type=int, default=12)
+    args = parser.parse_args()
+
+    data = make_data(args.rows, args.cols)
+    dataset = create_dataset(data, name="bench")
+
+    formats = ["json", "npy", "npz"]
+    if importlib.util.find_spec("pyarrow") is not None:
+        formats += ["parquet", "arrow"]
+
+    print(f"{args.rows} rows x {args.cols} columns")
+    print(f"{'format':<10}{'push (s)':>10}{'pull (s)':>10}{'db size (MB)':>14}")
+
+    for format in formats:
+        config = temp_sqlite_config(dataset_format=format)
+        registry = Registry(config=config)
+
+        ref = {}
+        push = timed(lambda: ref.update(registry.push_dataset_to_registry(dataset)))
+        pull = timed(registry.pull_dataset_from_registry, ref["id"])
+        size = sqlite_file_size(config) / 1e6
+
+        print(f"{format:<10}{push:>10.3f}{pull:>10.3f}{size:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
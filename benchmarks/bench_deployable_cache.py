@@ -0,0 +1,55 @@
+"""
+Deployable pull latency: DB round trip + unpickling against the on-disk and in-memory caches.
+The registry here is a local SQLite file, the disk cache pays off against a remote database.
+Memory hits need no DB lookup, misses look up the artifact hash of the id (the on-disk cache key).
+
+    python benchmarks/bench_deployable_cache.py --trees 200
+"""
+
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import make_pipeline
+
+from common import temp_sqlite_config, timed
+from mlopslite.artifacts.dataset import create_dataset
+from mlopslite.artifacts.deployable import create_deployable
+from mlopslite.registry.registry import Registry
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    train = pd.DataFrame(rng.normal(size=(2000, 10)), columns=[f"x{i}" for i in range(10)])
+    train["target"] = rng.choice(["a", "b"], size=len(train))
+    model = make_pipeline(RandomForestClassifier(n_estimators=args.trees)).fit(train.drop(columns="target"), train["target"])
+
+    config = temp_sqlite_config(deployable_cache_items=0)
+    registry = Registry(config=config)
+    dataset_ref = registry.push_dataset_to_registry(create_dataset(train, name="bench"))
+    dataset = registry.pull_dataset_from_registry(dataset_ref["id"])
+    id = registry.push_deployable_to_registry(create_deployable(model, dataset, name="bench", target="target"))["id"]
+
+    def per_pull(registry: Registry) -> float:
+        registry.pull_deployable_from_registry(id)  # warm up
+        return timed(lambda: [registry.pull_deployable_from_registry(id) for _ in range(args.repeat)]) / args.repeat
+
+    print(f"no cache (db + unpickle) : {per_pull(registry) * 1e3:10.3f} ms")
+
+    config.deployable_cache_dir = tempfile.mkdtemp(prefix="mlopslite-bench-cache-")
+    print(f"disk cache + unpickle    : {per_pull(Registry(config=config)) * 1e3:10.3f} ms")
+
+    config.deployable_cache_items = 8
+    print(f"memory cache             : {per_pull(Registry(config=config)) * 1e3:10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Dataset hashing benchmark: legacy md5 over the json dump against the chunked column hash.
+
+    python benchmarks/bench_hashing.py --rows 1000000 --cols 20
+"""
+
+import argparse
+
+from common import make_data, timed
+from mlopslite.artifacts.dataset import create_dataset
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--cols", type=int, default=12)
+    args = parser.parse_args()
+
+    dataset = create_dataset(make_data(args.rows, args.cols), name="bench")
+    print(f"hashing {args.rows} rows x {args.cols} columns")
+    print(f"legacy  : {timed(dataset.get_data_hash, mode='legacy'):8.3f}s")
+    print(f"chunked : {timed(dataset.get_data_hash, mode='chunked'):8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Peak memory and time of registering a CSV: pd.read_csv + bind_dataset against chunked bind_dataset_stream.
+Peak memory is traced allocations (tracemalloc, numpy and pandas buffers included).
+
+    python benchmarks/bench_ingest.py --rows 2000000 --cols 12
+"""
+
+import argparse
+import os
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+import pandas as pd
+
+from common import make_data, temp_sqlite_config
+from mlopslite.client import MlopsLite
+
+
+def measure(fn) -> tuple[float, float]:
+    tracemalloc.start()
+    start = perf_counter()
+    fn()
+    seconds = perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 2**20
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--cols", type=int, default=12)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix="mlopslite-bench-"), "data.csv")
+    make_data(args.rows, args.cols).to_csv(path, index=False)
+    print(f"csv: {os.path.getsize(path) / 2**20:.0f} MB")
+
+    in_memory = MlopsLite(config=temp_sqlite_config(fs_type="local", fs_root=tempfile.mkdtemp()))
+    streamed = MlopsLite(config=temp_sqlite_config(fs_type="local", fs_root=tempfile.mkdtemp()))
+
+    print(f"{'':>12}{'seconds':>10}{'peak MB':>10}")
+    for name, fn in [
+        ("in memory", lambda: in_memory.bind_dataset(pd.read_csv(path), name="bench", exact_unique=False)),
+        ("streamed", lambda: streamed.bind_dataset_stream(path, name="bench", chunk_size=args.chunk_size)),
+    ]:
+        seconds, peak = measure(fn)
+        print(f"{name:>12}{seconds:>10.2f}{peak:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Execution logging benchmark: 
+- caller-side latency of predict(log=True) per request size, ORM object graph (original log_execution) 
+  against bulk Core inserts and the background writer
+- write throughput and storage per million predictions, normalized against compact log layout
+
+    python benchmarks/bench_logging.py --rows 10000 --requests 5
+"""
+
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from common import sqlite_file_size, temp_sqlite_config, timed
+from mlopslite.registry import datamodel
+from mlopslite.registry.registry import Registry
+
+
+def orm_log_execution(registry: Registry, deployable_id: int, input: list[dict], output: list[dict]):
+
+    root_entry = datamodel.ExecutionLog(
+        deployable_id=deployable_id, request_time=datetime.utcnow(), request_size=len(input)
+    )
+
+    for item in zip(input, output):
+        link = datamodel.ExecutionItems(reference_id=item[1]['reference_id'], execution_log_item=root_entry)
+        root_entry.execution_log.append(link)
+
+        for k, v in item[0].items():
+            if k not in ['reference_id']:
+                link.request_items.append(datamodel.RequestItems(varname=k, in_value=str(v), data=link))
+
+        for k, v in item[1]['results'].items():
+            link.response_items.append(datamodel.ResponseItems(classname=str(k), out_value=v, data=link))
+
+    registry.db.log_execution(root_entry)
+
+
+def make_request(rows: int, features: int, classes: int, seed: int = 1):
+
+    rng = np.random.default_rng(seed)
+    input = pd.DataFrame(rng.normal(size=(rows, features)), columns=[f"x{i}" for i in range(features)])
+    proba = rng.dirichlet(np.ones(classes), size=rows)
+    output = [
+        {'reference_id': str(i), 'results': dict(zip([f"class_{c}" for c in range(classes)], p))}
+        for i, p in enumerate(proba)
+    ]
+    return input, output
+
+
+def setup_registry(**kwargs) -> tuple[Registry, int]:
+
+    # execution log only needs a deployable row to reference
+    registry = Registry(config=temp_sqlite_config(**kwargs))
+    with registry.db.session.begin() as session:
+        ds = datamodel.DatasetRegistry(
+            name="bench", version=1, description="", data=None, size_cols=0, size_rows=0,
+            hash="bench", created_at=datetime.utcnow()
+        )
+        session.add(ds)
+        session.flush()
+        mr = datamodel.DeployableRegistry(
+            dataset_registry_id=ds.id, name="bench", version=1, target="t", target_mapping=None,
+            description="", estimator_type="classifier", estimator_class="bench", deployable=b"",
+            variables={}, hash="bench", created_at=datetime.utcnow()
+        )
+        session.add(mr)
+        session.flush()
+        deployable_id = mr.id
+
+    return registry, deployable_id
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--classes", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=3)
+    args = parser.parse_args()
+
+    input, output = make_request(args.rows, args.features, args.classes)
+    records = input.to_dict("records")
+    print(f"{args.requests} requests x {args.rows} rows, {args.features} features, {args.classes} classes")
+
+    registry, deployable_id = setup_registry()
+    orm = timed(lambda: [orm_log_execution(registry, deployable_id, records, output) for _ in range(args.requests)])
+    print(f"orm object graph  : {orm / args.requests * 1e3:10.1f} ms per request")
+
+    registry, deployable_id = setup_registry()
+    bulk = timed(lambda: [registry.log_execution(deployable_id, input, output) for _ in range(args.requests)])
+    print(f"bulk core insert  : {bulk / args.requests * 1e3:10.1f} ms per request")
+
+    registry, deployable_id = setup_registry(log_async=True)
+    submit = timed(lambda: [registry.log_execution(deployable_id, input, output) for _ in range(args.requests)])
+    drain = timed(registry.close)
+    print(f"background writer : {submit / args.requests * 1e3:10.1f} ms per request (caller), {drain:.2f}s drain")
+
+    predictions = args.rows * args.requests
+    print(f"\n{'layout':<12}{'predictions/s':>15}{'MB per 1M predictions':>24}")
+    for log_format in ["normalized", "compact"]:
+        registry, deployable_id = setup_registry(log_format=log_format)
+        size = sqlite_file_size(registry.config)
+        elapsed = timed(lambda: [registry.log_execution(deployable_id, input, output) for _ in range(args.requests)])
+        growth = (sqlite_file_size(registry.config) - size) / predictions * 1e6 / 1e6
+        print(f"{log_format:<12}{predictions / elapsed:>15.0f}{growth:>24.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Logged predictions by reference_id through the reference_id indexes (get_prediction / get_predictions)
+against a scan of the execution log, and the throughput of replaying the log against a new version.
+
+    python benchmarks/bench_lookup.py --requests 5000 --rows 20 --lookups 5000 --log-format compact
+"""
+
+import argparse
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from common import temp_sqlite_config, timed
+from mlopslite.client import MlopsLite
+from mlopslite.registry.registry import ExecutionLogEntry
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--features", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rows", type=int, default=20, help="rows per request")
+    parser.add_argument("--lookups", type=int, default=5000, help="reference ids of the bulk lookup")
+    parser.add_argument("--workers", type=int, default=0, help="replay processes (0 scores in this process)")
+    parser.add_argument("--log-format", default="compact", choices=["normalized", "compact"])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    columns = [f"x{i}" for i in range(args.features)]
+    train = pd.DataFrame(rng.normal(size=(5000, args.features)), columns=columns)
+    train["target"] = rng.choice(["a", "b", "c"], size=len(train))
+    model = make_pipeline(StandardScaler(), LogisticRegression()).fit(train[columns], train["target"])
+
+    client = MlopsLite(config=temp_sqlite_config(log_format=args.log_format))
+    client.bind_dataset(train, name="bench")
+    client.bind_deployable(model, name="bench", target="target")
+    deployable = client.deployable
+
+    # every row has a unique reference id
+    start = datetime(2026, 1, 1)
+    input = pd.DataFrame(rng.normal(size=(args.rows, args.features)), columns=columns)
+    for chunk in np.array_split(np.arange(args.requests), max(args.requests // 1000, 1)):
+        entries = []
+        for i in chunk:
+            request = input.assign(reference_id=[f"ref-{i}-{j}" for j in range(args.rows)])
+            entries.append(ExecutionLogEntry(
+                deployable.metadata.id, start + timedelta(seconds=int(i)), request, deployable.predict(request, output="arrays")
+            ))
+        client.registry.write_execution_logs(entries)
+
+    ids = [f"ref-{i}-{j}" for i, j in zip(
+        rng.integers(0, args.requests, size=args.lookups), rng.integers(0, args.rows, size=args.lookups)
+    )]
+
+    def scan():
+        log = client.read_execution_log()
+        return log[log["reference_id"].isin(ids)]
+
+    single = timed(client.get_prediction, ids[0])
+    bulk = timed(client.get_predictions, ids)
+    scanned = timed(scan)
+
+    refit = clone(model).set_params(logisticregression__C=0.01).fit(train[columns], train["target"])
+    client.bind_deployable(refit, name="bench", target="target")
+    rows = []
+    replayed = timed(lambda: rows.append(client.replay("bench@1", workers=args.workers, sink=lambda chunk: None)))
+
+    print(f"{args.requests} requests x {args.rows} rows, {args.log_format} log")
+    print(f"{'':>28}{'seconds':>10}")
+    print(f"{'get_prediction (1 id)':>28}{single:>10.4f}")
+    print(f"{f'get_predictions ({args.lookups} ids)':>28}{bulk:>10.4f}")
+    print(f"{'log scan + isin':>28}{scanned:>10.4f}")
+    print(f"{'replay':>28}{replayed:>10.4f}  {rows[0] / replayed:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
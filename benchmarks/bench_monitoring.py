@@ -0,0 +1,59 @@
+"""
+Monitoring over the execution log: a first update over the whole log, an incremental update after
+a few new requests (only rows past the watermark are read) and the drift query over the stored windows.
+
+    python benchmarks/bench_monitoring.py --requests 2000 --rows 50 --log-format compact
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from common import temp_sqlite_config, timed
+from mlopslite.client import MlopsLite
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--features", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=50, help="rows per request")
+    parser.add_argument("--new-requests", type=int, default=20)
+    parser.add_argument("--log-format", default="compact", choices=["normalized", "compact"])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    columns = [f"x{i}" for i in range(args.features)]
+    train = pd.DataFrame(rng.normal(size=(5000, args.features)), columns=columns)
+    train["target"] = rng.choice(["a", "b", "c"], size=len(train))
+    model = make_pipeline(StandardScaler(), LogisticRegression()).fit(train[columns], train["target"])
+
+    client = MlopsLite(config=temp_sqlite_config(log_format=args.log_format))
+    client.bind_dataset(train, name="bench", sketch=True)
+    client.bind_deployable(model, name="bench", target="target")
+
+    def log(n):
+        for _ in range(n):
+            client.predict(pd.DataFrame(rng.normal(size=(args.rows, args.features)), columns=columns), log=True)
+
+    log(args.requests)
+    monitor = client.get_monitor()
+
+    full = timed(monitor.update)
+    log(args.new_requests)
+    incremental = timed(monitor.update)
+    drift = timed(monitor.drift, "bench", combine=True)
+
+    print(f"{'':>14}{'requests':>10}{'seconds':>10}")
+    print(f"{'full update':>14}{args.requests:>10}{full:>10.3f}")
+    print(f"{'incremental':>14}{args.new_requests:>10}{incremental:>10.3f}")
+    print(f"{'drift':>14}{'':>10}{drift:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Prediction latency per batch size: original per-request path (pydantic model rebuilt per call,
+records in, records out) against the cached records path and the columnar DataFrame path.
+
+    python benchmarks/bench_predict.py --max-batch 1000000
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+from pydantic import create_model
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from common import timed
+from mlopslite.artifacts.dataset import create_dataset
+from mlopslite.artifacts.deployable import create_deployable
+
+
+def legacy_predict(deployable, input: list[dict]):
+
+    class Config:
+        extra = 'forbid'
+
+    schema_definition = {k: (eval(v), None) for k, v in deployable.metadata.variables.items()}
+    schema_definition['reference_id'] = (str, None)
+    validator_schema = create_model('inferred_model', **schema_definition, __config__=Config)
+
+    input = [validator_schema(**i).__dict__ for i in input]
+    refid_list = [i['reference_id'] for i in input]
+    input = pd.DataFrame(input).drop(columns='reference_id')
+
+    model_response = deployable.deployable.predict_proba(input)
+    return [
+        {'reference_id': i[0], 'results': dict(zip(deployable.classes, i[1]))} 
+        for i in zip(refid_list, model_response)
+    ]
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--max-batch", type=int, default=100_000)
+    parser.add_argument("--max-legacy-batch", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    columns = [f"x{i}" for i in range(args.features)]
+    train = pd.DataFrame(rng.normal(size=(5000, args.features)), columns=columns)
+    train["target"] = rng.choice(["a", "b", "c"], size=len(train))
+
+    model = make_pipeline(StandardScaler(), LogisticRegression()).fit(train[columns], train["target"])
+    deployable = create_deployable(model, create_dataset(train, name="bench"), name="bench", target="target")
+
+    print(f"{'batch':>9}{'legacy':>12}{'records':>12}{'frame':>12}{'frame+arrays':>14}{'numpy+arrays':>14}  (ms)")
+
+    size = 1
+    while size <= args.max_batch:
+        frame = pd.DataFrame(rng.normal(size=(size, args.features)), columns=columns)
+        array = frame.to_numpy()
+        records = frame.to_dict("records")
+
+        legacy = timed(legacy_predict, deployable, records) * 1e3 if size <= args.max_legacy_batch else float("nan")
+        rec = timed(deployable.predict, records) * 1e3 if size <= args.max_legacy_batch else float("nan")
+        frm = timed(deployable.predict, frame) * 1e3
+        arr = timed(deployable.predict, frame, output="arrays") * 1e3
+        npy = timed(deployable.predict, array, output="arrays") * 1e3
+
+        print(f"{size:>9}{legacy:>12.2f}{rec:>12.2f}{frm:>12.2f}{arr:>14.2f}{npy:>14.2f}")
+        size *= 10
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Column profiling benchmark: per-element Python profiling (original ColumnMetadata.create)
+against the vectorized profiling engine.
+
+    python benchmarks/bench_profiling.py --rows 1000000 --cols 20
+"""
+
+import argparse
+
+import pandas as pd
+
+from common import make_data, timed
+from mlopslite.artifacts.metadata import DatasetMetadata, translate_type_to_primitive
+
+
+def legacy_profile(data: pd.DataFrame) -> list[dict]:
+
+    out = []
+    for key, column in data.items():
+        converted = translate_type_to_primitive(column.dtype)
+        summary = {
+            "null_count": len([i for i in column if pd.isna(i)]),
+            "unique_count": len(set([i for i in column if not pd.isna(i)])),
+        }
+        if converted in ["int", "float"]:
+            summary["min_value_num"] = float(min([i for i in column if not pd.isna(i)]))
+            summary["max_value_num"] = float(max([i for i in column if not pd.isna(i)]))
+        out.append(summary)
+    return out
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--cols", type=int, default=12)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    data = make_data(args.rows, args.cols)
+    print(f"profiling {args.rows} rows x {args.cols} columns")
+
+    if not args.skip_legacy:
+        print(f"legacy (per element)      : {timed(legacy_profile, data):8.3f}s")
+
+    def create(**kwargs):
+        DatasetMetadata.create(data, name="bench", version=None, description="", **kwargs)
+
+    print(f"vectorized                : {timed(create):8.3f}s")
+    print(f"vectorized, parallel      : {timed(create, parallel=True):8.3f}s")
+    print(f"vectorized, approx unique : {timed(create, exact_unique=False):8.3f}s")
+    print(f"parallel + approx unique  : {timed(create, parallel=True, exact_unique=False):8.3f}s")
+    print(f"sketches, approx unique   : {timed(create, exact_unique=False, sketch=True):8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Latency of the DataBase query methods on a seeded registry: thousands of datasets and deployables and
+millions of execution log rows (normalized and compact layouts), with the secondary indexes of the
+schema head and again with them dropped (the schema before migration f1c6d8a2b5e7).
+
+    python benchmarks/bench_queries.py --logs 20000 --items 50 --deployables 2000 --explain
+"""
+
+import argparse
+from datetime import datetime, timedelta
+from statistics import median
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import event, insert, select, text
+
+from common import sqlite_file_size, temp_sqlite_config, timed
+from mlopslite.artifacts.storage import encode_dataset
+from mlopslite.registry import datamodel
+from mlopslite.registry.db import DataBase
+
+# indexes added by migration f1c6d8a2b5e7
+INDEXES = [
+    "ix_dataset_registry_columns_dataset_registry_id",
+    "ix_deployable_registry_name_dataset_target",
+    "ix_deployable_registry_name_version",
+    "ix_model_execution_log_deployable_time",
+    "ix_execution_items_execution_log_id",
+    "ix_execution_items_reference_id",
+    "ix_request_items_execution_items_id",
+    "ix_response_items_execution_items_id",
+    "ix_execution_batch_log_deployable_time",
+    "ix_execution_batch_references_execution_batch_id",
+    "ix_execution_batch_references_reference_id",
+    "ix_monitoring_window_seconds_start",
+    "ix_execution_rollup_seconds_start",
+]
+
+START = datetime(2026, 1, 1)
+
+
+def seed(db: DataBase, args, rng) -> None:
+
+    now = datetime.utcnow()
+    with db.engine.begin() as con:
+        con.execute(insert(datamodel.DatasetRegistry.__table__), [
+            dict(name=f"ds{i % 100}", version=i // 100 + 1, description="", data=None, size_cols=5, size_rows=1000,
+                 hash=f"dataset-{i}", created_at=now, data_format="npz", data_blob=b"", storage_ref=None)
+            for i in range(args.datasets)
+        ])
+        con.execute(insert(datamodel.DatasetRegistryColumns.__table__), [
+            dict(dataset_registry_id=i + 1, column_name=f"x{c}", original_dtype="float64", converted_dtype="float",
+                 null_count=0, unique_count=1000, min_value_num=0.0, max_value_num=1.0, sketch=None)
+            for i in range(args.datasets) for c in range(5)
+        ])
+        con.execute(insert(datamodel.DeployableRegistry.__table__), [
+            dict(dataset_registry_id=i % args.datasets + 1, name=f"m{i % 200}", version=i // 200 + 1, target="target",
+                 target_mapping=None, description="", estimator_type="classifier", estimator_class="LogisticRegression",
+                 deployable=b"", variables={"x0": "float"}, hash=f"deployable-{i}", created_at=now, storage_ref=None)
+            for i in range(args.deployables)
+        ])
+
+    # request times spread over --days days, deployable ids over the first 50 deployables
+    times = [START + timedelta(seconds=int(i)) for i in np.sort(rng.integers(0, args.days * 86400, size=args.logs))]
+    deployables = rng.integers(1, 51, size=args.logs).tolist()
+    payload = encode_dataset(
+        pd.DataFrame({"input:x0": rng.normal(size=args.items), "output:a": rng.random(args.items)}), format="npz"
+    )
+
+    chunk = max(1, 200_000 // args.items)
+    with db.engine.begin() as con:
+        for offset in range(0, args.logs, chunk):
+            ids = range(offset + 1, min(offset + chunk, args.logs) + 1)
+            con.execute(insert(datamodel.ExecutionLog.__table__), [
+                dict(id=i, deployable_id=deployables[i - 1], request_time=times[i - 1], request_size=args.items) for i in ids
+            ])
+            items = [
+                dict(id=(i - 1) * args.items + j + 1, execution_log_id=i, reference_id=f"ref-{i}-{j}")
+                for i in ids for j in range(args.items)
+            ]
+            con.execute(insert(datamodel.ExecutionItems.__table__), items)
+            con.execute(insert(datamodel.RequestItems.__table__), [
+                dict(execution_items_id=i["id"], varname="x0", in_value="0.5") for i in items
+            ])
+            con.execute(insert(datamodel.ResponseItems.__table__), [
+                dict(execution_items_id=i["id"], classname=c, out_value=0.5) for i in items for c in ["a", "b"]
+            ])
+
+            con.execute(insert(datamodel.ExecutionBatch.__table__), [
+                dict(id=i, deployable_id=deployables[i - 1], request_time=times[i - 1], request_size=args.items,
+                     payload_format="npz", payload=payload) for i in ids
+            ])
+            con.execute(insert(datamodel.ExecutionBatchReferences.__table__), [
+                dict(execution_batch_id=i, row_index=j, reference_id=f"ref-{i}-{j}") for i in ids for j in range(args.items)
+            ])
+
+
+def queries(db: DataBase, args) -> dict:
+
+    # one hour of one deployable, and the last 100 log ids (an incremental monitoring / rollup step)
+    start = START + timedelta(days=args.days // 2)
+    end = start + timedelta(hours=1)
+    middle = args.logs // 2
+
+    return {
+        "get_dataset_reference_by_hash": lambda: db.get_dataset_reference_by_hash(f"dataset-{args.datasets // 2}"),
+        "get_dataset_version_increment": lambda: db.get_dataset_version_increment("ds7"),
+        "select_dataset_metadata_by_id": lambda: db.select_dataset_metadata_by_id(args.datasets // 2),
+        "get_deployable_reference_by_hash": lambda: db.get_deployable_reference_by_hash(f"deployable-{args.deployables // 2}"),
+        "get_deployable_version_increment": lambda: db.get_deployable_version_increment("m7", 8, "target"),
+        "get_deployable_id_by_name": lambda: db.get_deployable_id_by_name("m7"),
+        "select_execution_log_items (hour)": lambda: db.select_execution_log_items(7, start=start, end=end),
+        "select_execution_batches (hour)": lambda: db.select_execution_batches(7, start=start, end=end),
+        "select_execution_log_items (ids)": lambda: db.select_execution_log_items(after_id=args.logs - 100),
+        "select_execution_log_outputs (ids)": lambda: db.select_execution_log_outputs(after_id=args.logs - 100),
+        "reference_id (normalized)": lambda: db.execute_select_query(
+            select(datamodel.ExecutionItems.execution_log_id).where(datamodel.ExecutionItems.reference_id == f"ref-{middle}-3")
+        ),
+        "reference_id (compact)": lambda: db.execute_select_query(
+            select(datamodel.ExecutionBatchReferences.execution_batch_id)
+            .where(datamodel.ExecutionBatchReferences.reference_id == f"ref-{middle}-3")
+        ),
+    }
+
+
+def explain(db: DataBase, fn) -> list[str]:
+
+    # SQLite plans of the statements a query method runs
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        fn()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+
+    out = []
+    with db.engine.connect() as con:
+        for statement, parameters in statements:
+            out += [i[-1] for i in con.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()]
+    return out
+
+
+def measure(db: DataBase, args) -> dict:
+    return {name: median(timed(fn) for _ in range(args.repeat)) for name, fn in queries(db, args).items()}
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--datasets", type=int, default=1000)
+    parser.add_argument("--deployables", type=int, default=2000)
+    parser.add_argument("--logs", type=int, default=20000, help="execution log entries (requests) per layout")
+    parser.add_argument("--items", type=int, default=50, help="predictions per request")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--explain", action="store_true", help="print the SQLite query plan of each query")
+    args = parser.parse_args()
+
+    config = temp_sqlite_config()
+    db = DataBase(config)
+
+    print("seeding", end=" ", flush=True)
+    seconds = timed(seed, db, args, np.random.default_rng(1))
+    with db.engine.connect() as con:
+        con.execute(text("ANALYZE"))
+    print(f"{seconds:.1f} s, {args.logs * args.items * 4:,} normalized log rows, {sqlite_file_size(config) / 1e6:.0f} MB")
+
+    if args.explain:
+        for name, fn in queries(db, args).items():
+            print(name)
+            for line in explain(db, fn):
+                print(f"    {line}")
+
+    indexed = measure(db, args)
+
+    with db.engine.begin() as con:
+        for name in INDEXES:
+            con.execute(text(f"DROP INDEX {name}"))
+        con.execute(text("ANALYZE"))
+
+    unindexed = measure(db, args)
+
+    print(f"{'':>36}{'no index ms':>14}{'indexed ms':>14}")
+    for name in indexed:
+        print(f"{name:>36}{unindexed[name] * 1000:>14.2f}{indexed[name] * 1000:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Log retention: archive + batched delete of expired execution log entries, with the SQLite file size
+before pruning, after pruning and after VACUUM, and the size of the archive files.
+
+    python benchmarks/bench_retention.py --requests 5000 --rows 20 --days 90 --retention-days 30
+"""
+
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+from tempfile import mkdtemp
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from common import sqlite_file_size, temp_sqlite_config, timed
+from mlopslite.client import MlopsLite
+from mlopslite.registry.registry import ExecutionLogEntry
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--features", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rows", type=int, default=20, help="rows per request")
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--retention-days", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--log-format", default="normalized", choices=["normalized", "compact"])
+    parser.add_argument("--archive-format", default="parquet", choices=["parquet", "arrow"])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    columns = [f"x{i}" for i in range(args.features)]
+    train = pd.DataFrame(rng.normal(size=(5000, args.features)), columns=columns)
+    train["target"] = rng.choice(["a", "b", "c"], size=len(train))
+    model = make_pipeline(StandardScaler(), LogisticRegression()).fit(train[columns], train["target"])
+
+    archive = mkdtemp(prefix="mlopslite-bench-archive-")
+    config = temp_sqlite_config(
+        log_format=args.log_format, log_retention_days=args.retention_days, log_archive_dir=archive,
+        log_archive_format=args.archive_format, log_prune_batch_size=args.batch_size
+    )
+    client = MlopsLite(config=config)
+    client.bind_dataset(train, name="bench")
+    client.bind_deployable(model, name="bench", target="target")
+    deployable = client.deployable
+
+    # logs spread over --days days up to now
+    now = datetime.utcnow()
+    input = pd.DataFrame(rng.normal(size=(args.rows, args.features)), columns=columns)
+    output = deployable.predict(input, output="arrays")
+    offsets = np.sort(rng.integers(0, args.days * 86400, size=args.requests))[::-1]
+    for chunk in np.array_split(offsets, max(args.requests // 1000, 1)):
+        client.registry.write_execution_logs([
+            ExecutionLogEntry(deployable.metadata.id, now - timedelta(seconds=int(i)), input, output) for i in chunk
+        ])
+
+    before = sqlite_file_size(config)
+    stats = {}
+    seconds = timed(lambda: stats.update(client.prune_logs(now=now)))
+    pruned = sqlite_file_size(config)
+    vacuum = timed(client.registry.db.vacuum)
+    vacuumed = sqlite_file_size(config)
+    archived = sum(i.stat().st_size for i in Path(archive).rglob(f"*.{args.archive_format}"))
+
+    print(f"{args.requests} requests x {args.rows} rows over {args.days} days, {args.log_format} log, keep {args.retention_days} days")
+    print(f"pruned {stats['logs']} requests ({stats['rows']} rows) in {stats['files']} files: {seconds:.2f} s, "
+          f"{stats['logs'] / seconds:.0f} requests/s, vacuum {vacuum:.2f} s")
+    print(f"db size MB: before {before / 1e6:.1f}, after prune {pruned / 1e6:.1f}, after vacuum {vacuumed / 1e6:.1f}")
+    print(f"archive MB: {archived / 1e6:.1f}")
+
+
+if __name__ == "__main__":
+    main()
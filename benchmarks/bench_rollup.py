@@ -0,0 +1,76 @@
+"""
+Execution metrics from the rollup tables against a scan of the execution log: requests, rows and mean
+predicted probabilities per hour over logs spread across --days days.
+
+    python benchmarks/bench_rollup.py --requests 20000 --rows 20 --days 30 --log-format compact
+"""
+
+import argparse
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from common import temp_sqlite_config, timed
+from mlopslite.client import MlopsLite
+from mlopslite.registry.registry import ExecutionLogEntry
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--features", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rows", type=int, default=20, help="rows per request")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--log-format", default="compact", choices=["normalized", "compact"])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    columns = [f"x{i}" for i in range(args.features)]
+    train = pd.DataFrame(rng.normal(size=(5000, args.features)), columns=columns)
+    train["target"] = rng.choice(["a", "b", "c"], size=len(train))
+    model = make_pipeline(StandardScaler(), LogisticRegression()).fit(train[columns], train["target"])
+
+    client = MlopsLite(config=temp_sqlite_config(log_format=args.log_format))
+    client.bind_dataset(train, name="bench")
+    client.bind_deployable(model, name="bench", target="target")
+    deployable = client.deployable
+
+    # logs written directly, with request times spread over the range
+    start = datetime(2026, 1, 1)
+    input = pd.DataFrame(rng.normal(size=(args.rows, args.features)), columns=columns)
+    output = deployable.predict(input, output="arrays")
+    offsets = np.sort(rng.integers(0, args.days * 86400, size=args.requests))
+    for chunk in np.array_split(offsets, max(args.requests // 1000, 1)):
+        client.registry.write_execution_logs([
+            ExecutionLogEntry(deployable.metadata.id, start + timedelta(seconds=int(i)), input, output) for i in chunk
+        ])
+
+    rollup = client.get_rollup()
+    update = timed(rollup.update)
+
+    def scan():
+        log = client.read_execution_log()
+        log["hour"] = pd.to_datetime(log["request_time"]).dt.floor("h")
+        return log.groupby("hour").agg(requests=("log_id", "nunique"), rows=("row_index", "size"), a=("output:a", "mean"))
+
+    scanned = timed(scan)
+    hourly = timed(rollup.metrics, freq=3600, quantiles=())
+    daily = timed(rollup.metrics, freq=86400)
+    total = timed(rollup.metrics, freq=None)
+
+    print(f"{args.requests} requests, {args.requests * args.rows} predictions, {args.log_format} log")
+    print(f"{'':>18}{'seconds':>10}")
+    print(f"{'rollup update':>18}{update:>10.3f}")
+    print(f"{'log scan, hourly':>18}{scanned:>10.3f}")
+    print(f"{'rollup, hourly':>18}{hourly:>10.3f}")
+    print(f"{'rollup, daily':>18}{daily:>10.3f}")
+    print(f"{'rollup, total':>18}{total:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Cold start benchmark, each run in a fresh interpreter:
+- import of mlopslite.client
+- MlopsLite() against an existing, up to date registry
+- first prediction of a restored deployable
+
+    python benchmarks/bench_startup.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from statistics import median
+
+STARTUP_SCRIPT = """
+import json, sys
+from time import perf_counter
+
+start = perf_counter()
+from mlopslite.client import MlopsLite
+from mlopslite.registry.registryconfig import RegistryConfig
+imported = perf_counter()
+
+client = MlopsLite(config=RegistryConfig(db_constring=sys.argv[1]))
+connected = perf_counter()
+
+client.pull_deployable(1)
+client.predict([{"x1": 0.5, "x2": 1.0}])
+predicted = perf_counter()
+
+print(json.dumps({"import": imported - start, "client": connected - imported, "first predict": predicted - connected}))
+"""
+
+SETUP_SCRIPT = """
+import sys
+import numpy as np, pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from mlopslite.client import MlopsLite
+from mlopslite.registry.registryconfig import RegistryConfig
+
+rng = np.random.default_rng(1)
+data = pd.DataFrame({"x1": rng.normal(size=100), "x2": rng.normal(size=100), "target": rng.choice(["a", "b"], size=100)})
+client = MlopsLite(config=RegistryConfig(db_constring=sys.argv[1]))
+client.bind_dataset(data, name="bench")
+client.bind_deployable(make_pipeline(LogisticRegression()).fit(data[["x1", "x2"]], data["target"]), name="bench", target="target")
+"""
+
+
+def run(script: str, db_constring: str) -> str:
+    out = subprocess.run([sys.executable, "-c", script, db_constring], capture_output=True, text=True, check=True)
+    return out.stdout
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    db_constring = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='mlopslite-bench-'), 'mlops-lite.db')}"
+    run(SETUP_SCRIPT, db_constring)
+
+    results = [json.loads(run(STARTUP_SCRIPT, db_constring).strip().splitlines()[-1]) for _ in range(args.runs)]
+
+    print(f"median of {args.runs} fresh interpreters")
+    for key in results[0].keys():
+        print(f"{key:<16}{median(i[key] for i in results) * 1e3:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
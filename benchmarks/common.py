@@ -0,0 +1,46 @@
+"""
+Shared helpers for the benchmark scripts, run them from the repository root:
+
+    python benchmarks/<script>.py --help
+"""
+
+import os
+import tempfile
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from mlopslite.registry.registryconfig import RegistryConfig
+
+
+def make_data(rows: int, cols: int, seed: int = 1) -> pd.DataFrame:
+
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(cols):
+        kind = i % 3
+        if kind == 0:
+            col = rng.normal(size=rows)
+            col[rng.random(rows) < 0.05] = np.nan
+        elif kind == 1:
+            col = rng.integers(0, rows // 10 + 1, size=rows)
+        else:
+            col = pd.Series(rng.integers(0, 5000, size=rows)).map("cat_{}".format).to_numpy()
+        data[f"col_{i}"] = col
+    return pd.DataFrame(data)
+
+
+def timed(fn, *args, **kwargs) -> float:
+    start = perf_counter()
+    fn(*args, **kwargs)
+    return perf_counter() - start
+
+
+def temp_sqlite_config(**kwargs) -> RegistryConfig:
+    path = os.path.join(tempfile.mkdtemp(prefix="mlopslite-bench-"), "mlops-lite.db")
+    return RegistryConfig(db_constring=f"sqlite:///{path}", **kwargs)
+
+
+def sqlite_file_size(config: RegistryConfig) -> int:
+    return os.path.getsize(config.db_constring.removeprefix("sqlite:///"))
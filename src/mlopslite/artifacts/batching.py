@@ -0,0 +1,236 @@
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from time import monotonic
+
+import pandas as pd
+
+from mlopslite.artifacts.deployable import PREDICT_OUTPUTS, Deployable, PredictionBatch
+from mlopslite.artifacts.validation import to_frame
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+@dataclass
+class _Request:
+    input: object
+    output: str
+    rows: int
+    enqueued: float = field(default_factory=monotonic)
+    future: Future = field(default_factory=Future)
+
+
+class MicroBatcher:
+
+    """
+    Dynamic batching in front of Deployable.predict, for many concurrent callers sending a few rows each.
+
+    Requests are put on a queue and collected by a worker thread until max_batch_size rows are pending
+    or max_wait seconds passed since the first one. The batch is validated and scored in a single
+    vectorized call, and results are scattered back to the callers in request order, reference ids included.
+    A request larger than max_batch_size is scored on its own.
+
+    If the batch fails (e.g. one request does not pass validation), its requests are scored one by one,
+    so only the faulty callers get the exception.
+
+    submit() returns a concurrent.futures.Future (asyncio callers can await asyncio.wrap_future(...)),
+    predict() blocks until the result is ready. metrics() reports queue depth and batch sizes.
+    """
+
+    def __init__(
+            self,
+            deployable: Deployable,
+            max_batch_size: int = 256,
+            max_wait: float = 0.002,
+            queue_size: int = 10000
+    ) -> None:
+
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be positive, got {max_batch_size}")
+
+        self.deployable = deployable
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self.stats = {
+            "requests": 0, "rows": 0, "batches": 0, "failed": 0, "fallbacks": 0,
+            "max_batch_rows": 0, "max_queue_depth": 0, "wait_seconds": 0.0
+        }
+        self._stats_lock = threading.Lock()
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        # closed check + put are atomic, so no request is queued after _STOP
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="mlopslite-micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, input, output: str = "records") -> Future:
+
+        """
+        Queue input for scoring, the Future resolves to the same result as deployable.predict(input, output).
+        Blocks while the queue is full.
+        """
+
+        if output not in PREDICT_OUTPUTS:
+            raise ValueError(f'Invalid output {output}, expected one of {PREDICT_OUTPUTS}')
+
+        request = _Request(input=input, output=output, rows=len(input))
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._queue.put(request)
+
+        with self._stats_lock:
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self._queue.qsize())
+
+        return request.future
+
+    def predict(self, input, output: str = "records", timeout: float | None = None) -> list[dict] | PredictionBatch:
+        return self.submit(input, output=output).result(timeout=timeout)
+
+    def metrics(self) -> dict:
+
+        """
+        Snapshot of the counters, plus current queue depth and averages per batch.
+        """
+
+        with self._stats_lock:
+            stats = dict(self.stats)
+
+        batches = max(stats["batches"], 1)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["mean_batch_rows"] = stats["rows"] / batches
+        stats["mean_batch_requests"] = stats["requests"] / batches
+        stats["mean_wait_ms"] = stats.pop("wait_seconds") * 1e3 / max(stats["requests"], 1)
+
+        return stats
+
+    def close(self) -> None:
+
+        """
+        Score pending requests and stop the worker.
+        """
+
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        # every accepted request was put before (under the lock), so it is queued ahead of _STOP
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def __enter__(self) -> "MicroBatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        try:
+            self._collect()
+        finally:
+            # the worker is gone (closed or failed), requests still queued would never resolve
+            self._fail_queued()
+            with self._lock:
+                self._closed = True
+            self._fail_queued()
+
+    def _collect(self) -> None:
+
+        pending = None
+        stop = False
+        while not stop:
+            first = pending if pending is not None else self._queue.get()
+            pending = None
+
+            if first is _STOP:
+                break
+
+            batch, rows = [first], first.rows
+            deadline = first.enqueued + self.max_wait
+
+            while rows < self.max_batch_size:
+                timeout = deadline - monotonic()
+                try:
+                    request = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is _STOP:
+                    stop = True
+                    break
+                if rows + request.rows > self.max_batch_size:
+                    # starts the next batch
+                    pending = request
+                    break
+                batch.append(request)
+                rows += request.rows
+
+            self._score(batch, rows)
+
+        if pending is not None:
+            self._score([pending], pending.rows)
+
+    def _fail_queued(self) -> None:
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if request is not _STOP:
+                request.future.set_exception(RuntimeError("MicroBatcher is closed"))
+
+    def _score(self, batch: list[_Request], rows: int) -> None:
+
+        start = monotonic()
+        with self._stats_lock:
+            self.stats["requests"] += len(batch)
+            self.stats["rows"] += rows
+            self.stats["batches"] += 1
+            self.stats["max_batch_rows"] = max(self.stats["max_batch_rows"], rows)
+            self.stats["wait_seconds"] += sum(start - i.enqueued for i in batch)
+
+        if len(batch) == 1:
+            self._score_single(batch[0])
+            return
+
+        try:
+            result = self.deployable.predict(self._combine(batch), output="arrays")
+        except Exception:
+            with self._stats_lock:
+                self.stats["fallbacks"] += 1
+            for request in batch:
+                self._score_single(request)
+            return
+
+        offset = 0
+        for request in batch:
+            part = PredictionBatch(
+                reference_id=result.reference_id[offset:offset + request.rows],
+                results=result.results[offset:offset + request.rows],
+                classes=result.classes
+            )
+            offset += request.rows
+            request.future.set_result(part if request.output == "arrays" else part.to_records())
+
+    def _score_single(self, request: _Request) -> None:
+        try:
+            request.future.set_result(self.deployable.predict(request.input, output=request.output))
+        except Exception as e:
+            with self._stats_lock:
+                self.stats["failed"] += 1
+            request.future.set_exception(e)
+
+    def _combine(self, batch: list[_Request]):
+
+        # records are concatenated and built into one frame, validated column-wise
+        if all(isinstance(i.input, list) for i in batch):
+            return pd.DataFrame([row for i in batch for row in i.input])
+
+        names = self.deployable.input_schema.names
+        return pd.concat([to_frame(i.input, names=names) for i in batch], ignore_index=True)
@@ -0,0 +1,216 @@
+"""
+Bulk (offline) scoring: inputs are read in chunks from a file or a DataFrame iterator, scored across
+a process pool and written to a sink in their original order.
+"""
+
+import os
+import pickle
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator
+
+import pandas as pd
+
+from mlopslite.artifacts.deployable import Deployable, PredictionBatch
+
+BULK_FILE_FORMATS = ["csv", "parquet"]
+
+# deployable of a pool worker, set once by _init_worker
+_WORKER_DEPLOYABLE: Deployable | None = None
+
+
+def file_format(path: str) -> str:
+
+    format = os.path.splitext(path)[1].lstrip(".").lower()
+    if format == "pq":
+        format = "parquet"
+    if format not in BULK_FILE_FORMATS:
+        raise ValueError(f"Unsupported file {path}, expected one of {BULK_FILE_FORMATS}")
+    return format
+
+
+def read_chunks(
+        source: str | pd.DataFrame | Iterable[pd.DataFrame],
+        chunk_size: int = 100_000,
+        dtype: dict[str, Any] | None = None
+) -> Iterator[pd.DataFrame]:
+
+    """
+    Input as DataFrames of at most chunk_size rows (iterators are passed through as they are).
+    Files are read incrementally, CSV with pandas, Parquet by row batches with pyarrow.
+    dtype (column -> dtype) is passed to pd.read_csv, other chunks are cast with astype. It keeps column
+    types stable across chunks, e.g. float64 for an int column that has nulls in some chunks only.
+    """
+
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunk_size):
+            yield _astype(source.iloc[start:start + chunk_size], dtype)
+        return
+
+    if not isinstance(source, (str, os.PathLike)):
+        for chunk in source:
+            yield _astype(chunk, dtype)
+        return
+
+    source = os.fspath(source)
+    if file_format(source) == "csv":
+        with pd.read_csv(source, chunksize=chunk_size, dtype=dtype) as reader:
+            yield from reader
+        return
+
+    import pyarrow.parquet as pq
+    for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size):
+        yield _astype(batch.to_pandas(), dtype)
+
+
+def _astype(chunk: pd.DataFrame, dtype: dict[str, Any] | None) -> pd.DataFrame:
+    return chunk if dtype is None else chunk.astype(dtype)
+
+
+class PredictionSink:
+
+    """
+    Appends PredictionBatch frames (see PredictionBatch.to_frame), or any frames with the same columns, 
+    to a CSV or Parquet file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = os.fspath(path)
+        self.format = file_format(self.path)
+        self.rows = 0
+        self._writer = None
+        self._schema = None
+
+    def write(self, input: pd.DataFrame, output: PredictionBatch) -> None:
+        self.write_frame(output.to_frame())
+
+    def write_frame(self, frame: pd.DataFrame) -> None:
+
+        if self.format == "csv":
+            frame.to_csv(self.path, mode="w" if self.rows == 0 else "a", header=self.rows == 0, index=False)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                # an all-None column (e.g. reference_id) is typed null in the first frame, stored as string
+                self._schema = pa.schema(
+                    [i.with_type(pa.string()) if pa.types.is_null(i.type) else i for i in table.schema],
+                    metadata=table.schema.metadata
+                )
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            if not table.schema.equals(self._schema):
+                # same as DatasetWriter.write, later frames follow the first schema
+                table = table.cast(self._schema)
+            self._writer.write_table(table)
+
+        self.rows += len(frame)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self) -> "PredictionSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def predict_chunks(
+        deployable: Deployable,
+        chunks: Iterable[pd.DataFrame],
+        workers: int | None = None,
+        max_pending: int | None = None,
+        mp_context=None
+) -> Iterator[tuple[pd.DataFrame, PredictionBatch]]:
+
+    """
+    Score chunks across a process pool, yields (chunk, PredictionBatch) in input order.
+
+    The deployable is pickled once and unpickled by each worker when it starts, tasks only carry the chunk.
+    At most max_pending chunks (default 2 per worker) are in flight, so the input is never read
+    far ahead of the output. workers=0 scores in the calling process.
+    """
+
+    workers = os.cpu_count() if workers is None else workers
+
+    if workers == 0:
+        for chunk in chunks:
+            yield chunk, deployable.predict(chunk, output="arrays")
+        return
+
+    max_pending = 2 * workers if max_pending is None else max_pending
+    pending = deque()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp_context,
+        initializer=_init_worker,
+        initargs=(pickle.dumps(deployable),)
+    ) as pool:
+        for chunk in chunks:
+            pending.append((chunk, pool.submit(_score_chunk, chunk)))
+            if len(pending) >= max_pending:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+
+
+def predict_batch(
+        deployable: Deployable,
+        source: str | pd.DataFrame | Iterable[pd.DataFrame],
+        sink: str | Callable[[pd.DataFrame, PredictionBatch], None] | None = None,
+        chunk_size: int = 100_000,
+        workers: int | None = None,
+        on_chunk: Callable[[pd.DataFrame, PredictionBatch], None] | None = None
+) -> pd.DataFrame | int:
+
+    """
+    Score source (CSV/Parquet file, DataFrame or DataFrame iterator) in chunks of chunk_size rows.
+
+    sink is a CSV/Parquet path or a callable(chunk, PredictionBatch), results are written in input order
+    and the number of scored rows is returned. Without a sink, results are returned as one DataFrame.
+    on_chunk is called with every scored chunk (e.g. to log it).
+    """
+
+    frames = []
+    rows = 0
+
+    writer = PredictionSink(sink) if isinstance(sink, (str, os.PathLike)) else None
+    write = writer.write if writer is not None else sink
+
+    try:
+        for chunk, output in predict_chunks(deployable, read_chunks(source, chunk_size), workers=workers):
+            if write is None:
+                frames.append(output.to_frame())
+            else:
+                write(chunk, output)
+            if on_chunk is not None:
+                on_chunk(chunk, output)
+            rows += len(output)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if write is not None:
+        return rows
+    if len(frames) == 0:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+### pool workers
+
+def _init_worker(blob: bytes) -> None:
+    global _WORKER_DEPLOYABLE
+    _WORKER_DEPLOYABLE = pickle.loads(blob)
+
+
+def _score_chunk(chunk: pd.DataFrame) -> PredictionBatch:
+    return _WORKER_DEPLOYABLE.predict(chunk, output="arrays")
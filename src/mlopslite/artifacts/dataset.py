@@ -1,11 +1,15 @@
 from dataclasses import dataclass
 import json
+from typing import Callable
 from hashlib import md5
 
 import numpy as np
 import pandas as pd
 
-from mlopslite.artifacts.metadata import DatasetMetadata
+from mlopslite.artifacts.hashing import hash_dataframe
+from mlopslite.artifacts.metadata import PRIMITIVE_TYPES, DatasetMetadata
+
+HASH_MODES = ["chunked", "legacy"]
 
 @dataclass
 class Dataset:
@@ -28,12 +32,24 @@ class Dataset:
         out = {}
         for k, v in conv_dict.items():
             
-            target_type = eval([i['converted_dtype'] for i in column_meta if i['column_name'] == k][0])
+            target_type = PRIMITIVE_TYPES[[i['converted_dtype'] for i in column_meta if i['column_name'] == k][0]]
             out[k] = [target_type(i) if i not in nonetypes else None for i in v]
 
         return out
     
-    def get_data_hash(self) -> str:
+    def get_data_hash(self, mode: str = "chunked") -> str:
+
+        """
+        Content hash of the data. 'chunked' streams column buffers into the hasher (see artifacts.hashing),
+        'legacy' reproduces the original md5 over the json dump, for comparing against registry rows created before.
+        """
+
+        if mode == "chunked":
+            dtypes = {i.column_name: i.converted_dtype for i in self.metadata.column_metadata}
+            return hash_dataframe(self.data, dtypes)
+
+        if mode != "legacy":
+            raise ValueError(f"Invalid hash mode {mode}, expected one of {HASH_MODES}")
 
         data = self.convert_to_dict()
 
@@ -44,13 +60,85 @@ class Dataset:
     def info(self) -> pd.DataFrame:
 
         return pd.DataFrame(self.metadata.column_metadata)
-    
+
+    def select_columns(self, columns: list[str] | None = None) -> pd.DataFrame:
+        return self.data if columns is None else self.data[columns]
+
+    def load(
+            self, 
+            columns: list[str] | None = None, 
+            rows: slice | None = None, 
+            sample: int | float | None = None,
+            random_state: int | None = None
+    ) -> pd.DataFrame:
+
+        """
+        Projection of the data (on a LazyDataset, loaded without keeping it on the object):
+        columns - subset of columns, only these are decoded
+        rows - row slice, e.g. slice(0, 1000)
+        sample - number (int) or fraction (float) of randomly sampled rows
+        """
+
+        data = self.select_columns(columns)
+
+        if rows is not None:
+            data = data.iloc[rows]
+
+        if sample is not None:
+            if isinstance(sample, float):
+                data = data.sample(frac=sample, random_state=random_state)
+            else:
+                data = data.sample(n=sample, random_state=random_state)
+
+        return data
+
+
+class LazyDataset(Dataset):
+
+    """
+    Dataset pulled from the Registry, metadata is available right away,
+    data is loaded on first access of .data (or partially, through load).
+    """
+
+    def __init__(
+            self, 
+            metadata: DatasetMetadata, 
+            loader: Callable[[list[str] | None], pd.DataFrame]
+    ) -> None:
+        self.metadata = metadata
+        self._loader = loader
+        self._data = None
+
+    @property
+    def data(self) -> pd.DataFrame:
+        if self._data is None:
+            self._data = self._loader(None)
+        return self._data
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._data is not None
+
+    def select_columns(self, columns: list[str] | None = None) -> pd.DataFrame:
+        if self._data is not None:
+            return self._data if columns is None else self._data[columns]
+        return self._loader(columns)
+
+    def __repr__(self) -> str:
+        return f"LazyDataset(metadata={self.metadata!r}, loaded={self.is_loaded})"
+
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
 ### Function block
 
 def create_dataset(
     data: pd.DataFrame | dict, 
     name: str, 
-    description: str = ""
+    description: str = "",
+    exact_unique: bool = True,
+    parallel: bool = False,
+    sketch: bool = False
 ) -> 'Dataset':
     
     # version can not initialize, unless checked against existing registry
@@ -63,6 +151,9 @@ def create_dataset(
         name=name,
         version=None, 
         description=description,
+        exact_unique=exact_unique,
+        parallel=parallel,
+        sketch=sketch
     )
 
     return Dataset(data=data, metadata=metadata)
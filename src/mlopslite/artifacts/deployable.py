@@ -1,19 +1,88 @@
 from mlopslite.artifacts.dataset import Dataset
 from mlopslite.artifacts.metadata import DeployableMetadata
-from dataclasses import dataclass
-from sklearn.base import is_classifier, is_regressor
-from sklearn.pipeline import Pipeline
+from mlopslite.artifacts.validation import InputSchema, get_input_schema, is_arrow
+from dataclasses import dataclass, field
 import pickle
 from hashlib import md5
-from pydantic import create_model
-from pydantic.main import ModelMetaclass
+from itertools import islice
+from typing import TYPE_CHECKING, Iterable, Iterator
+import numpy as np
 import pandas as pd
 
+# sklearn and pydantic are imported where needed, scoring a restored deployable does not pay for them upfront
+if TYPE_CHECKING:
+    from pydantic.main import ModelMetaclass
+    from sklearn.pipeline import Pipeline
+
+PREDICT_OUTPUTS = ["records", "arrays"]
+
+@dataclass
+class PredictionBatch:
+
+    """
+    Columnar prediction output: class probability matrix (classifiers) or predictions, 
+    class labels and the reference ids of the rows.
+    """
+
+    reference_id: list
+    results: np.ndarray
+    classes: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self.reference_id)
+
+    @staticmethod
+    def from_records(records: list[dict]) -> "PredictionBatch":
+
+        reference_id = [i['reference_id'] for i in records]
+
+        if len(records) > 0 and isinstance(records[0]['results'], dict):
+            classes = np.array(list(records[0]['results'].keys()))
+            results = np.array([list(i['results'].values()) for i in records], dtype=float)
+            return PredictionBatch(reference_id=reference_id, results=results, classes=classes)
+
+        return PredictionBatch(reference_id=reference_id, results=np.array([i['results'] for i in records]))
+
+    def to_records(self) -> list[dict]:
+
+        if self.classes is None:
+            return [
+                {'reference_id': i[0], 'results': i[1]} for i in zip(self.reference_id, self.results)
+            ]
+
+        return [
+            {
+                'reference_id': i[0], 
+                'results': dict(zip(self.classes, i[1]))
+            } for i in zip(self.reference_id, self.results)
+        ]
+
+    def to_frame(self) -> pd.DataFrame:
+
+        """
+        reference_id column, plus a column per class (classifiers) or a prediction column.
+        """
+
+        data = {'reference_id': self.reference_id}
+        if self.classes is None:
+            data['prediction'] = self.results
+        else:
+            data.update({str(c): self.results[:, i] for i, c in enumerate(self.classes)})
+
+        return pd.DataFrame(data)
+
 @dataclass
 class Deployable:
 
-    deployable: Pipeline
+    deployable: 'Pipeline'
     metadata: DeployableMetadata
+    _input_schema: InputSchema | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __getstate__(self) -> dict:
+        # the input schema is shared and holds a compiled pydantic model, it is rebuilt after unpickling
+        state = self.__dict__.copy()
+        state['_input_schema'] = None
+        return state
 
     @property
     def classes(self):
@@ -29,63 +98,112 @@ class Deployable:
     def get_data_hash(self) -> str:
         return md5(self.serialize_deployable()).hexdigest()
     
-    def construct_pydantic_model(self) -> ModelMetaclass:
-
-        variable_definition = self.metadata.variables
-
-        class Config:
-            extra = 'forbid'
-
-        schema_definition = {k: (eval(v), None) for k,v in variable_definition.items()}
-        schema_definition['reference_id'] = (str, None)
-
-        generated_schema = create_model(
-            'inferred_model', 
-            **schema_definition, 
-            __config__=Config
-        )
-
-        return generated_schema
+    @property
+    def input_schema(self) -> InputSchema:
+        # compiled once, shared between deployables with the same variables
+        if self._input_schema is None:
+            self._input_schema = get_input_schema(self.metadata.variables)
+        return self._input_schema
+
+    def construct_pydantic_model(self) -> 'ModelMetaclass':
+        return self.input_schema.model
     
-    def predict(self, input: list[dict]):
+    def validate(self, input) -> tuple[pd.DataFrame, list]:
+
+        """
+        Validate input against the deployable variables, returns (features, reference ids).
+        DataFrame, numpy and pyarrow inputs are validated column-wise, records row by row.
+        """
+
+        if isinstance(input, pd.DataFrame):
+            return self.input_schema.validate_frame(input)
+        if isinstance(input, np.ndarray):
+            return self.input_schema.validate_array(input)
+        if is_arrow(input):
+            return self.input_schema.validate_frame(input.to_pandas())
+        return self.input_schema.validate_records(input)
+
+    def predict(
+            self, 
+            input: list[dict] | pd.DataFrame | np.ndarray, 
+            output: str = "records"
+    ) -> list[dict] | PredictionBatch:
+        
+        """
+        Score input with the deployable. 
+        output='records' returns a list of {'reference_id', 'results'} dicts per row,
+        output='arrays' returns a PredictionBatch with the probability matrix / predictions as numpy arrays.
+        """
 
         # validation
-        validator_schema = self.construct_pydantic_model()
-        input = [validator_schema(**i).__dict__ for i in input]
-
-        refid_list = [i['reference_id'] for i in input]
-
-        # convert back to DataFrame..? There should be a better way to convert back and forth
-        input = pd.DataFrame(input)
-
-        if get_estimator_type(self.deployable) == 'classifier':
+        input, refid_list = self.validate(input)
+
+        return self.predict_validated(input, refid_list, output=output)
+
+    def predict_stream(
+            self, 
+            input: Iterable[dict], 
+            batch_size: int = 1000, 
+            output: str = "records"
+    ) -> Iterator[dict] | Iterator[PredictionBatch]:
+
+        """
+        Score an iterator of records in batches of batch_size, only one batch is held in memory.
+        output='records' yields a result per record, output='arrays' a PredictionBatch per batch.
+        """
+
+        for batch in batch_records(input, batch_size):
+            result = self.predict(batch, output=output)
+            if output == "arrays":
+                yield result
+            else:
+                yield from result
+
+    def predict_validated(
+            self, 
+            input: pd.DataFrame, 
+            refid_list: list, 
+            output: str = "records"
+    ) -> list[dict] | PredictionBatch:
+
+        """
+        Score input that was already validated against the input schema (see validate).
+        """
+
+        if output not in PREDICT_OUTPUTS:
+            raise ValueError(f'Invalid output {output}, expected one of {PREDICT_OUTPUTS}')
+
+        if self.metadata.estimator_type == 'classifier':
+            batch = PredictionBatch(
+                reference_id=refid_list, 
+                results=self.deployable.predict_proba(input), 
+                classes=self.classes
+            )
+        else:
+            batch = PredictionBatch(
+                reference_id=refid_list, 
+                results=self.deployable.predict(input)
+            )
 
-            model_response = self.deployable.predict_proba(input)
+        return batch if output == "arrays" else batch.to_records()
 
-            output = [
-                {
-                    'reference_id': i[0], 
-                    'results': dict(zip(self.classes, i[1]))
-                } for i in zip(refid_list, model_response)
-            ]
-        else:
-            model_response = self.deployable.predict(input)
+### Function block ###
 
-            output = [
-                {
-                    'reference_id': i[0], 
-                    'results': i[1]
-                } for i in zip(refid_list, model_response)
-            ]
+def batch_records(input: Iterable[dict], batch_size: int) -> Iterator[pd.DataFrame]:
 
-        return output
+    # records are validated column-wise once collected into a frame
+    records = iter(input)
+    while True:
+        batch = list(islice(records, batch_size))
+        if len(batch) == 0:
+            return
+        yield pd.DataFrame(batch)
 
-### Function block ###
 
 
 
 def create_deployable( 
-        deployable: Pipeline, 
+        deployable: 'Pipeline', 
         dataset: Dataset, 
         name: str, 
         target: str, 
@@ -142,12 +260,16 @@ def verify_dataset(metadata: DeployableMetadata, dataset: Dataset):
         raise ValueError(f'Variables ({metadata.variables.keys()}) not found in dataset columns: ({ds_cols})')
     
     if metadata.target_mapping is not None:
-        if not all([i in metadata.target_mapping.keys() for i in dataset.data[metadata.target].unique()]):
+        # only the target column is needed, a lazy dataset loads just that
+        target_values = dataset.load(columns=[metadata.target])[metadata.target].unique()
+        if not all([i in metadata.target_mapping.keys() for i in target_values]):
             raise ValueError(
-                f'Target mapping {metadata.target_mapping.keys()} does not correspond to target values {dataset.data[metadata.target].unique()}'
+                f'Target mapping {metadata.target_mapping.keys()} does not correspond to target values {target_values}'
                 )
 
 def verify_deployable(deployable):
+    from sklearn.base import is_classifier
+    from sklearn.pipeline import Pipeline
 
     if not isinstance(deployable, Pipeline):
         raise ValueError('Invalid deployable, expected: sklearn.pipeline.Pipeline')
@@ -167,13 +289,15 @@ def verify_deployable(deployable):
             raise ValueError('Deployable does not implement classes_ property') 
 
 def get_estimator_type(deployable):
+    from sklearn.base import is_classifier, is_regressor
+
     if is_classifier(deployable):
         return 'classifier'
     if is_regressor(deployable):
         return 'regressor'
     return 'unknown'
 
-def variable_metadata(deployable: Pipeline, dataset: Dataset):
+def variable_metadata(deployable: 'Pipeline', dataset: Dataset):
     mod_vars = deployable.feature_names_in_
     col_meta = dataset.metadata.column_metadata
 
@@ -0,0 +1,103 @@
+"""
+Incremental content hash of a Dataset.
+
+Canonical form (version 1):
+- columns are hashed independently and combined in sorted column name order,
+  so the digest does not depend on column order (same as the legacy sort_keys=True json)
+- every column is keyed by its name, converted dtype and row count
+- values are fed as little-endian buffers of a canonical dtype per converted dtype:
+  int -> int64, float -> float64 (-0.0 normalized to 0.0), bool -> uint8,
+  str -> utf-8 payload + int64 character lengths
+- nulls are a separate uint8 mask, the null slot in the value buffer holds a zero/empty value
+
+Values, masks and string lengths go into separate hashers, so the digest does not depend on how
+rows are chunked, which allows hashing datasets that are streamed in parts.
+"""
+from hashlib import md5
+
+import numpy as np
+import pandas as pd
+
+HASH_VERSION = b"mlopslite-dataset-hash-v1"
+HASH_CHUNK_ROWS = 1 << 20
+
+
+class ColumnHasher:
+
+    def __init__(self, name: str, converted_dtype: str) -> None:
+        self.name = name
+        self.converted_dtype = converted_dtype
+        self.rows = 0
+        self._values = md5()
+        self._mask = md5()
+        self._lengths = md5()
+
+    def update(self, column: pd.Series) -> None:
+
+        mask = column.isna().to_numpy()
+        has_nulls = bool(mask.any())
+        self.rows += len(mask)
+
+        self._mask.update(mask.astype(np.uint8).tobytes())
+
+        if self.converted_dtype == "str":
+            values = column.to_numpy(dtype=object)
+            if has_nulls:
+                values = values[~mask]
+            strings = list(map(str, values))
+            self._lengths.update(np.fromiter(map(len, strings), dtype="<i8", count=len(strings)).tobytes())
+            self._values.update("".join(strings).encode("utf-8"))
+            return
+
+        if column.dtype.kind == "M":
+            values = column.to_numpy(dtype="datetime64[ns]").view("<i8")
+            if has_nulls:
+                values = np.where(mask, 0, values)
+        else:
+            canonical = {"float": "<f8", "bool": "u1"}.get(self.converted_dtype, "<i8")
+            values = column.to_numpy(dtype=canonical, na_value=0)
+
+        if self.converted_dtype == "float":
+            values = values + 0.0  # normalizes -0.0
+
+        self._values.update(np.ascontiguousarray(values).tobytes())
+
+    def digest(self) -> bytes:
+        header = f"{self.name}\x00{self.converted_dtype}\x00{self.rows}".encode("utf-8")
+        return md5(header + self._values.digest() + self._mask.digest() + self._lengths.digest()).digest()
+
+
+class DatasetHasher:
+
+    """
+    Streaming hasher over a Dataset, fed chunk by chunk (DataFrames with the same columns).
+    """
+
+    def __init__(self, dtypes: dict[str, str], chunk_rows: int = HASH_CHUNK_ROWS) -> None:
+        self.chunk_rows = chunk_rows
+        self.columns = {k: ColumnHasher(k, v) for k, v in dtypes.items()}
+
+    def update(self, data: pd.DataFrame) -> None:
+
+        if set(data.columns) != set(self.columns.keys()):
+            raise ValueError(f"Columns {list(data.columns)} do not match hashed columns {list(self.columns.keys())}")
+
+        for name, hasher in self.columns.items():
+            column = data[name]
+            for start in range(0, len(column), self.chunk_rows):
+                hasher.update(column.iloc[start:start + self.chunk_rows])
+
+    def hexdigest(self) -> str:
+
+        out = md5(HASH_VERSION)
+        for name in sorted(self.columns.keys()):
+            out.update(self.columns[name].digest())
+
+        return out.hexdigest()
+
+
+def hash_dataframe(data: pd.DataFrame, dtypes: dict[str, str], chunk_rows: int = HASH_CHUNK_ROWS) -> str:
+
+    hasher = DatasetHasher(dtypes, chunk_rows=chunk_rows)
+    hasher.update(data)
+    return hasher.hexdigest()
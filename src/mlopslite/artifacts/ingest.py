@@ -0,0 +1,144 @@
+"""
+Streaming Dataset ingestion: metadata, content hash and the encoded data are built chunk by chunk,
+so datasets larger than memory can be registered. Results match create_dataset + Dataset.get_data_hash
+on the concatenated chunks (approximate unique counts aside, see ColumnProfile).
+"""
+
+from typing import BinaryIO, Iterable
+
+import pandas as pd
+
+from mlopslite.artifacts.hashing import DatasetHasher
+from mlopslite.artifacts.metadata import ColumnMetadata, DatasetMetadata, translate_type_to_primitive
+from mlopslite.artifacts.profiling import ColumnProfile
+from mlopslite.artifacts.storage import DatasetWriter
+
+
+class DatasetIngest:
+
+    """
+    Feed DataFrame chunks with the same columns to update, finish returns (DatasetMetadata, hash).
+    With a sink, chunks are also encoded into it in data_format (see storage.DatasetWriter).
+
+    Column dtypes are fixed by the first chunk. Later chunks are cast to them where no value changes:
+    all-null columns (e.g. a string column without values in a CSV chunk), int columns of a float column and
+    float columns holding whole numbers only of an int column. Other mismatches are rejected (e.g. an int
+    column with nulls in a later chunk, the earlier chunks are already written), pass explicit dtypes to
+    the reader instead (read_chunks(..., dtype=...)).
+    """
+
+    def __init__(
+            self,
+            name: str,
+            description: str = "",
+            exact_unique: bool = False,
+            sink: BinaryIO | None = None,
+            data_format: str = "npz",
+            sketch: bool = False
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.exact_unique = exact_unique
+        self.sketch = sketch
+        self.writer = DatasetWriter(sink, format=data_format) if sink is not None else None
+
+        self.rows = 0
+        self.original_dtypes = None
+        self.first_dtypes = None
+        self.dtypes = None
+        self.profiles = None
+        self.hasher = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+
+        dtypes = {k: translate_type_to_primitive(v) for k, v in chunk.dtypes.items()}
+
+        if self.dtypes is None:
+            self.original_dtypes = {k: str(v) for k, v in chunk.dtypes.items()}
+            self.first_dtypes = dict(chunk.dtypes)
+            self.dtypes = dtypes
+            self.profiles = {k: ColumnProfile(v, exact_unique=self.exact_unique, sketch=self.sketch) for k, v in dtypes.items()}
+            self.hasher = DatasetHasher(dtypes)
+        elif dtypes != self.dtypes:
+            chunk = self._cast(chunk, dtypes)
+            dtypes = {k: translate_type_to_primitive(v) for k, v in chunk.dtypes.items()}
+            if dtypes != self.dtypes:
+                changed = {k: (self.dtypes.get(k), v) for k, v in dtypes.items() if self.dtypes.get(k) != v}
+                raise ValueError(
+                    f"Chunk columns do not match the first chunk: {changed}, expected {self.dtypes}, "
+                    "pass explicit dtypes to the reader"
+                )
+
+        for name, profile in self.profiles.items():
+            profile.update(chunk[name])
+
+        self.hasher.update(chunk)
+        if self.writer is not None:
+            self.writer.write(chunk)
+
+        self.rows += len(chunk)
+
+    def _cast(self, chunk: pd.DataFrame, dtypes: dict[str, str]) -> pd.DataFrame:
+
+        casts = {}
+        for k, v in dtypes.items():
+            expected, first = self.dtypes.get(k), self.first_dtypes.get(k)
+            if expected is None or v == expected:
+                continue
+
+            column = chunk[k]
+            if column.isna().all() and first.kind in "fOM":
+                casts[k] = first
+            elif (v, expected) == ("int", "float"):
+                casts[k] = first
+            elif (v, expected) == ("float", "int") and first.kind in "iu" and column.notna().all() and (column % 1 == 0).all():
+                casts[k] = first
+
+        return chunk.astype(casts) if casts else chunk
+
+    def finish(self) -> tuple[DatasetMetadata, str]:
+
+        if self.dtypes is None:
+            raise ValueError("No data was ingested")
+
+        if self.writer is not None:
+            self.writer.close()
+
+        column_metadata = [
+            ColumnMetadata(
+                column_name=k,
+                original_dtype=self.original_dtypes[k],
+                converted_dtype=v,
+                **self.profiles[k].summary()
+            ) for k, v in self.dtypes.items()
+        ]
+
+        metadata = DatasetMetadata(
+            name=self.name,
+            version=None,
+            id=None,
+            description=self.description,
+            size_cols=len(column_metadata),
+            size_rows=self.rows,
+            column_metadata=column_metadata
+        )
+
+        return metadata, self.hasher.hexdigest()
+
+
+def ingest_chunks(
+        chunks: Iterable[pd.DataFrame],
+        name: str,
+        description: str = "",
+        exact_unique: bool = False,
+        sink: BinaryIO | None = None,
+        data_format: str = "npz",
+        sketch: bool = False
+) -> tuple[DatasetMetadata, str]:
+
+    ingest = DatasetIngest(
+        name, description=description, exact_unique=exact_unique, sink=sink, data_format=data_format, sketch=sketch
+    )
+    for chunk in chunks:
+        ingest.update(chunk)
+    return ingest.finish()
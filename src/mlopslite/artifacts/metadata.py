@@ -3,6 +3,9 @@ from typing import Any
 
 import pandas as pd
 
+from mlopslite.artifacts.profiling import profile_columns, profile_column
+from mlopslite.artifacts.sketches import ColumnSketch
+
 @dataclass
 class ColumnMetadata:
     column_name: str
@@ -12,31 +15,27 @@ class ColumnMetadata:
     unique_count: int
     min_value_num: float
     max_value_num: float
+    # distinct count, quantiles and frequent values, only if profiled with sketch=True
+    sketch: ColumnSketch | None = None
     #unique_val_str: list[str] # not all DBs implement arrays, perhaps should go as many-to-one table
 
     @staticmethod
-    def create(key, column: pd.Series) -> "ColumnMetadata":
+    def create(key, column: pd.Series, exact_unique: bool = True, sketch: bool = False) -> "ColumnMetadata":
+
+        converted_dtype = translate_type_to_primitive(column.dtype)
 
         # summarize col
         summary = {
             "column_name": key,
             "original_dtype": str(column.dtype),
-            "converted_dtype": translate_type_to_primitive(column.dtype),
-            "null_count": len([i for i in column if pd.isna(i)]),
-            "unique_count": len(set([i for i in column if not pd.isna(i)])),
+            "converted_dtype": converted_dtype,
+            **profile_column(column, converted_dtype, exact_unique=exact_unique, sketch=sketch),
         }
 
-        if summary["converted_dtype"] in ["int", "float"]:
-            summary["min_value_num"] = float(min([i for i in column if not pd.isna(i)]))
-            summary["max_value_num"] = float(max([i for i in column if not pd.isna(i)]))
-            #summary["unique_val_str"] = None
-        else:
-            summary["min_value_num"] = None
-            summary["max_value_num"] = None
-            #summary["unique_val_str"] = list(set(column))
-
         return ColumnMetadata(**summary)
     
+PRIMITIVE_TYPES = {"int": int, "float": float, "str": str, "bool": bool}
+
 def translate_type_to_primitive(dtype):
     # caveat: pandas breaks int arrays that have None values
     # it might be fixed with pandas 2.+ arrow backend
@@ -61,8 +60,23 @@ class DatasetMetadata:
         name: str, 
         version: int, 
         description: str,
-        id: int | None = None
+        id: int | None = None,
+        exact_unique: bool = True,
+        parallel: bool = False,
+        sketch: bool = False
     ) -> "DatasetMetadata":
+
+        dtypes = {k: translate_type_to_primitive(v) for k, v in data.dtypes.items()}
+        profiles = profile_columns(data, dtypes, exact_unique=exact_unique, parallel=parallel, sketch=sketch)
+
+        column_metadata = [
+            ColumnMetadata(
+                column_name=k, 
+                original_dtype=str(v), 
+                converted_dtype=dtypes[k], 
+                **p
+            ) for (k, v), p in zip(data.dtypes.items(), profiles)
+        ]
         
         dataset_metadata = {
             "name": name,
@@ -71,7 +85,7 @@ class DatasetMetadata:
             "description": description,
             "size_cols": data.shape[1],
             "size_rows": data.shape[0],
-            "column_metadata": [ColumnMetadata.create(k, v) for k, v in data.items()],
+            "column_metadata": column_metadata,
         }
 
         return DatasetMetadata(**dataset_metadata)
@@ -92,4 +106,5 @@ class DeployableMetadata:
     description: str
     estimator_type: str
     estimator_class: str
-    variables: dict[str, Any]
\ No newline at end of file
+    variables: dict[str, Any]
+    hash: str | None = None
\ No newline at end of file
@@ -0,0 +1,200 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from mlopslite.artifacts.sketches import HLL_PRECISION, ColumnSketch, hll_estimate, hll_registers
+
+
+def profile_column(column: pd.Series, converted_dtype: str, exact_unique: bool = True, sketch: bool = False) -> dict:
+
+    """
+    Summarize a single column in one vectorized pass:
+    null mask and non-null values are extracted once and all statistics are computed from them.
+    With sketch, the summary also holds a ColumnSketch (distinct count, quantiles, frequent values),
+    which gives the approximate unique count.
+    """
+
+    values, null_count = non_null_values(column)
+
+    column_sketch = None
+    if sketch:
+        column_sketch = ColumnSketch(converted_dtype)
+        column_sketch.update(values)
+
+    summary = {
+        "null_count": null_count,
+        "unique_count": column_sketch.distinct_count() if sketch and not exact_unique else count_unique(values, exact=exact_unique),
+        "min_value_num": None,
+        "max_value_num": None,
+    }
+    if sketch:
+        summary["sketch"] = column_sketch
+
+    if converted_dtype in ["int", "float"] and len(values) > 0:
+        values = values.astype("float64", copy=False)
+        summary["min_value_num"] = float(values.min())
+        summary["max_value_num"] = float(values.max())
+
+    return summary
+
+
+def non_null_values(column: pd.Series) -> tuple[np.ndarray, int]:
+
+    mask = column.isna().to_numpy()
+    null_count = int(mask.sum())
+
+    if column.dtype.kind == "M":
+        # datetimes are profiled as their int64 (ns) representation
+        values = column.to_numpy(dtype="datetime64[ns]").view("i8")
+    else:
+        values = column.to_numpy()
+
+    if null_count > 0:
+        values = values[~mask]
+
+    return values, null_count
+
+
+class ColumnProfile:
+
+    """
+    Running profile_column over chunks of a column, with the same summary as profiling the whole column.
+    Profiles of different chunks (e.g. profiled in parallel) are combined with merge.
+
+    Exact unique counts keep the distinct values seen so far, approximate ones only the HyperLogLog registers
+    (fixed memory, registers of the whole column are the element-wise max of the chunk registers).
+    With sketch, a ColumnSketch is kept as well (and replaces the separate registers).
+    """
+
+    def __init__(
+            self, 
+            converted_dtype: str, 
+            exact_unique: bool = True, 
+            precision: int = HLL_PRECISION, 
+            sketch: bool = False
+    ) -> None:
+        self.converted_dtype = converted_dtype
+        self.exact_unique = exact_unique
+        self.precision = precision
+        self.null_count = 0
+        self.min_value_num = None
+        self.max_value_num = None
+        self.sketch = ColumnSketch(converted_dtype, precision=precision) if sketch else None
+        self._uniques = None
+        self._registers = None if exact_unique or sketch else np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, column: pd.Series) -> None:
+
+        values, null_count = non_null_values(column)
+        self.null_count += null_count
+
+        if len(values) == 0:
+            return
+
+        if self.sketch is not None:
+            self.sketch.update(values)
+
+        if self.exact_unique:
+            uniques = pd.unique(values)
+            self._uniques = uniques if self._uniques is None else pd.unique(np.concatenate([self._uniques, uniques]))
+        elif self.sketch is None:
+            registers = hll_registers(pd.util.hash_array(values), precision=self.precision)
+            np.maximum(self._registers, registers, out=self._registers)
+
+        if self.converted_dtype in ["int", "float"]:
+            values = values.astype("float64", copy=False)
+            self._update_range(float(values.min()), float(values.max()))
+
+    def merge(self, other: "ColumnProfile") -> "ColumnProfile":
+
+        settings = lambda i: (i.converted_dtype, i.exact_unique, i.precision, i.sketch is None)
+        if settings(other) != settings(self):
+            raise ValueError("Can only merge profiles of the same dtype, unique count and sketch settings")
+
+        self.null_count += other.null_count
+
+        if self.sketch is not None:
+            self.sketch.merge(other.sketch)
+
+        if self.exact_unique:
+            if other._uniques is not None:
+                self._uniques = other._uniques if self._uniques is None else pd.unique(np.concatenate([self._uniques, other._uniques]))
+        elif self.sketch is None:
+            np.maximum(self._registers, other._registers, out=self._registers)
+
+        if other.min_value_num is not None:
+            self._update_range(other.min_value_num, other.max_value_num)
+
+        return self
+
+    def summary(self) -> dict:
+
+        if self.exact_unique:
+            unique_count = 0 if self._uniques is None else len(self._uniques)
+        elif self.sketch is not None:
+            unique_count = self.sketch.distinct_count()
+        else:
+            unique_count = hll_estimate(self._registers)
+
+        summary = {
+            "null_count": self.null_count,
+            "unique_count": unique_count,
+            "min_value_num": self.min_value_num,
+            "max_value_num": self.max_value_num,
+        }
+        if self.sketch is not None:
+            summary["sketch"] = self.sketch
+
+        return summary
+
+    def _update_range(self, min_value: float, max_value: float) -> None:
+        self.min_value_num = min_value if self.min_value_num is None else min(self.min_value_num, min_value)
+        self.max_value_num = max_value if self.max_value_num is None else max(self.max_value_num, max_value)
+
+
+def profile_columns(
+    data: pd.DataFrame,
+    dtypes: dict[str, str],
+    exact_unique: bool = True,
+    parallel: bool = False,
+    max_workers: int | None = None,
+    sketch: bool = False
+) -> list[dict]:
+
+    """
+    Profile all columns of a DataFrame, optionally in a thread pool across columns.
+    numpy/pandas release the GIL for the heavy lifting, so threads scale on wide tables.
+    """
+
+    def _profile(key):
+        return profile_column(data[key], dtypes[key], exact_unique=exact_unique, sketch=sketch)
+
+    if not parallel or data.shape[1] < 2:
+        return [_profile(k) for k in data.columns]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_profile, data.columns))
+
+
+def count_unique(values: np.ndarray, exact: bool = True) -> int:
+
+    if len(values) == 0:
+        return 0
+
+    if exact:
+        return len(pd.unique(values))
+
+    return approximate_unique(values)
+
+
+def approximate_unique(values: np.ndarray, precision: int = HLL_PRECISION) -> int:
+
+    """
+    HyperLogLog estimate of distinct values, computed from 64-bit hashes of the values.
+    Memory is fixed at 2**precision registers regardless of cardinality.
+    """
+
+    hashes = pd.util.hash_array(values)
+    registers = hll_registers(hashes, precision=precision)
+    return hll_estimate(registers)
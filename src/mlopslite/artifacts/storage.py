@@ -0,0 +1,268 @@
+"""
+Serialization of Dataset contents for the registry.
+
+- json: legacy dict-of-lists, stored in DatasetRegistry.data
+- npy: per-column numpy arrays (uncompressed), stored as binary blob
+- npz: per-column numpy arrays (zlib compressed), stored as binary blob
+- parquet, arrow: via pyarrow (optional dependency), stored as binary blob
+
+npy/npz blobs are a sequence of length-prefixed frames, each frame holding a horizontal
+slice of the dataset. A regular push writes a single frame; chunked writers append frames.
+"""
+import io
+import struct
+from typing import BinaryIO
+
+import numpy as np
+import pandas as pd
+
+DATASET_FORMATS = ["json", "npy", "npz", "parquet", "arrow"]
+BINARY_FORMATS = ["npy", "npz", "parquet", "arrow"]
+
+_FRAME_HEADER = struct.Struct("<Q")
+_COLUMNS_KEY = "__columns__"
+
+
+def encode_dataset(data: pd.DataFrame, format: str) -> bytes:
+
+    if format in ["npy", "npz"]:
+        return encode_frame(data, compress=(format == "npz"))
+    if format == "parquet":
+        return _encode_parquet(data)
+    if format == "arrow":
+        return _encode_arrow(data)
+
+    raise ValueError(f"Unsupported binary dataset format: {format}, expected one of {BINARY_FORMATS}")
+
+
+def decode_dataset(blob: bytes, format: str, columns: list[str] | None = None) -> pd.DataFrame:
+
+    if format in ["npy", "npz"]:
+        return _decode_frames(blob, columns=columns)
+    if format == "parquet":
+        return _decode_parquet(blob, columns=columns)
+    if format == "arrow":
+        return _decode_arrow(blob, columns=columns)
+
+    raise ValueError(f"Unsupported binary dataset format: {format}, expected one of {BINARY_FORMATS}")
+
+
+class DatasetWriter:
+
+    """
+    Encodes a dataset chunk by chunk into a binary file, the result decodes the same as encode_dataset
+    of the concatenated chunks. npy/npz write a frame per chunk, parquet a row group, arrow a record batch.
+    """
+
+    def __init__(self, file: BinaryIO, format: str) -> None:
+
+        if format not in BINARY_FORMATS:
+            raise ValueError(f"Unsupported binary dataset format: {format}, expected one of {BINARY_FORMATS}")
+
+        self.file = file
+        self.format = format
+        self._writer = None
+        self._schema = None
+
+    def write(self, data: pd.DataFrame) -> None:
+
+        if self.format in ["npy", "npz"]:
+            self.file.write(encode_frame(data, compress=(self.format == "npz")))
+            return
+
+        pa = _import_pyarrow()
+        table = pa.Table.from_pandas(data, preserve_index=False)
+
+        if self._writer is None:
+            self._schema = table.schema
+            if self.format == "parquet":
+                import pyarrow.parquet as pq
+                self._writer = pq.ParquetWriter(self.file, self._schema)
+            else:
+                self._writer = pa.ipc.new_file(self.file, self._schema)
+        elif not table.schema.equals(self._schema):
+            # e.g. an all-null chunk of a string column
+            table = table.cast(self._schema)
+
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+### numpy frames
+
+def column_to_arrays(column: pd.Series) -> dict[str, np.ndarray]:
+
+    """
+    Convert column into pickle-free numpy arrays: 'values', plus 'offsets' for string columns and a null 'mask'.
+    Numeric, bool and datetime columns are stored natively (NaN/NaT carry nulls). String columns are stored
+    as a UTF-8 byte buffer with int64 offsets (row i is values[offsets[i]:offsets[i + 1]]), so memory follows
+    the total text size, not rows x longest value. Other object columns are cast: bool, int or float values
+    with nulls (e.g. a CSV bool column with blank cells) to a native array plus the mask, anything else
+    (mixed types) to strings per value, the 'str' primitive of the column (as Dataset.convert_to_dict).
+    """
+
+    kind = column.dtype.kind
+
+    if kind in "iufb" and isinstance(column.dtype, np.dtype):
+        return {"values": column.to_numpy()}
+
+    if kind in "Mm" and isinstance(column.dtype, np.dtype):
+        return {"values": column.to_numpy()}
+
+    values = column.to_numpy(dtype=object)
+    mask = pd.isna(values)
+    inferred = pd.api.types.infer_dtype(values, skipna=True)
+
+    native = {"boolean": bool, "integer": np.int64, "floating": np.float64, "mixed-integer-float": np.float64}
+    if inferred in native:
+        try:
+            out = {"values": np.where(mask, native[inferred](0), values).astype(native[inferred])}
+        except OverflowError:
+            # ints beyond int64, stored as strings below
+            out = None
+        if out is not None:
+            if mask.any():
+                out["mask"] = mask
+            return out
+
+    if inferred in ["string", "empty"]:
+        encoded = [b"" if null else value.encode("utf-8") for value, null in zip(values, mask)]
+    else:
+        encoded = [b"" if null else str(value).encode("utf-8") for value, null in zip(values, mask)]
+
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(i) for i in encoded], out=offsets[1:])
+
+    out = {"values": np.frombuffer(b"".join(encoded), dtype=np.uint8), "offsets": offsets}
+    if mask.any():
+        out["mask"] = mask
+    return out
+
+
+def arrays_to_column(values: np.ndarray, mask: np.ndarray | None = None, offsets: np.ndarray | None = None) -> np.ndarray:
+
+    if offsets is not None:
+        buffer = values.tobytes()
+        out = np.empty(len(offsets) - 1, dtype=object)
+        out[:] = [buffer[i:j].decode("utf-8") for i, j in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+    elif mask is not None:
+        # object column of bool / int / float values with nulls
+        out = values.astype(object)
+    else:
+        return values
+
+    if mask is not None:
+        out[mask] = None
+    return out
+
+
+def encode_frame(data: pd.DataFrame, compress: bool = False) -> bytes:
+
+    arrays = {_COLUMNS_KEY: np.array([str(i) for i in data.columns], dtype=str)}
+
+    for i, (_, column) in enumerate(data.items()):
+        parts = column_to_arrays(column)
+        arrays[f"c{i}"] = parts["values"]
+        if "offsets" in parts:
+            arrays[f"o{i}"] = parts["offsets"]
+        if "mask" in parts:
+            arrays[f"m{i}"] = parts["mask"]
+
+    buffer = io.BytesIO()
+    if compress:
+        np.savez_compressed(buffer, **arrays)
+    else:
+        np.savez(buffer, **arrays)
+
+    frame = buffer.getvalue()
+    return _FRAME_HEADER.pack(len(frame)) + frame
+
+
+def iter_frames(blob: bytes):
+
+    view = memoryview(blob)
+    offset = 0
+    while offset < len(view):
+        (size,) = _FRAME_HEADER.unpack_from(view, offset)
+        offset += _FRAME_HEADER.size
+        yield view[offset:offset + size]
+        offset += size
+
+
+def decode_frame(frame, columns: list[str] | None = None) -> dict[str, np.ndarray]:
+
+    with np.load(io.BytesIO(frame), allow_pickle=False) as npz:
+        names = [str(i) for i in npz[_COLUMNS_KEY]]
+        wanted = names if columns is None else columns
+
+        out = {}
+        for name in wanted:
+            if name not in names:
+                raise KeyError(f"Column {name} not found in dataset columns: {names}")
+            i = names.index(name)
+            mask = npz[f"m{i}"] if f"m{i}" in npz.files else None
+            offsets = npz[f"o{i}"] if f"o{i}" in npz.files else None
+            out[name] = arrays_to_column(npz[f"c{i}"], mask, offsets)
+
+    return out
+
+
+def _decode_frames(blob: bytes, columns: list[str] | None = None) -> pd.DataFrame:
+
+    frames = [decode_frame(f, columns=columns) for f in iter_frames(blob)]
+
+    if len(frames) == 1:
+        return pd.DataFrame(frames[0])
+
+    data = {k: np.concatenate([f[k] for f in frames]) for k in frames[0].keys()}
+    return pd.DataFrame(data)
+
+
+### pyarrow
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("parquet/arrow dataset formats require pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def _encode_parquet(data: pd.DataFrame) -> bytes:
+    pa = _import_pyarrow()
+    import pyarrow.parquet as pq
+
+    buffer = io.BytesIO()
+    pq.write_table(pa.Table.from_pandas(data, preserve_index=False), buffer)
+    return buffer.getvalue()
+
+
+def _decode_parquet(blob: bytes, columns: list[str] | None = None) -> pd.DataFrame:
+    pa = _import_pyarrow()
+    import pyarrow.parquet as pq
+
+    # BufferReader reads any buffer (bytes, mmap) without copying it
+    return pq.read_table(pa.BufferReader(blob), columns=columns).to_pandas()
+
+
+def _encode_arrow(data: pd.DataFrame) -> bytes:
+    pa = _import_pyarrow()
+
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _decode_arrow(blob: bytes, columns: list[str] | None = None) -> pd.DataFrame:
+    pa = _import_pyarrow()
+
+    table = pa.ipc.open_file(pa.py_buffer(blob)).read_all()
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas()
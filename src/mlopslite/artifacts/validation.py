@@ -0,0 +1,214 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from mlopslite.artifacts.metadata import PRIMITIVE_TYPES
+
+if TYPE_CHECKING:
+    from pydantic.main import ModelMetaclass
+
+REFERENCE_ID = "reference_id"
+
+# accepted by pydantic (v1) for bool fields, strings compared lowercased
+BOOL_TRUE = {1, "1", "on", "t", "true", "y", "yes"}
+BOOL_FALSE = {0, "0", "off", "f", "false", "n", "no"}
+
+# compiled schemas, shared by all deployables with the same variables
+_SCHEMAS: dict[tuple, "InputSchema"] = {}
+
+
+class InputSchema:
+
+    """
+    Validation schema of Deployable inputs, compiled once from the deployable variables ({name: converted_dtype}).
+
+    - records (list[dict]) are validated row by row through a pydantic model, built once on first use
+    - DataFrame and numpy inputs are validated column-wise, without per-row objects
+
+    Both paths follow the same rules: unknown keys are rejected, values are coerced to the variable type,
+    missing keys and nulls are passed on as nulls unless strict=True.
+    """
+
+    def __init__(self, variables: dict[str, str]) -> None:
+        self.variables = dict(variables)
+        self.names = list(self.variables.keys())
+        self._model = None
+
+    @property
+    def model(self) -> 'ModelMetaclass':
+        if self._model is None:
+            self._model = self._compile_model()
+        return self._model
+
+    def _compile_model(self) -> 'ModelMetaclass':
+        from pydantic import create_model
+
+        class Config:
+            extra = 'forbid'
+
+        schema_definition = {k: (PRIMITIVE_TYPES[v], None) for k, v in self.variables.items()}
+        schema_definition[REFERENCE_ID] = (str, None)
+
+        return create_model('inferred_model', **schema_definition, __config__=Config)
+
+    def validate_records(self, input: list[dict]) -> tuple[pd.DataFrame, list]:
+
+        records = [self.model(**i).__dict__ for i in input]
+        refid_list = [i.pop(REFERENCE_ID) for i in records]
+
+        return pd.DataFrame(records, columns=self.names), refid_list
+
+    def validate_frame(self, input: pd.DataFrame, strict: bool = False) -> tuple[pd.DataFrame, list]:
+
+        columns = [str(i) for i in input.columns]
+
+        extra = [i for i in columns if i not in self.variables and i != REFERENCE_ID]
+        if len(extra) > 0:
+            raise ValueError(f'Unexpected input variables: {extra}, expected: {self.names}')
+
+        missing = [i for i in self.names if i not in columns]
+        if strict and len(missing) > 0:
+            raise ValueError(f'Missing input variables: {missing}')
+
+        if REFERENCE_ID in columns:
+            refid_list = coerce_column(input[REFERENCE_ID], "str").tolist()
+        else:
+            refid_list = [None] * len(input)
+
+        out = {}
+        for name in self.names:
+            if name in missing:
+                out[name] = pd.Series(None, index=input.index, dtype=object)
+                continue
+
+            column = input[name]
+            if strict and column.isna().any():
+                raise ValueError(f'Null values in input variable: {name}')
+
+            out[name] = coerce_column(column, self.variables[name], name=name)
+
+        return pd.DataFrame(out, index=input.index, copy=False), refid_list
+
+    def validate_array(
+        self,
+        input: np.ndarray,
+        reference_ids: list | None = None,
+        strict: bool = False
+    ) -> tuple[pd.DataFrame, list]:
+
+        """
+        2D array with columns in the order of the deployable variables.
+        """
+
+        if input.ndim != 2 or input.shape[1] != len(self.names):
+            raise ValueError(f'Expected 2D array with {len(self.names)} columns ({self.names}), got shape {input.shape}')
+
+        if reference_ids is not None and len(reference_ids) != input.shape[0]:
+            raise ValueError(f'Got {len(reference_ids)} reference ids for {input.shape[0]} rows')
+
+        frame, _ = self.validate_frame(pd.DataFrame(input, columns=self.names), strict=strict)
+        refid_list = [None] * len(frame) if reference_ids is None else list(reference_ids)
+
+        return frame, refid_list
+
+
+def get_input_schema(variables: dict[str, str]) -> InputSchema:
+
+    key = tuple(variables.items())
+    if key not in _SCHEMAS:
+        _SCHEMAS[key] = InputSchema(variables)
+    return _SCHEMAS[key]
+
+
+def to_frame(input, names: list[str]) -> pd.DataFrame:
+
+    """
+    View of any supported input (records, DataFrame, 2D numpy array, pyarrow Table/RecordBatch) as a DataFrame.
+    """
+
+    if isinstance(input, pd.DataFrame):
+        return input
+    if isinstance(input, np.ndarray):
+        return pd.DataFrame(input, columns=names)
+    if is_arrow(input):
+        return input.to_pandas()
+    return pd.DataFrame(input)
+
+
+def is_arrow(input) -> bool:
+    # avoids importing pyarrow just for the isinstance check
+    return type(input).__module__.startswith("pyarrow") and hasattr(input, "to_pandas")
+
+
+def coerce_column(column: pd.Series, converted_dtype: str, name: str = "") -> pd.Series:
+
+    """
+    Vectorized equivalent of the pydantic coercion for the primitive types.
+    """
+
+    kind = column.dtype.kind
+
+    # already in the representation of the training data
+    if (converted_dtype, column.dtype) in [("float", np.float64), ("int", np.int64)]:
+        return column
+
+    mask = column.isna()
+
+    if converted_dtype in ["int", "float"]:
+        if kind in "iuf":
+            values = column
+        else:
+            values = pd.to_numeric(column, errors='coerce')
+            invalid = values.isna() & ~mask
+            if invalid.any():
+                raise ValueError(f'Invalid {converted_dtype} values in input variable {name}: {column[invalid].head().tolist()}')
+
+        if converted_dtype == "float":
+            return values.astype("float64")
+
+        # int columns with nulls stay float, same as pandas representation of training data
+        return values.astype("int64") if not mask.any() else values.astype("float64")
+
+    if converted_dtype == "bool":
+        if kind == "b":
+            return column
+
+        # same accepted values as the pydantic bool validator of the records path, distinct values parsed once
+        mapping = {}
+        for value in pd.unique(column[~mask]):
+            parsed = bool_value(value)
+            if parsed is None:
+                raise ValueError(f'Invalid bool value in input variable {name}: {value!r}')
+            mapping[value] = parsed
+
+        return column.map(mapping).astype(object).where(~mask, None)
+
+    # str
+    if kind == "O" and pd.api.types.infer_dtype(column, skipna=True) in ["string", "empty"]:
+        return column.where(~mask, None) if mask.any() else column
+    return column.astype(str).astype(object).where(~mask, None)
+
+
+def bool_value(value) -> bool | None:
+
+    """
+    Bool of a single input value as the pydantic bool validator parses it, None if it is not accepted.
+    """
+
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, bytes):
+        value = value.decode()
+    if isinstance(value, str):
+        value = value.lower()
+
+    try:
+        if value in BOOL_TRUE:
+            return True
+        if value in BOOL_FALSE:
+            return False
+    except TypeError:
+        # unhashable values
+        pass
+    return None
@@ -0,0 +1,143 @@
+import pandas as pd
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Any
+
+from mlopslite.artifacts.dataset import Dataset, create_dataset
+from mlopslite.artifacts.deployable import Deployable, create_deployable
+from mlopslite.artifacts.validation import to_frame
+from mlopslite.registry.asyncregistry import AsyncRegistry
+from mlopslite.registry.registryconfig import RegistryConfig
+
+
+class AsyncMlopsLite:
+
+    """
+    asyncio version of MlopsLite, for scoring services running on an event loop.
+    Registry access is awaited on an async engine, model inference and other CPU-bound work runs in executor
+    (default: the loop's default thread pool), so concurrent requests overlap their DB I/O.
+
+        async with AsyncMlopsLite(config) as client:
+            await client.pull_deployable(1)
+            output = await client.predict(input, log=True)
+    """
+
+    def __init__(self, config: RegistryConfig = RegistryConfig(), executor: Executor | None = None) -> None:
+        self.registry = AsyncRegistry(config=config, executor=executor)
+
+    async def connect(self) -> "AsyncMlopsLite":
+        await self.registry.connect()
+        return self
+
+    async def __aenter__(self) -> "AsyncMlopsLite":
+        return await self.connect()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def bind_dataset(
+            self,
+            data,
+            name: str,
+            description: str = "",
+            exact_unique: bool = True,
+            parallel: bool = False,
+            sketch: bool = False
+    ) -> None:
+        dataset = await self.registry.run_blocking(
+            create_dataset,
+            data=data,
+            name=name,
+            description=description,
+            exact_unique=exact_unique,
+            parallel=parallel,
+            sketch=sketch
+        )
+        await self.push_dataset(dataset=dataset)
+
+    async def pull_dataset(self, id: int) -> None:
+        self.dataset = await self.registry.pull_dataset_from_registry(id=id)
+
+    async def push_dataset(self, dataset: Dataset) -> None:
+        # pushing also pulls back the dataset, to populate proper references
+        registry_ref = await self.registry.push_dataset_to_registry(dataset=dataset)
+        await self.pull_dataset(id=registry_ref['id'])
+
+    async def list_datasets(self) -> pd.DataFrame:
+        return await self.registry.list_datasets()
+
+    async def bind_deployable(
+            self,
+            deployable,
+            name: str,
+            target: str,
+            target_mapping: dict[str, Any] | None = None,
+            description: str = ""
+    ) -> None:
+
+        deployable = await self.registry.run_blocking(
+            create_deployable,
+            deployable=deployable,
+            dataset=self.dataset,
+            name=name,
+            target=target,
+            target_mapping=target_mapping,
+            description=description
+        )
+
+        await self.push_deployable(deployable)
+
+    async def pull_deployable(self, id: int) -> None:
+        self.deployable = await self.registry.pull_deployable_from_registry(id=id)
+
+    async def push_deployable(self, deployable: Deployable) -> None:
+        # pushing also pulls back the deployable, to populate proper references
+        registry_ref = await self.registry.push_deployable_to_registry(deployable=deployable)
+        await self.pull_deployable(id=registry_ref['id'])
+
+    async def list_deployables(self) -> pd.DataFrame:
+        return await self.registry.list_deployables()
+
+    async def get_deployable(self, deployable_id: int | str | None = None) -> Deployable:
+
+        """
+        Active deployable (None), or any registered one by id, 'name@version' or 'name' (most recently registered).
+        """
+
+        if deployable_id is None:
+            return self.deployable
+
+        id = await self.registry.resolve_deployable_id(deployable_id)
+        return await self.registry.pull_deployable_from_registry(id=id)
+
+    async def predict(
+            self,
+            input: list[dict] | pd.DataFrame,
+            log: bool = False,
+            output: str = "records",
+            deployable_id: int | str | None = None
+    ):
+
+        deployable = await self.get_deployable(deployable_id)
+        output = await self.registry.run_blocking(deployable.predict, input, output=output)
+
+        # log inputs + result
+        if log:
+            await self.registry.log_execution(
+                deployable_id=deployable.metadata.id,
+                input=input if isinstance(input, list) else to_frame(input, names=deployable.input_schema.names),
+                output=output
+            )
+
+        return output
+
+    async def read_execution_log(
+            self,
+            deployable_id: int | None = None,
+            start: datetime | None = None,
+            end: datetime | None = None
+    ) -> pd.DataFrame:
+        return await self.registry.read_execution_log(deployable_id=deployable_id, start=start, end=end)
+
+    async def close(self) -> None:
+        await self.registry.close()
@@ -1,10 +1,19 @@
+import threading
 import pandas as pd
-from typing import Any
+from datetime import datetime
+from typing import Any, Callable, Iterable, Iterator
 
+from mlopslite.artifacts.batching import MicroBatcher
+from mlopslite.artifacts.bulk import predict_batch, read_chunks
 from mlopslite.artifacts.dataset import Dataset, create_dataset
-from mlopslite.registry.registry import Registry
+from mlopslite.registry.monitoring import Monitor
+from mlopslite.registry.registry import LOG_INPUT_PREFIX, LOG_OUTPUT_PREFIX, Registry
+from mlopslite.registry.replay import replay
+from mlopslite.registry.retention import LogRetention, log_archive_root, read_log_archive
+from mlopslite.registry.rollup import Rollup
 from mlopslite.registry.registryconfig import RegistryConfig
-from mlopslite.artifacts.deployable import Deployable, create_deployable
+from mlopslite.artifacts.deployable import Deployable, batch_records, create_deployable
+from mlopslite.artifacts.validation import to_frame
 
 class MlopsLite:
 
@@ -17,13 +26,61 @@ class MlopsLite:
     def __init__(self, config: RegistryConfig = RegistryConfig()) -> None:
         # set up Registry object
         self.registry = Registry(config=config)  # default to sqlite, workspace folder sqlite/mlops-lite.db
+        self._batchers: dict[int, MicroBatcher] = {}
+        self._batchers_lock = threading.Lock()
+        self._monitors: dict[int, Monitor] = {}
+        self._rollup: Rollup | None = None
 
-    def bind_dataset(self, data, name: str, description: str = ""):
-        dataset = create_dataset(data = data, name = name, description=description)
+    def bind_dataset(
+            self, 
+            data, 
+            name: str, 
+            description: str = "", 
+            exact_unique: bool = True, 
+            parallel: bool = False,
+            sketch: bool = False
+    ):
+        # sketch: keep mergeable sketches per column (distinct count, quantiles, frequent values), see artifacts.sketches
+        dataset = create_dataset(
+            data = data, 
+            name = name, 
+            description=description, 
+            exact_unique=exact_unique, 
+            parallel=parallel,
+            sketch=sketch
+        )
         self.push_dataset(dataset=dataset)
 
-    def pull_dataset(self, id: int) -> None:
-        self.dataset = self.registry.pull_dataset_from_registry(id = id)
+    def bind_dataset_stream(
+            self, 
+            source: str | Iterable[pd.DataFrame], 
+            name: str, 
+            description: str = "", 
+            chunk_size: int = 100_000, 
+            exact_unique: bool = False,
+            sketch: bool = False,
+            dtype: dict[str, Any] | None = None
+    ) -> None:
+
+        """
+        Register a CSV/Parquet file or an iterator of DataFrames chunk by chunk, with bounded memory
+        (see Registry.push_dataset_stream). The dataset is pulled back lazily.
+        dtype (column -> dtype, see read_chunks) fixes column types that are not stable across chunks.
+        """
+
+        registry_ref = self.registry.push_dataset_stream(
+            read_chunks(source, chunk_size=chunk_size, dtype=dtype), 
+            name=name, 
+            description=description, 
+            exact_unique=exact_unique,
+            sketch=sketch
+        )
+        self.pull_dataset(id = registry_ref['id'])
+
+    def pull_dataset(self, id: int, lazy: bool = True, mmap: bool = False) -> None:
+        # lazy: metadata only, data is fetched on first access of dataset.data (or dataset.load)
+        # mmap: data is read from memory mapped column files, shared between processes through the OS page cache
+        self.dataset = self.registry.pull_dataset_from_registry(id = id, lazy = lazy, mmap = mmap)
 
     def push_dataset(self, dataset: Dataset) -> None:
         # pushing also pulls back the dataset, to populate proper references
@@ -72,19 +129,343 @@ class MlopsLite:
         modlist = self.registry.db.list_deployables()
         return pd.DataFrame(modlist)
     
-    def predict(self, input: list[dict] | pd.DataFrame, log: bool = False):
+    def get_deployable(self, deployable_id: int | str | None = None) -> Deployable:
 
-        if isinstance(input, pd.DataFrame):
-            input = input.to_dict('records')
+        """
+        Active deployable (None), or any registered one by id, 'name@version' or 'name' (most recently registered).
+        Deployables are loaded on first use and kept in the registry deployable cache 
+        (LRU within RegistryConfig.deployable_cache_items/deployable_cache_bytes).
+        """
 
-        output = self.deployable.predict(input)
+        if deployable_id is None:
+            return self.deployable
+
+        id = self.registry.resolve_deployable_id(deployable_id)
+        return self.registry.pull_deployable_from_registry(id = id)
+
+    def predict(
+            self, 
+            input: list[dict] | pd.DataFrame, 
+            log: bool = False, 
+            output: str = "records", 
+            deployable_id: int | str | None = None
+    ):
+
+        """
+        Score input with the active deployable, or the one given by deployable_id (see get_deployable). 
+        DataFrame, numpy and pyarrow inputs are passed to the deployable as they are (validated column-wise), 
+        output='arrays' returns a PredictionBatch.
+        """
+
+        deployable = self.get_deployable(deployable_id)
+        output = deployable.predict(input, output=output)
 
         # log inputs + result
         if log:
-            self.registry.log_execution(
-                deployable_id=self.deployable.metadata.id, 
-                input=input, 
-                output=output
-            )
+            self._log(deployable, input, output)
+
+        return output
+
+    def predict_stream(
+            self, 
+            input: Iterable[dict], 
+            batch_size: int = 1000, 
+            log: bool = False, 
+            output: str = "records", 
+            deployable_id: int | str | None = None
+    ) -> Iterator:
+
+        """
+        Score an iterator of records in batches of batch_size, yields a result per record 
+        (output='arrays': a PredictionBatch per batch). With log, every batch is logged as one execution.
+        """
+
+        deployable = self.get_deployable(deployable_id)
+
+        for batch in batch_records(input, batch_size):
+            result = deployable.predict(batch, output=output)
+            if log:
+                self._log(deployable, batch, result)
+
+            if output == "arrays":
+                yield result
+            else:
+                yield from result
+
+    def get_batcher(
+            self, 
+            deployable_id: int | str | None = None, 
+            max_batch_size: int = 256, 
+            max_wait: float = 0.002
+    ) -> MicroBatcher:
+
+        """
+        MicroBatcher of a deployable (see get_deployable), created on first use and kept until close().
+        Batch settings only apply when the batcher is created.
+        """
+
+        deployable = self.get_deployable(deployable_id)
+        id = deployable.metadata.id
+
+        with self._batchers_lock:
+            if id not in self._batchers:
+                self._batchers[id] = MicroBatcher(deployable, max_batch_size=max_batch_size, max_wait=max_wait)
+            return self._batchers[id]
+
+    def predict_batched(
+            self, 
+            input: list[dict] | pd.DataFrame, 
+            log: bool = False, 
+            output: str = "records", 
+            deployable_id: int | str | None = None
+    ):
+
+        """
+        Same as predict, for many concurrent callers (threads) with small inputs: 
+        requests are coalesced by the deployable's MicroBatcher and scored in one vectorized call.
+        """
+
+        batcher = self.get_batcher(deployable_id)
+        output = batcher.predict(input, output=output)
+
+        if log:
+            self._log(batcher.deployable, input, output)
 
         return output
+
+    def predict_batch(
+            self, 
+            source: str | pd.DataFrame | Iterable[pd.DataFrame], 
+            sink: str | Callable | None = None, 
+            chunk_size: int = 100_000, 
+            workers: int | None = None, 
+            log: bool = False, 
+            deployable_id: int | str | None = None
+    ) -> pd.DataFrame | int:
+
+        """
+        Offline scoring of a CSV/Parquet file, DataFrame or DataFrame iterator, in chunks across a process pool
+        (workers processes, default cpu count, 0 scores in this process). Results are written to sink 
+        (CSV/Parquet path or callable(chunk, PredictionBatch)) in input order and the number of rows is returned, 
+        without a sink they are returned as a DataFrame. With log, every chunk is logged as one execution.
+        """
+
+        deployable = self.get_deployable(deployable_id)
+
+        return predict_batch(
+            deployable, 
+            source, 
+            sink=sink, 
+            chunk_size=chunk_size, 
+            workers=workers, 
+            on_chunk=(lambda chunk, output: self._log(deployable, chunk, output)) if log else None
+        )
+
+    def predict_shadow(
+            self, 
+            input: list[dict] | pd.DataFrame, 
+            deployable_id: int | str | None, 
+            shadow_id: int | str, 
+            log: bool = False, 
+            output: str = "records"
+    ) -> tuple:
+
+        """
+        Score the same input with two deployables (e.g. current and canary version), returns (primary, shadow) outputs.
+        Input is validated once if both deployables share the input schema.
+        """
+
+        primary = self.get_deployable(deployable_id)
+        shadow = self.get_deployable(shadow_id)
+
+        features, refid_list = primary.validate(input)
+        primary_output = primary.predict_validated(features, refid_list, output=output)
+
+        if shadow.input_schema is primary.input_schema:
+            shadow_output = shadow.predict_validated(features, refid_list, output=output)
+        else:
+            shadow_output = shadow.predict(input, output=output)
+
+        if log:
+            self._log(primary, input, primary_output)
+            self._log(shadow, input, shadow_output)
+
+        return primary_output, shadow_output
+
+    def _log(self, deployable: Deployable, input, output) -> None:
+        self.registry.log_execution(
+            deployable_id=deployable.metadata.id, 
+            input=input if isinstance(input, list) else to_frame(input, names=deployable.input_schema.names), 
+            output=output
+        )
+
+    def read_execution_log(
+            self, 
+            deployable_id: int | None = None, 
+            start: datetime | None = None, 
+            end: datetime | None = None
+    ) -> pd.DataFrame:
+        return self.registry.read_execution_log(deployable_id=deployable_id, start=start, end=end)
+
+    def get_prediction(self, reference_id: str) -> dict | None:
+
+        """
+        Logged prediction by reference id (the latest one if it was logged more than once): log_id, deployable_id, 
+        name, version, request_time, row_index, reference_id, input {variable: value}, output {class: value}.
+        None if it is not in the log.
+        """
+
+        predictions = self.get_predictions([reference_id])
+        if len(predictions) == 0:
+            return None
+
+        row = predictions.iloc[-1]
+        # null inputs / outputs are kept as None, only missing header fields are left out
+        row = row.astype(object).where(row.notna(), None)
+        out = {
+            k: v for k, v in row.items()
+            if not k.startswith(LOG_INPUT_PREFIX) and not k.startswith("output") and v is not None
+        }
+        out["reference_id"] = reference_id
+        out["input"] = {k[len(LOG_INPUT_PREFIX):]: v for k, v in row.items() if k.startswith(LOG_INPUT_PREFIX)}
+        # regressors log a single output column
+        out["output"] = row["output"] if row.get("output") is not None else {
+            k[len(LOG_OUTPUT_PREFIX):]: v for k, v in row.items() if k.startswith(LOG_OUTPUT_PREFIX)
+        }
+
+        return out
+
+    def get_predictions(self, reference_ids: Iterable[str]) -> pd.DataFrame:
+
+        """
+        Logged predictions of any number of reference ids, one row per prediction (see Registry.read_predictions).
+        """
+
+        self._flush_logs()
+        return self.registry.read_predictions(reference_ids)
+
+    def replay(
+            self, 
+            source_id: int | str, 
+            deployable_id: int | str | None = None, 
+            start: datetime | None = None, 
+            end: datetime | None = None,
+            sink: str | Callable[[pd.DataFrame], None] | None = None,
+            workers: int | None = None
+    ) -> pd.DataFrame | int:
+
+        """
+        Re-score the logged inputs of deployable source_id with the active deployable or deployable_id 
+        (see get_deployable), next to the logged outputs (see registry.replay). Chunks of 
+        RegistryConfig.replay_batch_logs requests are scored across workers processes, results are written 
+        to sink (CSV/Parquet path or callable(chunk)) and the number of rows is returned, 
+        without a sink they are returned as a DataFrame.
+        """
+
+        self._flush_logs()
+        return replay(
+            self.registry, 
+            self.get_deployable(deployable_id), 
+            self.registry.resolve_deployable_id(source_id), 
+            start=start, 
+            end=end, 
+            sink=sink, 
+            workers=workers
+        )
+
+    def get_monitor(self, window_seconds: int | None = None) -> Monitor:
+
+        """
+        Monitor of the execution log with window_seconds wide windows (config.monitoring_window_seconds by default).
+        """
+
+        window_seconds = self.registry.config.monitoring_window_seconds if window_seconds is None else window_seconds
+        return self._monitors.setdefault(window_seconds, Monitor(self.registry, window_seconds=window_seconds))
+
+    def drift(
+            self, 
+            deployable_id: int | str | None = None, 
+            start: datetime | None = None, 
+            end: datetime | None = None,
+            combine: bool = False,
+            update: bool = True
+    ) -> pd.DataFrame:
+
+        """
+        PSI / KS of the logged inputs of a deployable (bound one by default) against its training data, 
+        per monitoring window. update=True aggregates new log rows first (pending async logs are flushed).
+        """
+
+        monitor = self.get_monitor()
+        if update:
+            self._flush_logs()
+            monitor.update()
+
+        return monitor.drift(self.get_deployable(deployable_id).metadata.id, start=start, end=end, combine=combine)
+
+    def get_rollup(self) -> Rollup:
+        if self._rollup is None:
+            self._rollup = Rollup(self.registry)
+        return self._rollup
+
+    def metrics(
+            self, 
+            deployable_id: int | str | None = None, 
+            start: datetime | None = None, 
+            end: datetime | None = None,
+            freq: int | None = 3600,
+            quantiles: tuple[float, ...] = (0.5, 0.99),
+            update: bool = True
+    ) -> pd.DataFrame:
+
+        """
+        Execution metrics per deployable (all by default) and freq seconds wide interval (whole range with freq=None),
+        answered from the rollup tables (see Rollup.metrics). update=True rolls up new log rows first.
+        """
+
+        rollup = self.get_rollup()
+        if update:
+            self._flush_logs()
+            rollup.update()
+
+        return rollup.metrics(deployable_id=deployable_id, start=start, end=end, freq=freq, quantiles=quantiles)
+
+    def prune_logs(self, now: datetime | None = None, vacuum: bool = False) -> dict:
+
+        """
+        Archive and delete execution log entries past the retention period of their deployable
+        (see RegistryConfig.log_retention). vacuum=True returns the freed space to the OS / planner afterwards.
+        """
+
+        self._flush_logs()
+        stats = LogRetention(self.registry).run(now=now)
+        if vacuum and stats["logs"] > 0:
+            self.registry.db.vacuum()
+        return stats
+
+    def read_log_archive(
+            self, 
+            deployable_id: int | str | None = None, 
+            start: datetime | None = None, 
+            end: datetime | None = None
+    ) -> pd.DataFrame:
+
+        if deployable_id is not None:
+            deployable_id = self.registry.resolve_deployable_id(deployable_id)
+
+        config = self.registry.config
+        root = log_archive_root(config.log_archive_dir, self.registry.db.engine.url)
+        return read_log_archive(root, config.log_format, deployable_id=deployable_id, start=start, end=end)
+
+    def _flush_logs(self) -> None:
+        # pending async logs are written before reading the log
+        if self.registry.log_writer is not None:
+            self.registry.log_writer.flush()
+
+    def close(self) -> None:
+        # scores pending batched requests, then flushes pending (async) execution logs
+        with self._batchers_lock:
+            batchers, self._batchers = self._batchers, {}
+        for batcher in batchers.values():
+            batcher.close()
+        self.registry.close()
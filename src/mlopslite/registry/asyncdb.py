@@ -0,0 +1,100 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.sql import Select
+
+from mlopslite.registry.datamodel import DeployableRegistry
+from mlopslite.registry.db import DataBase
+from mlopslite.registry.engine import create_async_registry_engine
+from mlopslite.registry.registryconfig import RegistryConfig
+
+
+class AsyncDataBase:
+
+    """
+    asyncio counterpart of DataBase, on an async engine (aiosqlite, asyncpg).
+
+    Every method runs the DataBase method of the same name on a connection of the async engine
+    (AsyncConnection.run_sync), so queries are shared with the sync client and the event loop is free
+    while a query waits on the database.
+    """
+
+    def __init__(self, config: RegistryConfig) -> None:
+        self.url = config.db_constring
+        self.engine = create_async_registry_engine(config)
+
+    async def connect(self) -> None:
+        # check if DB is up to date / or exists at all
+        async with self.engine.begin() as connection:
+            await connection.run_sync(lambda c: DataBase.bind(c).ensure_schema(c))
+
+    async def run(self, method: str, *args, **kwargs) -> Any:
+        async with self.engine.connect() as connection:
+            return await connection.run_sync(lambda c: getattr(DataBase.bind(c), method)(*args, **kwargs))
+
+    async def execute_select_query(self, statement: Select) -> list[dict]:
+        return await self.run("execute_select_query", statement)
+
+    async def get_dataset_reference_by_hash(self, hash: str) -> dict | None:
+        return await self.run("get_dataset_reference_by_hash", hash)
+
+    async def insert_dataset(self, dataset: dict, columns: list[dict], payload: dict | None = None) -> tuple[dict, bool]:
+        return await self.run("insert_dataset", dataset, columns, payload=payload)
+
+    async def is_blob_referenced(self, storage_ref: str) -> bool:
+        return await self.run("is_blob_referenced", storage_ref)
+
+    async def select_dataset_metadata_by_id(self, id: int) -> dict:
+        return await self.run("select_dataset_metadata_by_id", id)
+
+    async def select_dataset_data_by_id(self, id: int) -> dict:
+        return await self.run("select_dataset_data_by_id", id)
+
+    async def list_datasets(self) -> list[dict]:
+        return await self.run("list_datasets")
+
+    async def get_deployable_reference_by_hash(self, hash: str) -> dict | None:
+        return await self.run("get_deployable_reference_by_hash", hash)
+
+    async def get_deployable_version_increment(self, name: str, dataset_id: int, target: str) -> int:
+        return await self.run("get_deployable_version_increment", name, dataset_id, target)
+
+    async def insert_deployable_returning_reference(self, mr: DeployableRegistry) -> dict:
+        return await self.run("insert_deployable_returning_reference", mr)
+
+    async def select_deployable_by_id(self, id: int) -> dict:
+        return await self.run("select_deployable_by_id", id)
+
+    async def get_deployable_hash(self, id: int) -> str | None:
+        return await self.run("get_deployable_hash", id)
+
+    async def get_deployable_id_by_name(self, name: str, version: int | None = None) -> int | None:
+        return await self.run("get_deployable_id_by_name", name, version=version)
+
+    async def list_deployables(self) -> list[dict]:
+        return await self.run("list_deployables")
+
+    async def insert_execution_logs(self, logs: list[dict]) -> None:
+        return await self.run("insert_execution_logs", logs)
+
+    async def insert_execution_batches(self, batches: list[dict]) -> None:
+        return await self.run("insert_execution_batches", batches)
+
+    async def select_execution_batches(
+            self,
+            deployable_id: int | None = None,
+            start: datetime | None = None,
+            end: datetime | None = None
+    ) -> list[dict]:
+        return await self.run("select_execution_batches", deployable_id, start=start, end=end)
+
+    async def select_execution_log_items(
+            self,
+            deployable_id: int | None = None,
+            start: datetime | None = None,
+            end: datetime | None = None
+    ) -> dict:
+        return await self.run("select_execution_log_items", deployable_id, start=start, end=end)
+
+    async def dispose(self) -> None:
+        await self.engine.dispose()
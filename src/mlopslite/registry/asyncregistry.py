@@ -0,0 +1,203 @@
+import asyncio
+import functools
+from concurrent.futures import Executor
+from datetime import datetime
+from hashlib import md5
+
+import pandas as pd
+
+from mlopslite.artifacts.dataset import Dataset
+from mlopslite.artifacts.deployable import Deployable, PredictionBatch
+from mlopslite.artifacts.storage import DATASET_FORMATS
+from mlopslite.registry.asyncdb import AsyncDataBase
+from mlopslite.registry.cache import DeployableCache
+from mlopslite.registry.filesystem import FS_TYPES, FileSystem
+from mlopslite.registry.registry import (LOG_FORMATS, ExecutionLogEntry,
+                                         dataset_metadata_from_registry,
+                                         decode_registry_dataset,
+                                         deployable_registry_model,
+                                         discard_registry_blobs,
+                                         encode_registry_dataset,
+                                         push_registry_dataset,
+                                         read_compact_log, read_normalized_log,
+                                         resolve_deployable_reference)
+from mlopslite.registry.registryconfig import RegistryConfig
+
+
+class AsyncRegistry:
+
+    """
+    asyncio counterpart of Registry. DB access is awaited (AsyncDataBase), CPU-bound work
+    (hashing, encoding, unpickling, log row mapping) and filesystem reads run in executor
+    (default: the event loop's default executor). Flows shared with Registry (dataset push, deployable
+    resolution) run in executor as a whole, their DB calls are submitted back to the event loop.
+    """
+
+    def __init__(self, config: RegistryConfig, executor: Executor | None = None):
+        self.db = AsyncDataBase(config=config)
+        self.config = config
+        self.executor = executor
+
+        self.deployable_cache = DeployableCache(
+            max_items=config.deployable_cache_items,
+            max_bytes=config.deployable_cache_bytes,
+            cache_dir=config.deployable_cache_dir
+        )
+
+        self._deployable_ids = {}
+
+        if config.fs_type not in FS_TYPES:
+            raise ValueError(f"Invalid fs_type {config.fs_type}, expected one of {FS_TYPES}")
+        self.fs = FileSystem(root=config.fs_root) if config.fs_type == "local" else None
+
+    async def connect(self) -> None:
+        await self.db.connect()
+
+    async def run_blocking(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+
+    def _blocking(self, method):
+        # DB coroutine as a blocking call, for the registry helpers shared with Registry run in executor
+        loop = asyncio.get_running_loop()
+        return lambda *args, **kwargs: asyncio.run_coroutine_threadsafe(method(*args, **kwargs), loop).result()
+
+    def _get_fs(self) -> FileSystem:
+        return self.fs if self.fs is not None else FileSystem(root=self.config.fs_root)
+
+    async def pull_dataset_from_registry(self, id: int, columns: list[str] | None = None) -> Dataset:
+
+        metadata = dataset_metadata_from_registry(await self.db.select_dataset_metadata_by_id(id))
+        ds = await self.db.select_dataset_data_by_id(id)
+        data = await self.run_blocking(decode_registry_dataset, ds, metadata, columns=columns, fs=self._get_fs)
+
+        return Dataset(data=data, metadata=metadata)
+
+    async def push_dataset_to_registry(self, dataset: Dataset) -> dict:
+
+        data_format = self.config.dataset_format
+        if data_format not in DATASET_FORMATS:
+            raise ValueError(f"Invalid dataset format {data_format}, expected one of {DATASET_FORMATS}")
+
+        hash = await self.run_blocking(dataset.get_data_hash, mode=self.config.dataset_hash)
+
+        return await self.run_blocking(
+            push_registry_dataset,
+            dataset.metadata,
+            hash,
+            data_format,
+            encode=lambda: encode_registry_dataset(dataset, data_format, fs=self.fs),
+            get_reference_by_hash=self._blocking(self.db.get_dataset_reference_by_hash),
+            insert_dataset=self._blocking(self.db.insert_dataset),
+            discard_blobs=functools.partial(
+                discard_registry_blobs, fs=self.fs, is_blob_referenced=self._blocking(self.db.is_blob_referenced)
+            )
+        )
+
+    async def push_deployable_to_registry(self, deployable: Deployable) -> dict:
+
+        blob = await self.run_blocking(deployable.serialize_deployable)
+        # same as Deployable.get_data_hash, without serializing twice
+        hash = await self.run_blocking(lambda: md5(blob).hexdigest())
+
+        registry_ref = await self.db.get_deployable_reference_by_hash(hash)
+        if registry_ref is not None:
+            print("Model already exists, returning referenced model instead of pushing!")
+            return registry_ref
+
+        storage_ref = None
+        if self.fs is not None:
+            storage_ref, blob = await self.run_blocking(self.fs.put, blob), None
+
+        version = await self.db.get_deployable_version_increment(
+            deployable.metadata.name,
+            deployable.metadata.dataset_registry_id,
+            deployable.metadata.target
+        )
+        mr = deployable_registry_model(deployable, version=version, hash=hash, blob=blob, storage_ref=storage_ref)
+
+        try:
+            return await self.db.insert_deployable_returning_reference(mr)
+        except BaseException:
+            await self._discard_blobs([storage_ref])
+            raise
+
+    async def _discard_blobs(self, storage_refs: list[str | None]) -> None:
+        await self.run_blocking(discard_registry_blobs, storage_refs, self.fs, self._blocking(self.db.is_blob_referenced))
+
+    async def pull_deployable_from_registry(self, id: int) -> Deployable:
+
+        deployable = self.deployable_cache.lookup(id)
+        if deployable is not None:
+            return deployable
+
+        # the hash keys the on-disk cache only
+        hash = await self.db.get_deployable_hash(id) if self.deployable_cache.cache_dir is not None else None
+        registry_item = await self.run_blocking(self.deployable_cache.read_disk, id, hash)
+        if registry_item is None:
+            registry_item = await self.db.select_deployable_by_id(id)
+            if registry_item["storage_ref"] is not None:
+                registry_item["deployable"] = await self.run_blocking(
+                    self._get_fs().get, registry_item["storage_ref"], verify=True
+                )
+
+        return await self.run_blocking(self.deployable_cache.restore, registry_item)
+
+    async def resolve_deployable_id(self, reference: int | str) -> int:
+
+        """
+        Registry id from an id, 'name@version' or 'name' (most recently registered).
+        """
+
+        return await self.run_blocking(
+            resolve_deployable_reference, reference, self._deployable_ids, self._blocking(self.db.get_deployable_id_by_name)
+        )
+
+    async def list_datasets(self) -> pd.DataFrame:
+        return pd.DataFrame(await self.db.list_datasets())
+
+    async def list_deployables(self) -> pd.DataFrame:
+        return pd.DataFrame(await self.db.list_deployables())
+
+    async def log_execution(
+            self,
+            deployable_id: int,
+            input: list[dict] | pd.DataFrame,
+            output: list[dict] | PredictionBatch
+    ) -> None:
+
+        entry = ExecutionLogEntry(
+            deployable_id=deployable_id,
+            request_time=datetime.utcnow(),
+            input=input,
+            output=output
+        )
+
+        if self.config.log_format == "compact":
+            await self.db.insert_execution_batches([await self.run_blocking(entry.to_batch_row)])
+        elif self.config.log_format == "normalized":
+            await self.db.insert_execution_logs([await self.run_blocking(entry.to_rows)])
+        else:
+            raise ValueError(f"Invalid log format {self.config.log_format}, expected one of {LOG_FORMATS}")
+
+    async def read_execution_log(
+            self,
+            deployable_id: int | None = None,
+            start: datetime | None = None,
+            end: datetime | None = None,
+            log_format: str | None = None
+    ) -> pd.DataFrame:
+
+        log_format = self.config.log_format if log_format is None else log_format
+
+        if log_format == "compact":
+            batches = await self.db.select_execution_batches(deployable_id, start=start, end=end)
+            return await self.run_blocking(read_compact_log, batches)
+        if log_format == "normalized":
+            log = await self.db.select_execution_log_items(deployable_id, start=start, end=end)
+            return await self.run_blocking(read_normalized_log, log)
+
+        raise ValueError(f"Invalid log format {log_format}, expected one of {LOG_FORMATS}")
+
+    async def close(self) -> None:
+        await self.db.dispose()
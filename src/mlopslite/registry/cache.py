@@ -0,0 +1,166 @@
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from hashlib import md5
+from typing import Callable
+
+from mlopslite.artifacts.deployable import Deployable, restore_deployable
+
+
+class DeployableCache:
+
+    """
+    Cache of restored Deployables.
+
+    - in memory: LRU of restored objects by registry id, evicted by count (max_items) and by serialized size
+      (max_bytes). Registry rows are immutable, so a memory hit needs no lookup.
+    - on disk (optional, cache_dir): registry items (metadata + serialized artifact) in <id>-<hash>.pkl files,
+      so a new process can restore a deployable without loading the artifact from the DB. On a memory miss the
+      registry hash of the id is looked up (get_hash), so a cache_dir shared between registries, or kept across
+      a recreated DB, never returns another artifact stored under the same id. Artifacts are checked against it.
+    """
+
+    def __init__(self, max_items: int = 8, max_bytes: int | None = None, cache_dir: str | None = None) -> None:
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        self._items: OrderedDict[int, tuple[Deployable, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def __contains__(self, id: int) -> bool:
+        return id in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(
+            self, 
+            id: int, 
+            load: Callable[[int], dict], 
+            get_hash: Callable[[int], str | None] | None = None
+    ) -> Deployable:
+
+        """
+        Restored deployable by registry id, load(id) is called on a miss and must return the registry item.
+        get_hash(id) returns the registry hash of the id, only called on a memory miss with a cache_dir.
+        """
+
+        deployable = self.lookup(id)
+        if deployable is not None:
+            return deployable
+
+        hash = get_hash(id) if self.cache_dir is not None and get_hash is not None else None
+        registry_item = self.read_disk(id, hash)
+        if registry_item is None:
+            registry_item = load(id)
+
+        return self.restore(registry_item)
+
+    def lookup(self, id: int) -> Deployable | None:
+
+        # in memory only
+        with self._lock:
+            if id in self._items:
+                self._items.move_to_end(id)
+                self.stats["hits"] += 1
+                return self._items[id][0]
+        return None
+
+    def read_disk(self, id: int, hash: str | None) -> dict | None:
+
+        # registry item from the on-disk cache, counted as a miss if not found there either
+        registry_item = self._read_disk(id, hash) if hash is not None else None
+        if registry_item is not None:
+            self.stats["disk_hits"] += 1
+        else:
+            self.stats["misses"] += 1
+        return registry_item
+
+    def restore(self, registry_item: dict) -> Deployable:
+
+        self._write_disk(registry_item)
+
+        deployable = restore_deployable(registry_item)
+        self.put(deployable, size=len(registry_item["deployable"]))
+        return deployable
+
+    def put(self, deployable: Deployable, size: int) -> None:
+
+        if self.max_items <= 0:
+            return
+
+        key = deployable.metadata.id
+        with self._lock:
+            if key in self._items:
+                self._bytes -= self._items.pop(key)[1]
+
+            self._items[key] = (deployable, size)
+            self._bytes += size
+            self._evict()
+
+    def evict(self, id: int) -> None:
+        with self._lock:
+            if id in self._items:
+                self._bytes -= self._items.pop(id)[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def _evict(self) -> None:
+        # keep at least the most recent entry, even if it is over the byte budget on its own
+        while len(self._items) > 1 and (
+            len(self._items) > self.max_items
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, (_, size) = self._items.popitem(last=False)
+            self._bytes -= size
+            self.stats["evictions"] += 1
+
+    def _disk_path(self, id: int, hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{id}-{hash}.pkl")
+
+    def _read_disk(self, id: int, hash: str) -> dict | None:
+
+        if self.cache_dir is None:
+            return None
+
+        path = self._disk_path(id, hash)
+        try:
+            with open(path, "rb") as f:
+                registry_item = pickle.load(f)
+        except FileNotFoundError:
+            return None
+
+        if registry_item["id"] == id and md5(registry_item["deployable"]).hexdigest() == hash:
+            return registry_item
+
+        # corrupted entry
+        os.remove(path)
+        return None
+
+    def _write_disk(self, registry_item: dict) -> None:
+
+        if self.cache_dir is None:
+            return
+
+        path = self._disk_path(registry_item["id"], registry_item["hash"])
+        if os.path.exists(path):
+            return
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(registry_item, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
@@ -0,0 +1,107 @@
+import json
+import os
+import shutil
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from mlopslite.artifacts.storage import arrays_to_column, column_to_arrays
+
+_MANIFEST = "manifest.json"
+
+
+class DatasetColumnCache:
+
+    """
+    Local cache of pulled datasets, one directory per dataset hash holding a .npy file per column
+    (plus offsets and a null mask for string and other object columns). Columns are opened with np.load(mmap_mode='r'), so processes
+    reading the same dataset share pages through the OS page cache instead of holding private copies.
+
+    Numeric, bool and datetime columns are returned without a copy. String columns are stored as a UTF-8
+    buffer plus offsets (see storage.column_to_arrays) and decoded to object columns on read, which copies them.
+
+    Dataset rows are immutable, a cached hash never goes stale.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, hash: str) -> str:
+        return os.path.join(self.root, hash)
+
+    def __contains__(self, hash: str) -> bool:
+        return os.path.exists(os.path.join(self.path(hash), _MANIFEST))
+
+    def write(self, hash: str, data: pd.DataFrame) -> None:
+
+        """
+        Spill data to the cache. The directory is written under a temporary name and renamed into place,
+        a concurrent writer of the same hash simply loses the race.
+        """
+
+        if hash in self:
+            return
+
+        tmp = os.path.join(self.root, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmp)
+
+        try:
+            manifest = []
+            for i, (name, column) in enumerate(data.items()):
+                item = {"name": str(name)}
+                for key, array in column_to_arrays(column).items():
+                    item[key] = f"{key[0]}{i}.npy"
+                    np.save(os.path.join(tmp, item[key]), array, allow_pickle=False)
+                manifest.append(item)
+
+            with open(os.path.join(tmp, _MANIFEST), "w") as f:
+                json.dump(manifest, f)
+
+            os.rename(tmp, self.path(hash))
+        except OSError:
+            if hash not in self:
+                raise
+        finally:
+            if os.path.exists(tmp):
+                shutil.rmtree(tmp)
+
+    def read_arrays(self, hash: str, columns: list[str] | None = None) -> dict[str, np.ndarray]:
+
+        """
+        Read-only memory mapped column arrays, string columns decoded to object arrays with nulls as None.
+        """
+
+        return {name: arrays_to_column(**parts) for name, parts in self._open(hash, columns).items()}
+
+    def read_frame(self, hash: str, columns: list[str] | None = None) -> pd.DataFrame:
+
+        data = {name: arrays_to_column(**parts) for name, parts in self._open(hash, columns).items()}
+        # every column keeps its own block, backed by the mapped file
+        return pd.DataFrame(data, copy=False)
+
+    def evict(self, hash: str) -> None:
+        shutil.rmtree(self.path(hash), ignore_errors=True)
+
+    def _open(self, hash: str, columns: list[str] | None = None) -> dict[str, dict[str, np.ndarray]]:
+
+        directory = self.path(hash)
+        with open(os.path.join(directory, _MANIFEST)) as f:
+            manifest = {i["name"]: i for i in json.load(f)}
+
+        wanted = list(manifest.keys()) if columns is None else columns
+
+        out = {}
+        for name in wanted:
+            if name not in manifest:
+                raise KeyError(f"Column {name} not found in dataset columns: {list(manifest.keys())}")
+            item = manifest[name]
+            # plain ndarray view of the memmap, still backed by the mapped file
+            parts = {"values": np.load(os.path.join(directory, item["values"]), mmap_mode="r", allow_pickle=False).view(np.ndarray)}
+            for key in ["mask", "offsets"]:
+                if key in item:
+                    parts[key] = np.load(os.path.join(directory, item[key]), allow_pickle=False)
+            out[name] = parts
+
+        return out
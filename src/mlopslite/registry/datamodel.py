@@ -3,7 +3,7 @@ import sys
 from typing import Any, List
 from datetime import datetime
 
-from sqlalchemy import JSON, ForeignKey, UniqueConstraint
+from sqlalchemy import JSON, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import (DeclarativeBase, Mapped, MappedAsDataclass,
                             mapped_column, relationship)
 
@@ -27,11 +27,15 @@ class DatasetRegistry(Base):
     name: Mapped[str]
     version: Mapped[int]
     description: Mapped[str]
-    data: Mapped[dict[str, Any]]
+    data: Mapped[dict[str, Any] | None] = mapped_column(JSON(none_as_null=True))
     size_cols: Mapped[int]
     size_rows: Mapped[int]
     hash: Mapped[str] = mapped_column(unique=True)
     created_at: Mapped[datetime]
+    data_format: Mapped[str] = mapped_column(default="json", server_default="json")
+    data_blob: Mapped[bytes | None] = mapped_column(default=None)
+    # key of the blob in the artifact FileSystem, when stored outside of the DB
+    storage_ref: Mapped[str | None] = mapped_column(default=None)
 
     columns: Mapped[List["DatasetRegistryColumns"]] = relationship(
         default_factory=list, back_populates="data", cascade="all, delete-orphan"
@@ -45,7 +49,7 @@ class DatasetRegistryColumns(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, init=False)
     dataset_registry_id: Mapped[int] = mapped_column(
-        ForeignKey("dataset_registry.id"), init=False
+        ForeignKey("dataset_registry.id"), init=False, index=True
     )
     column_name: Mapped[str]
     original_dtype: Mapped[str]
@@ -57,6 +61,8 @@ class DatasetRegistryColumns(Base):
     #unique_values: Mapped[list[str]]
 
     data: Mapped["DatasetRegistry"] = relationship(back_populates="columns")
+    # serialized ColumnSketch (see artifacts.sketches), null unless profiled with sketch=True
+    sketch: Mapped[bytes | None] = mapped_column(default=None)
 
 class DeployableRegistry(Base):
     __tablename__ = "deployable_registry"
@@ -72,10 +78,17 @@ class DeployableRegistry(Base):
     description: Mapped[str]
     estimator_type: Mapped[str]
     estimator_class: Mapped[str]
-    deployable: Mapped[bytes]
+    deployable: Mapped[bytes | None]
     variables: Mapped[dict[str, Any]]
     hash: Mapped[str] = mapped_column(unique=True)
     created_at: Mapped[datetime]
+    storage_ref: Mapped[str | None] = mapped_column(default=None)
+
+    __table_args__ = (
+        # version increment per (name, dataset, target), lookup by name (and version)
+        Index("ix_deployable_registry_name_dataset_target", "name", "dataset_registry_id", "target", "version"),
+        Index("ix_deployable_registry_name_version", "name", "version"),
+    )
 
 class ExecutionLog(Base):
     __tablename__ = "model_execution_log"
@@ -89,12 +102,17 @@ class ExecutionLog(Base):
         default_factory=list, back_populates="execution_log_item", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        Index("ix_model_execution_log_deployable_time", "deployable_id", "request_time"),
+        Index("ix_model_execution_log_deployable_id", "deployable_id", "id"),
+    )
+
 class ExecutionItems(Base):
     __tablename__ = "execution_items"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, init=False)
-    execution_log_id: Mapped[int] = mapped_column(ForeignKey("model_execution_log.id"), init=False)
-    reference_id: Mapped[str] = mapped_column(nullable=True)
+    execution_log_id: Mapped[int] = mapped_column(ForeignKey("model_execution_log.id"), init=False, index=True)
+    reference_id: Mapped[str] = mapped_column(nullable=True, index=True)
 
     execution_log_item: Mapped["ExecutionLog"] = relationship(back_populates="execution_log")
     
@@ -110,7 +128,7 @@ class RequestItems(Base):
     __tablename__ = "request_items"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, init=False)
-    execution_items_id: Mapped[int] = mapped_column(ForeignKey("execution_items.id"), init=False)
+    execution_items_id: Mapped[int] = mapped_column(ForeignKey("execution_items.id"), init=False, index=True)
     varname: Mapped[str]
     in_value: Mapped[str]
 
@@ -120,12 +138,102 @@ class ResponseItems(Base):
     __tablename__ = "response_items"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, init=False)
-    execution_items_id: Mapped[int] = mapped_column(ForeignKey("execution_items.id"), init=False)
+    execution_items_id: Mapped[int] = mapped_column(ForeignKey("execution_items.id"), init=False, index=True)
     classname: Mapped[str] = mapped_column(nullable=True)
     out_value: Mapped[float]
 
     data: Mapped["ExecutionItems"] = relationship(back_populates="response_items")
 
+class ExecutionBatch(Base):
+    __tablename__ = "execution_batch_log"
+
+    # compact log layout: one row per request, inputs and outputs stored as a compressed columnar payload
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, init=False)
+    deployable_id: Mapped[int] = mapped_column(ForeignKey("deployable_registry.id"))
+    request_time: Mapped[datetime]
+    request_size: Mapped[int]
+    payload_format: Mapped[str]
+    payload: Mapped[bytes]
+
+    references: Mapped[List["ExecutionBatchReferences"]] = relationship(
+        default_factory=list, back_populates="batch", cascade="all, delete-orphan"
+    )
+
+    __table_args__ = (
+        Index("ix_execution_batch_log_deployable_time", "deployable_id", "request_time"),
+        Index("ix_execution_batch_log_deployable_id", "deployable_id", "id"),
+    )
+
+class ExecutionBatchReferences(Base):
+    __tablename__ = "execution_batch_references"
+
+    # index of the reference_ids within the payload, only rows that have one
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, init=False)
+    execution_batch_id: Mapped[int] = mapped_column(ForeignKey("execution_batch_log.id"), init=False, index=True)
+    row_index: Mapped[int]
+    reference_id: Mapped[str] = mapped_column(index=True)
+
+    batch: Mapped["ExecutionBatch"] = relationship(back_populates="references")
+
+class MonitoringWindow(Base):
+    __tablename__ = "monitoring_window"
+
+    # aggregated execution log: per deployable, time window and logged variable (input:<name>, output:<class>),
+    # a serialized ColumnSketch of the values, merged as new log rows are processed
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, init=False)
+    deployable_id: Mapped[int] = mapped_column(ForeignKey("deployable_registry.id"))
+    window_seconds: Mapped[int]
+    window_start: Mapped[datetime]
+    variable: Mapped[str]
+    converted_dtype: Mapped[str]
+    row_count: Mapped[int]
+    null_count: Mapped[int]
+    sketch: Mapped[bytes]
+    updated_at: Mapped[datetime]
+
+    __table_args__ = (
+        UniqueConstraint("deployable_id", "window_seconds", "window_start", "variable"),
+        # windows of all deployables in a time range
+        Index("ix_monitoring_window_seconds_start", "window_seconds", "window_start"),
+    )
+
+class MonitoringWatermark(Base):
+    __tablename__ = "monitoring_watermark"
+
+    # last execution log id aggregated by a consumer of the log (monitoring_window: source = log table, 
+    # execution_rollup: rollup:<log table>), per window / bucket size
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, init=False)
+    source: Mapped[str]
+    window_seconds: Mapped[int]
+    last_log_id: Mapped[int]
+    updated_at: Mapped[datetime]
 
+    __table_args__ = (UniqueConstraint("source", "window_seconds"),)
 
+class ExecutionRollup(Base):
+    __tablename__ = "execution_rollup"
 
+    # execution log metrics per deployable and time bucket, maintained incrementally (see registry.rollup)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, init=False)
+    deployable_id: Mapped[int] = mapped_column(ForeignKey("deployable_registry.id"))
+    bucket_seconds: Mapped[int]
+    bucket_start: Mapped[datetime]
+    requests: Mapped[int]
+    rows: Mapped[int]
+    request_size_max: Mapped[int]
+    # serialized KLLSketch of request sizes
+    request_size_sketch: Mapped[bytes]
+    # sum of the predictions per output column (output:<class>, or output for regressors)
+    output_sums: Mapped[dict[str, Any]]
+    updated_at: Mapped[datetime]
+
+    __table_args__ = (
+        UniqueConstraint("deployable_id", "bucket_seconds", "bucket_start"),
+        # buckets of all deployables in a time range
+        Index("ix_execution_rollup_seconds_start", "bucket_seconds", "bucket_start"),
+    )
@@ -1,9 +1,11 @@
+import weakref
+from datetime import datetime
 from time import time
+from typing import TYPE_CHECKING
 
-from alembic import command
-from alembic.config import Config
-from sqlalchemy import create_engine, func, inspect, select, delete, and_
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import Connection, func, insert, select, delete, update, and_, case, or_, text
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.sql import Select
 
 from mlopslite.registry.datamodel import (Base, 
@@ -11,41 +13,99 @@ from mlopslite.registry.datamodel import (Base,
                                           DeployableRegistry,
                                           DatasetRegistryColumns, 
                                           ExecutionLog, 
-                                          get_datamodel_table_names)
+                                          ExecutionItems,
+                                          RequestItems,
+                                          ResponseItems,
+                                          ExecutionBatch,
+                                          ExecutionBatchReferences,
+                                          MonitoringWindow,
+                                          ExecutionRollup,
+                                          MonitoringWatermark)
+from mlopslite.registry.engine import get_engine
 from mlopslite.registry.registryconfig import RegistryConfig
 from mlopslite.alembic_setup import get_alembic_ini, get_migration_script_location
 
+if TYPE_CHECKING:
+    from alembic.config import Config
+
+# latest migration revision, the schema of a DB stamped with it matches the datamodel
+# (kept in sync with migration/versions, checked by tests/test_startup.py)
+SCHEMA_HEAD = "0a7e3c5f9b1d"
+
+# log_settle_seconds=None on databases other than SQLite, see get_settled_log_id
+DEFAULT_LOG_SETTLE_SECONDS = 60
+
+# engines already checked against SCHEMA_HEAD in this process
+_CHECKED_ENGINES = weakref.WeakSet()
+
 
 class DataBase:
     def __init__(self, config: RegistryConfig) -> None:
         self.url = config.db_constring
-        self.engine = create_engine(self.url)
+        self.engine = get_engine(config)
         self.session = sessionmaker(bind=self.engine)
 
-        # check if DB is up to date / or exists at all
-        db_tables = inspect(self.engine).get_table_names()
-        datamodel_tables = get_datamodel_table_names()
-        if not all([i in db_tables for i in datamodel_tables]):
-            # this does not ensure that all columns within tables are as expected!
-            # needs to thoroughly against the datamodel... can this be done via Base against engine?
-            # print("DB is not complete")  # procede with migration
-            self._upgrade_db()
-        else:
+        # check if DB is up to date / or exists at all (once per engine)
+        if self.engine in _CHECKED_ENGINES:
             print("Database Ready!")
+        else:
+            with self.engine.begin() as connection:
+                self.ensure_schema(connection)
+            _CHECKED_ENGINES.add(self.engine)
+
+    @classmethod
+    def bind(cls, connection: Connection) -> "DataBase":
+
+        """
+        DataBase over an open connection, all methods run on it (e.g. through AsyncConnection.run_sync).
+        """
+
+        db = cls.__new__(cls)
+        db.url = connection.engine.url.render_as_string(hide_password=False)
+        db.engine = connection.engine
+        db.session = sessionmaker(bind=connection)
+        return db
+
+    def _alembic_config(self) -> "Config":
+        # alembic is only imported when the schema has to be migrated
+        from alembic.config import Config
 
-    def _upgrade_db(self):
         config = Config(get_alembic_ini())
         config.set_main_option("script_location", get_migration_script_location())
         config.set_main_option("sqlalchemy.url", self.url)
+        return config
+
+    def ensure_schema(self, connection: Connection) -> None:
+        if self._is_up_to_date(connection):
+            print("Database Ready!")
+        else:
+            self._upgrade_db(connection)
+
+    def _is_up_to_date(self, connection: Connection) -> bool:
+
+        """
+        Single query against alembic's version table, instead of inspecting the schema.
+        """
+
+        if not connection.dialect.has_table(connection, "alembic_version"):
+            # fresh database
+            return False
+
+        current_heads = connection.execute(text("SELECT version_num FROM alembic_version")).scalars().all()
+        return set(current_heads) == {SCHEMA_HEAD}
+
+    def _upgrade_db(self, connection: Connection):
+        from alembic import command
+
+        config = self._alembic_config()
 
         #print(config)
 
-        with self.engine.connect() as connection:
-            config.attributes["connection"] = connection
-            # there should probably be a script that regenerates migrations on version update..?
-            #if regenerate:
-            #    command.revision(config, f"{int(time())}_update", autogenerate=True) 
-            command.upgrade(config, "heads")
+        config.attributes["connection"] = connection
+        # there should probably be a script that regenerates migrations on version update..?
+        #if regenerate:
+        #    command.revision(config, f"{int(time())}_update", autogenerate=True) 
+        command.upgrade(config, "heads")
 
     def execute_select_query(self, statement: Select) -> list[dict]:
         """
@@ -109,18 +169,113 @@ class DataBase:
             #return self.execute_select_query(stmt)
             return out
 
+    def insert_dataset(
+            self, 
+            dataset: dict, 
+            columns: list[dict], 
+            payload: dict | None = None
+    ) -> tuple[dict, bool]:
+
+        """
+        Insert dataset row + column metadata rows in a single transaction, returns (reference, inserted).
+        dataset holds the DatasetRegistry columns except id and version, payload extra columns (e.g. the encoded data)
+        that the caller encodes and stores before, so the write transaction only runs the statements. If a dataset
+        with the same hash exists, also when it is inserted concurrently, its reference is returned and nothing is inserted.
+        """
+
+        name, hash = dataset["name"], dataset["hash"]
+        is_match = DatasetRegistry.hash == hash
+
+        # hash lookup and next version in one round trip
+        stmt = select(
+            func.max(case((DatasetRegistry.name == name, DatasetRegistry.version))).label("max_version"),
+            func.max(case((is_match, DatasetRegistry.id))).label("id"),
+            func.max(case((is_match, DatasetRegistry.name))).label("name"),
+            func.max(case((is_match, DatasetRegistry.version))).label("version"),
+            func.max(case((is_match, DatasetRegistry.created_at))).label("created_at"),
+        ).where(or_(DatasetRegistry.name == name, is_match))
+
+        try:
+            with self.session.begin() as session:
+                found = session.execute(stmt).one()._asdict()
+
+                if found["id"] is not None:
+                    return {
+                        "id": found["id"], "name": found["name"], "version": found["version"], 
+                        "hash": hash, "created_at": found["created_at"]
+                    }, False
+
+                version = (found["max_version"] or 0) + 1
+                row = {**dataset, **(payload if payload is not None else {}), "version": version}
+
+                id = self._insert_returning_ids(session, DatasetRegistry, [row])[0]
+                if len(columns) > 0:
+                    session.execute(
+                        insert(DatasetRegistryColumns.__table__), 
+                        [{**i, "dataset_registry_id": id} for i in columns]
+                    )
+        except IntegrityError:
+            # the same hash committed by a concurrent push since the lookup
+            registry_ref = self.get_dataset_reference_by_hash(hash)
+            if registry_ref is None:
+                raise
+            return registry_ref, False
+
+        return {"id": id, "name": name, "version": version, "hash": hash, "created_at": dataset["created_at"]}, True
+
+    def is_blob_referenced(self, storage_ref: str) -> bool:
+        # any dataset or deployable row stored in this (content-addressed) filesystem blob
+        stmt = select(
+            select(DatasetRegistry.id).where(DatasetRegistry.storage_ref == storage_ref).exists()
+            | select(DeployableRegistry.id).where(DeployableRegistry.storage_ref == storage_ref).exists()
+        )
+        return bool(self.execute_select_query_single(stmt))
+
     def select_dataset_by_id(self, id: int) -> dict:
         stmt_dataset = select(*DatasetRegistry.__table__.columns).where(
             DatasetRegistry.id == id
         )
         stmt_columns = select(*DatasetRegistryColumns.__table__.columns).where(
             DatasetRegistryColumns.dataset_registry_id == id
-        )
+        ).order_by(DatasetRegistryColumns.id)
 
         return {
             "dataset": self.execute_select_query(stmt_dataset)[0],
             "columns": self.execute_select_query(stmt_columns),
         }
+
+    def select_dataset_metadata_by_id(self, id: int) -> dict:
+
+        """
+        Same as select_dataset_by_id, without the data payload
+        """
+
+        payload_columns = ["data", "data_blob"]
+        stmt_dataset = select(
+            *[i for i in DatasetRegistry.__table__.columns if i.name not in payload_columns]
+        ).where(DatasetRegistry.id == id)
+        stmt_columns = select(*DatasetRegistryColumns.__table__.columns).where(
+            DatasetRegistryColumns.dataset_registry_id == id
+        ).order_by(DatasetRegistryColumns.id)
+
+        response = self.execute_select_query(stmt_dataset)
+        if len(response) == 0:
+            raise ValueError(f"Dataset with id {id} not found in the registry")
+
+        return {
+            "dataset": response[0],
+            "columns": self.execute_select_query(stmt_columns),
+        }
+
+    def select_dataset_data_by_id(self, id: int) -> dict:
+        stmt = select(
+            DatasetRegistry.data_format, 
+            DatasetRegistry.data, 
+            DatasetRegistry.data_blob,
+            DatasetRegistry.storage_ref
+        ).where(DatasetRegistry.id == id)
+
+        return self.execute_select_query(stmt)[0]
     
     def list_datasets(self) -> dict:
 
@@ -188,9 +343,49 @@ class DataBase:
         )
 
         response = self.execute_select_query(stmt)
+        if len(response) == 0:
+            raise ValueError(f"Deployable {id} not found in the registry")
 
         return response[0]
     
+    def get_deployable_hash(self, id: int) -> str | None:
+        # artifact hash of a deployable, the key of the on-disk deployable cache
+        response = self.execute_select_query(select(DeployableRegistry.hash).where(DeployableRegistry.id == id))
+        return None if len(response) == 0 else response[0]["hash"]
+
+    def get_deployable_id_by_name(self, name: str, version: int | None = None) -> int | None:
+
+        """
+        Registry id of deployable by name and version, the most recently registered one if version is None.
+        Versions are incremented per (name, dataset, target), a version that exists for several of them
+        is ambiguous and raises ValueError.
+        """
+
+        stmt = select(DeployableRegistry.id).where(DeployableRegistry.name == name)
+        if version is None:
+            response = self.execute_select_query(stmt.order_by(DeployableRegistry.id.desc()).limit(1))
+            return None if len(response) == 0 else response[0]["id"]
+
+        response = self.execute_select_query(stmt.where(DeployableRegistry.version == version).limit(2))
+        if len(response) > 1:
+            raise ValueError(
+                f"Deployable {name}@{version} is ambiguous, the version exists for several datasets/targets, use the registry id"
+            )
+        return None if len(response) == 0 else response[0]["id"]
+
+    def select_deployable_variables(self, ids: list[int]) -> list[dict]:
+        # input variables of deployables, without loading the serialized models
+        stmt = select(
+            DeployableRegistry.id, DeployableRegistry.dataset_registry_id, DeployableRegistry.variables
+        ).where(DeployableRegistry.id.in_(ids))
+        return self.execute_select_query(stmt)
+
+    def select_deployable_versions(self, ids: list[int]) -> list[dict]:
+        stmt = select(DeployableRegistry.id, DeployableRegistry.name, DeployableRegistry.version).where(
+            DeployableRegistry.id.in_(ids)
+        )
+        return self.execute_select_query(stmt)
+
     def list_deployables(self):
         
         stmt = select(
@@ -209,4 +404,546 @@ class DataBase:
     def log_execution(self, log: ExecutionLog):
         with self.session.begin() as session:
             session.add(log)
-            session.flush()
\ No newline at end of file
+            session.flush()
+
+    def insert_execution_logs(self, logs: list[dict]) -> None:
+
+        """
+        Bulk insert of execution logs in a single transaction, executemany per table.
+        Each log: {deployable_id, request_time, request_size, items: [{reference_id, request, response}]},
+        where request is a list of (varname, in_value) and response a list of (classname, out_value).
+        """
+
+        with self.session.begin() as session:
+
+            log_ids = self._insert_returning_ids(
+                session, 
+                ExecutionLog, 
+                [{k: i[k] for k in ["deployable_id", "request_time", "request_size"]} for i in logs]
+            )
+
+            item_rows = [
+                {"execution_log_id": log_id, "reference_id": item["reference_id"]} 
+                for log_id, log in zip(log_ids, logs) for item in log["items"]
+            ]
+            item_ids = self._insert_returning_ids(session, ExecutionItems, item_rows)
+
+            items = [item for log in logs for item in log["items"]]
+
+            request_rows = [
+                {"execution_items_id": item_id, "varname": k, "in_value": v} 
+                for item_id, item in zip(item_ids, items) for k, v in item["request"]
+            ]
+            response_rows = [
+                {"execution_items_id": item_id, "classname": k, "out_value": v} 
+                for item_id, item in zip(item_ids, items) for k, v in item["response"]
+            ]
+
+            if len(request_rows) > 0:
+                session.execute(insert(RequestItems.__table__), request_rows)
+            if len(response_rows) > 0:
+                session.execute(insert(ResponseItems.__table__), response_rows)
+
+    def insert_execution_batches(self, batches: list[dict]) -> None:
+
+        """
+        Bulk insert of compact execution logs.
+        Each batch: {deployable_id, request_time, request_size, payload_format, payload, references},
+        where references is a list of (row_index, reference_id).
+        """
+
+        with self.session.begin() as session:
+
+            batch_ids = self._insert_returning_ids(
+                session, 
+                ExecutionBatch, 
+                [{k: v for k, v in i.items() if k != "references"} for i in batches]
+            )
+
+            reference_rows = [
+                {"execution_batch_id": batch_id, "row_index": row_index, "reference_id": reference_id}
+                for batch_id, batch in zip(batch_ids, batches) for row_index, reference_id in batch["references"]
+            ]
+
+            if len(reference_rows) > 0:
+                session.execute(insert(ExecutionBatchReferences.__table__), reference_rows)
+
+    def select_execution_batches(
+            self, 
+            deployable_id: int | None = None, 
+            start: datetime | None = None, 
+            end: datetime | None = None,
+            after_id: int | None = None,
+            until_id: int | None = None,
+            references: bool = True,
+            reference_ids: list[str] | None = None
+    ) -> list[dict]:
+
+        """
+        Compact execution log batches, each with its list of (row_index, reference_id) (unless references=False).
+        reference_ids selects the batches holding any of these reference ids (all their rows are returned).
+        """
+
+        where = log_filter(
+            ExecutionBatch, deployable_id=deployable_id, start=start, end=end, after_id=after_id, until_id=until_id
+        )
+        if reference_ids is not None:
+            where.append(ExecutionBatch.id.in_(
+                select(ExecutionBatchReferences.execution_batch_id)
+                .where(ExecutionBatchReferences.reference_id.in_(reference_ids))
+            ))
+
+        stmt = select(*ExecutionBatch.__table__.columns).where(*where).order_by(ExecutionBatch.id)
+        stmt_references = (
+            select(
+                ExecutionBatchReferences.execution_batch_id, 
+                ExecutionBatchReferences.row_index, 
+                ExecutionBatchReferences.reference_id
+            )
+            .join(ExecutionBatch, ExecutionBatch.id == ExecutionBatchReferences.execution_batch_id)
+            .where(*where)
+        )
+
+        batches = self.execute_select_query(stmt)
+        if not references:
+            return batches
+
+        references = {i["id"]: [] for i in batches}
+        for i in self.execute_select_query(stmt_references):
+            references[i["execution_batch_id"]].append((i["row_index"], i["reference_id"]))
+
+        for i in batches:
+            i["references"] = references[i["id"]]
+
+        return batches
+
+    def select_execution_log_items(
+            self, 
+            deployable_id: int | None = None, 
+            start: datetime | None = None, 
+            end: datetime | None = None,
+            after_id: int | None = None,
+            until_id: int | None = None,
+            reference_ids: list[str] | None = None
+    ) -> dict:
+
+        """
+        Normalized execution log in long form: request and response items joined with their log entries.
+        reference_ids selects the items with these reference ids.
+        """
+
+        where = log_filter(
+            ExecutionLog, deployable_id=deployable_id, start=start, end=end, after_id=after_id, until_id=until_id
+        )
+        item_columns = [
+            ExecutionLog.id.label("log_id"),
+            ExecutionLog.deployable_id,
+            ExecutionLog.request_time,
+            ExecutionItems.id.label("item_id"),
+            ExecutionItems.reference_id,
+        ]
+
+        stmt_items = (
+            select(*item_columns)
+            .join(ExecutionItems, ExecutionItems.execution_log_id == ExecutionLog.id)
+            .where(*where)
+            .order_by(ExecutionItems.id)
+        )
+
+        if reference_ids is not None:
+            # row index within the request, numbered over all items of the log entries holding the reference ids
+            numbered = (
+                select(
+                    ExecutionItems.id,
+                    ExecutionItems.execution_log_id,
+                    ExecutionItems.reference_id,
+                    (func.row_number().over(
+                        partition_by=ExecutionItems.execution_log_id, order_by=ExecutionItems.id
+                    ) - 1).label("row_index")
+                )
+                .where(ExecutionItems.execution_log_id.in_(
+                    select(ExecutionItems.execution_log_id).where(ExecutionItems.reference_id.in_(reference_ids))
+                ))
+                .subquery()
+            )
+            stmt_items = (
+                select(*item_columns[:3], numbered.c.id.label("item_id"), numbered.c.reference_id, numbered.c.row_index)
+                .join(numbered, numbered.c.execution_log_id == ExecutionLog.id)
+                .where(*where, numbered.c.reference_id.in_(reference_ids))
+                .order_by(numbered.c.id)
+            )
+            where.append(ExecutionItems.reference_id.in_(reference_ids))
+
+        stmt_request = (
+            select(RequestItems.execution_items_id.label("item_id"), RequestItems.varname, RequestItems.in_value)
+            .join(ExecutionItems, ExecutionItems.id == RequestItems.execution_items_id)
+            .join(ExecutionLog, ExecutionLog.id == ExecutionItems.execution_log_id)
+            .where(*where)
+        )
+        stmt_response = (
+            select(ResponseItems.execution_items_id.label("item_id"), ResponseItems.classname, ResponseItems.out_value)
+            .join(ExecutionItems, ExecutionItems.id == ResponseItems.execution_items_id)
+            .join(ExecutionLog, ExecutionLog.id == ExecutionItems.execution_log_id)
+            .where(*where)
+        )
+
+        return {
+            "items": self.execute_select_query(stmt_items),
+            "request": self.execute_select_query(stmt_request),
+            "response": self.execute_select_query(stmt_response),
+        }
+
+    def get_max_log_id(self, log_format: str) -> int | None:
+        model = ExecutionBatch if log_format == "compact" else ExecutionLog
+        return self.execute_select_query_single(select(func.max(model.id)))
+
+    def get_settled_log_id(
+            self, 
+            log_format: str, 
+            source: str, 
+            window_seconds: int, 
+            settle_seconds: float | None = None
+    ) -> int | None:
+
+        """
+        Highest log id a log consumer (source, window_seconds) may aggregate up to. Ids are assigned at insert, 
+        but with several writers (Postgres) a lower id can commit after a higher one: the max log id is only
+        used once it was observed settle_seconds ago, inserts in flight at that time have committed since.
+        The observation is kept as the watermark row of source '<source>:observed' and renewed when used.
+        None while no observation is old enough. settle_seconds=None: 0 (the current max id) on SQLite, 
+        where one writer at a time commits ids in order, DEFAULT_LOG_SETTLE_SECONDS otherwise.
+        """
+
+        if settle_seconds is None:
+            settle_seconds = 0 if self.engine.dialect.name == "sqlite" else DEFAULT_LOG_SETTLE_SECONDS
+        if settle_seconds <= 0:
+            return self.get_max_log_id(log_format)
+
+        model = ExecutionBatch if log_format == "compact" else ExecutionLog
+        key = (MonitoringWatermark.source == f"{source}:observed", MonitoringWatermark.window_seconds == window_seconds)
+        now = datetime.utcnow()
+
+        try:
+            with self.session.begin() as session:
+                observed = session.execute(select(MonitoringWatermark.last_log_id, MonitoringWatermark.updated_at).where(*key)).first()
+                last = session.execute(select(func.coalesce(func.max(model.id), 0))).scalar_one()
+
+                if observed is None:
+                    session.execute(
+                        insert(MonitoringWatermark.__table__), 
+                        [{"source": f"{source}:observed", "window_seconds": window_seconds, "last_log_id": last, "updated_at": now}]
+                    )
+                    return None
+                if (now - observed.updated_at).total_seconds() < settle_seconds:
+                    return None
+
+                # a concurrent consumer may have renewed it already, the settled id holds either way
+                session.execute(
+                    update(MonitoringWatermark.__table__)
+                    .where(*key, MonitoringWatermark.updated_at == observed.updated_at)
+                    .values(last_log_id=last, updated_at=now)
+                )
+        except IntegrityError:
+            # first observation inserted concurrently
+            return None
+
+        return observed.last_log_id or None
+
+    def select_log_ids(
+            self, 
+            log_format: str, 
+            deployable_id: int, 
+            start: datetime | None = None, 
+            end: datetime | None = None, 
+            after_id: int | None = None, 
+            until_id: int | None = None, 
+            limit: int = 1000
+    ) -> list[int]:
+
+        """
+        Ids of the log entries of a deployable past after_id (at most limit, ascending), see log_filter.
+        Pages through the log of a deployable with after_id = the last id of the previous page.
+        """
+
+        model = ExecutionBatch if log_format == "compact" else ExecutionLog
+        where = log_filter(model, deployable_id=deployable_id, start=start, end=end, after_id=after_id, until_id=until_id)
+        stmt = select(model.id).where(*where).order_by(model.id).limit(limit)
+        return [i["id"] for i in self.execute_select_query(stmt)]
+
+    def select_expired_log_ids(
+            self, 
+            log_format: str, 
+            deployable_id: int, 
+            end: datetime, 
+            until_id: int | None = None, 
+            limit: int = 1000
+    ) -> list[int]:
+
+        """
+        Ids of the oldest log entries of a deployable with request_time before end (at most limit, ascending).
+        """
+
+        return self.select_log_ids(log_format, deployable_id, end=end, until_id=until_id, limit=limit)
+
+    def delete_execution_logs(self, log_format: str, ids: list[int]) -> None:
+
+        """
+        Delete log entries with their items / references, in one transaction.
+        """
+
+        with self.session.begin() as session:
+            if log_format == "compact":
+                session.execute(delete(ExecutionBatchReferences).where(ExecutionBatchReferences.execution_batch_id.in_(ids)))
+                session.execute(delete(ExecutionBatch).where(ExecutionBatch.id.in_(ids)))
+                return
+
+            items = select(ExecutionItems.id).where(ExecutionItems.execution_log_id.in_(ids))
+            session.execute(delete(RequestItems).where(RequestItems.execution_items_id.in_(items)))
+            session.execute(delete(ResponseItems).where(ResponseItems.execution_items_id.in_(items)))
+            session.execute(delete(ExecutionItems).where(ExecutionItems.execution_log_id.in_(ids)))
+            session.execute(delete(ExecutionLog).where(ExecutionLog.id.in_(ids)))
+
+    def vacuum(self) -> None:
+
+        """
+        Return the space of deleted rows: VACUUM on SQLite (rewrites the file), VACUUM ANALYZE of the log tables on Postgres.
+        """
+
+        dialect = self.engine.dialect.name
+        if dialect not in ["sqlite", "postgresql"]:
+            return
+
+        # VACUUM can not run inside a transaction
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            if dialect == "sqlite":
+                connection.execute(text("VACUUM"))
+                return
+            for model in [ExecutionLog, ExecutionItems, RequestItems, ResponseItems, ExecutionBatch, ExecutionBatchReferences]:
+                connection.execute(text(f"VACUUM ANALYZE {model.__tablename__}"))
+
+    def get_min_watermark(self, sources: list[str]) -> int | None:
+        # lowest log id aggregated by any of the sources, None if none of them has run
+        stmt = select(func.min(MonitoringWatermark.last_log_id)).where(MonitoringWatermark.source.in_(sources))
+        return self.execute_select_query_single(stmt)
+
+    def get_monitoring_watermark(self, source: str, window_seconds: int) -> int | None:
+
+        stmt = select(MonitoringWatermark.last_log_id).where(
+            MonitoringWatermark.source == source, MonitoringWatermark.window_seconds == window_seconds
+        )
+        result = self.execute_select_query(stmt)
+        return result[0]["last_log_id"] if len(result) > 0 else None
+
+    def select_monitoring_windows(
+            self, 
+            window_seconds: int, 
+            deployable_id: int | list[int] | None = None, 
+            start: datetime | None = None, 
+            end: datetime | None = None,
+            window_starts: list[datetime] | None = None
+    ) -> list[dict]:
+
+        """
+        Monitoring window rows (with the serialized sketches), start inclusive, end exclusive.
+        """
+
+        where = [MonitoringWindow.window_seconds == window_seconds]
+        if isinstance(deployable_id, list):
+            where.append(MonitoringWindow.deployable_id.in_(deployable_id))
+        elif deployable_id is not None:
+            where.append(MonitoringWindow.deployable_id == deployable_id)
+        if start is not None:
+            where.append(MonitoringWindow.window_start >= start)
+        if end is not None:
+            where.append(MonitoringWindow.window_start < end)
+        if window_starts is not None:
+            where.append(MonitoringWindow.window_start.in_(window_starts))
+
+        stmt = (
+            select(*MonitoringWindow.__table__.columns)
+            .where(*where)
+            .order_by(MonitoringWindow.deployable_id, MonitoringWindow.window_start, MonitoringWindow.variable)
+        )
+        return self.execute_select_query(stmt)
+
+    def save_monitoring_windows(
+            self,
+            inserts: list[dict],
+            updates: list[dict],
+            source: str,
+            window_seconds: int,
+            last_log_id: int,
+            previous_log_id: int | None
+    ) -> None:
+
+        """
+        Write new / merged window rows and move the watermark from previous_log_id to last_log_id, 
+        in one transaction. Fails if the watermark was moved in the meantime (a concurrent update).
+        """
+
+        self._save_log_aggregates(MonitoringWindow, inserts, updates, [(source, window_seconds, last_log_id, previous_log_id)])
+
+    def select_execution_rollups(
+            self,
+            bucket_seconds: int,
+            deployable_id: int | list[int] | None = None,
+            start: datetime | None = None,
+            end: datetime | None = None,
+            bucket_starts: list[datetime] | None = None,
+            sketches: bool = True
+    ) -> list[dict]:
+
+        """
+        Execution rollup rows of one bucket size, start inclusive, end exclusive (by bucket_start).
+        sketches=False leaves out the request size sketches.
+        """
+
+        where = [ExecutionRollup.bucket_seconds == bucket_seconds]
+        if isinstance(deployable_id, list):
+            where.append(ExecutionRollup.deployable_id.in_(deployable_id))
+        elif deployable_id is not None:
+            where.append(ExecutionRollup.deployable_id == deployable_id)
+        if start is not None:
+            where.append(ExecutionRollup.bucket_start >= start)
+        if end is not None:
+            where.append(ExecutionRollup.bucket_start < end)
+        if bucket_starts is not None:
+            where.append(ExecutionRollup.bucket_start.in_(bucket_starts))
+
+        columns = [i for i in ExecutionRollup.__table__.columns if sketches or i.name != "request_size_sketch"]
+        stmt = (
+            select(*columns)
+            .where(*where)
+            .order_by(ExecutionRollup.deployable_id, ExecutionRollup.bucket_start)
+        )
+        return self.execute_select_query(stmt)
+
+    def save_execution_rollups(
+            self,
+            inserts: list[dict],
+            updates: list[dict],
+            watermarks: list[tuple[str, int, int, int | None]]
+    ) -> None:
+
+        """
+        Write new / merged rollup rows and move the watermarks (source, bucket_seconds, last_log_id, previous_log_id) 
+        of their bucket sizes, in one transaction.
+        """
+
+        self._save_log_aggregates(ExecutionRollup, inserts, updates, watermarks)
+
+    def _save_log_aggregates(
+            self,
+            model: Base,
+            inserts: list[dict],
+            updates: list[dict],
+            watermarks: list[tuple[str, int, int, int | None]]
+    ) -> None:
+
+        now = datetime.utcnow()
+
+        with self.session.begin() as session:
+            if len(inserts) > 0:
+                session.execute(insert(model.__table__), [{**i, "updated_at": now} for i in inserts])
+            if len(updates) > 0:
+                session.execute(update(model), [{**i, "updated_at": now} for i in updates])
+
+            for source, window_seconds, last_log_id, previous_log_id in watermarks:
+                self._move_watermark(session, source, window_seconds, last_log_id, previous_log_id, now)
+
+    def _move_watermark(
+            self, 
+            session: Session, 
+            source: str, 
+            window_seconds: int, 
+            last_log_id: int, 
+            previous_log_id: int | None, 
+            now: datetime
+    ) -> None:
+
+        if previous_log_id is None:
+            session.execute(
+                insert(MonitoringWatermark.__table__), 
+                [{"source": source, "window_seconds": window_seconds, "last_log_id": last_log_id, "updated_at": now}]
+            )
+            return
+
+        result = session.execute(
+            update(MonitoringWatermark.__table__)
+            .where(
+                MonitoringWatermark.source == source, 
+                MonitoringWatermark.window_seconds == window_seconds,
+                MonitoringWatermark.last_log_id == previous_log_id
+            )
+            .values(last_log_id=last_log_id, updated_at=now)
+        )
+        if result.rowcount != 1:
+            raise RuntimeError(f"Watermark of {source} log moved past {previous_log_id}, concurrent update")
+
+    def select_execution_log_outputs(self, after_id: int | None = None, until_id: int | None = None) -> dict:
+
+        """
+        Normalized execution log entries and the sum of their predictions per class (summed in the DB).
+        """
+
+        where = log_filter(ExecutionLog, after_id=after_id, until_id=until_id)
+
+        stmt_logs = (
+            select(ExecutionLog.id.label("log_id"), ExecutionLog.deployable_id, ExecutionLog.request_time, ExecutionLog.request_size)
+            .where(*where)
+            .order_by(ExecutionLog.id)
+        )
+        stmt_outputs = (
+            select(
+                ExecutionItems.execution_log_id.label("log_id"), 
+                ResponseItems.classname, 
+                func.sum(ResponseItems.out_value).label("out_sum")
+            )
+            .join(ExecutionItems, ExecutionItems.id == ResponseItems.execution_items_id)
+            .join(ExecutionLog, ExecutionLog.id == ExecutionItems.execution_log_id)
+            .where(*where)
+            .group_by(ExecutionItems.execution_log_id, ResponseItems.classname)
+        )
+
+        return {"logs": self.execute_select_query(stmt_logs), "outputs": self.execute_select_query(stmt_outputs)}
+
+    def _insert_returning_ids(self, session: Session, model: Base, rows: list[dict]) -> list[int]:
+
+        if len(rows) == 0:
+            return []
+
+        table = model.__table__
+        if self.engine.dialect.insert_executemany_returning_sort_by_parameter_order:
+            stmt = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+            return list(session.execute(stmt, rows).scalars())
+
+        # backends without RETURNING for executemany (e.g. MySQL)
+        return [session.execute(insert(table).values(**i)).inserted_primary_key[0] for i in rows]
+
+
+def log_filter(
+        model: Base, 
+        deployable_id: int | None = None, 
+        start: datetime | None = None, 
+        end: datetime | None = None, 
+        after_id: int | None = None, 
+        until_id: int | None = None
+) -> list:
+
+    """
+    Where clauses over an execution log table (deployable_id, request_time columns), start inclusive, end exclusive.
+    after_id (exclusive) / until_id (inclusive) select a range of log ids, e.g. rows past a watermark.
+    """
+
+    out = []
+    if after_id is not None:
+        out.append(model.id > after_id)
+    if until_id is not None:
+        out.append(model.id <= until_id)
+    if deployable_id is not None:
+        out.append(model.deployable_id == deployable_id)
+    if start is not None:
+        out.append(model.request_time >= start)
+    if end is not None:
+        out.append(model.request_time < end)
+    return out
@@ -0,0 +1,134 @@
+import threading
+from typing import TYPE_CHECKING
+
+from sqlalchemy import URL, Engine, create_engine, event
+from sqlalchemy.engine import make_url
+
+from mlopslite.registry.registryconfig import RegistryConfig
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+# engines shared by all clients in the process, keyed by connection string + engine settings
+_ENGINES: dict[tuple, Engine] = {}
+_ENGINES_LOCK = threading.Lock()
+
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "sqlite_journal_mode",
+    "synchronous": "sqlite_synchronous",
+    "mmap_size": "sqlite_mmap_size",
+    "cache_size": "sqlite_cache_size",
+    "busy_timeout": "sqlite_busy_timeout",
+}
+
+
+def get_engine(config: RegistryConfig) -> Engine:
+
+    """
+    Engine for config, reused across clients with the same settings unless config.share_engine is False.
+    """
+
+    if not config.share_engine:
+        return create_registry_engine(config)
+
+    key = engine_key(config)
+    with _ENGINES_LOCK:
+        if key not in _ENGINES:
+            _ENGINES[key] = create_registry_engine(config)
+        return _ENGINES[key]
+
+
+def engine_key(config: RegistryConfig) -> tuple:
+    return (
+        config.db_constring,
+        config.pool_size,
+        config.pool_max_overflow,
+        config.pool_pre_ping,
+        config.pool_recycle,
+        config.pool_timeout,
+        *[getattr(config, i) for i in SQLITE_PRAGMAS.values()],
+    )
+
+
+def create_registry_engine(config: RegistryConfig) -> Engine:
+
+    url = make_url(config.db_constring)
+    engine = create_engine(url, **engine_kwargs(config))
+    listen_sqlite_pragmas(engine, config)
+
+    return engine
+
+
+def create_async_registry_engine(config: RegistryConfig) -> "AsyncEngine":
+
+    """
+    Async engine for config, the connection string is mapped to the asyncio driver 
+    (sqlite -> aiosqlite, postgresql -> asyncpg). Async engines are bound to their event loop and not shared.
+    """
+
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine(async_url(config.db_constring), **engine_kwargs(config))
+    listen_sqlite_pragmas(engine.sync_engine, config)
+
+    return engine
+
+
+def async_url(db_constring: str) -> URL:
+
+    url = make_url(db_constring)
+    backend, driver = url.get_backend_name(), url.get_driver_name()
+
+    if driver in ASYNC_DRIVERS.values():
+        return url
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver for {backend}, expected one of {list(ASYNC_DRIVERS.keys())}")
+
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+def engine_kwargs(config: RegistryConfig) -> dict:
+
+    url = make_url(config.db_constring)
+    kwargs = {"pool_pre_ping": config.pool_pre_ping, "pool_recycle": config.pool_recycle}
+
+    # in-memory SQLite is bound to a single connection, pool sizing does not apply
+    if not (url.get_backend_name() == "sqlite" and url.database in [None, "", ":memory:"]):
+        kwargs.update(
+            pool_size=config.pool_size, 
+            max_overflow=config.pool_max_overflow, 
+            pool_timeout=config.pool_timeout
+        )
+
+    return kwargs
+
+
+def listen_sqlite_pragmas(engine: Engine, config: RegistryConfig) -> None:
+
+    if engine.dialect.name != "sqlite":
+        return
+
+    pragmas = {k: getattr(config, v) for k, v in SQLITE_PRAGMAS.items() if getattr(config, v) is not None}
+    if len(pragmas) > 0:
+        event.listen(engine, "connect", lambda dbapi_connection, _: set_sqlite_pragmas(dbapi_connection, pragmas))
+
+
+def set_sqlite_pragmas(dbapi_connection, pragmas: dict) -> None:
+    cursor = dbapi_connection.cursor()
+    for k, v in pragmas.items():
+        cursor.execute(f"PRAGMA {k} = {v}")
+    cursor.close()
+
+
+def dispose_engines() -> None:
+
+    """
+    Close pooled connections of all shared engines (e.g. after fork, or before removing a SQLite file).
+    """
+
+    with _ENGINES_LOCK:
+        for engine in _ENGINES.values():
+            engine.dispose()
+        _ENGINES.clear()
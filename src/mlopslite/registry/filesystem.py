@@ -1,3 +1,176 @@
+import mmap
+import os
+import re
+import threading
+import uuid
+from hashlib import md5
+from typing import BinaryIO, Iterable, Iterator
+
+from mlopslite.registry.registryconfig import DEFAULT_FS_ROOT
+
+FS_TYPES = ["db", "local"]
+
+_KEY_PATTERN = re.compile(r"^[0-9a-f]{32,128}$")
+
+
 class FileSystem:
-    def __init__(self) -> None:
-        pass
+
+    """
+    Content-addressed blob store on the local filesystem.
+
+    Blobs are keyed by the md5 of their content (same as the deployable hash) and stored in sharded
+    directories, <root>/ab/cd/abcd..., so no directory grows past a few thousand entries.
+    Writes go to a temporary file in the target directory, which is renamed into place, so readers
+    never see a partial blob. Content that is already stored is not written again.
+    """
+
+    def __init__(self, root: str = DEFAULT_FS_ROOT, shard_depth: int = 2, shard_width: int = 2) -> None:
+        self.root = root
+        self.shard_depth = shard_depth
+        self.shard_width = shard_width
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, key: str) -> str:
+
+        if not _KEY_PATTERN.match(key):
+            raise ValueError(f"Invalid blob key {key!r}, expected a hex digest")
+
+        shards = [key[i * self.shard_width:(i + 1) * self.shard_width] for i in range(self.shard_depth)]
+        return os.path.join(self.root, *shards, key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def size(self, key: str) -> int:
+        return os.path.getsize(self.path(key))
+
+    def put(self, data: bytes) -> str:
+
+        """
+        Store data, returns its key.
+        """
+
+        key = md5(data).hexdigest()
+        if not self.exists(key):
+            self._write(key, [data])
+        return key
+
+    def put_stream(self, chunks: Iterable[bytes]) -> str:
+
+        """
+        Store data written in chunks, without holding it in memory. Returns its key.
+        """
+
+        hasher = md5()
+        tmp = self._tmp_path(self.root)
+        try:
+            with open(tmp, "wb") as f:
+                for chunk in chunks:
+                    hasher.update(chunk)
+                    f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+
+            key = hasher.hexdigest()
+            if self.exists(key):
+                os.remove(tmp)
+            else:
+                path = self.path(key)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+        return key
+
+    def put_file(self, path: str) -> str:
+
+        """
+        Move an existing file into the store (or remove it, if the content is already stored), returns its key.
+        path should be on the same filesystem as root (e.g. created in root), so it is renamed rather than copied.
+        """
+
+        hasher = md5()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                hasher.update(chunk)
+            os.fsync(f.fileno())
+
+        key = hasher.hexdigest()
+        if self.exists(key):
+            os.remove(path)
+            return key
+
+        target = self.path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.replace(path, target)
+        except OSError:
+            # different filesystem
+            with open(path, "rb") as f:
+                self._write(key, iter(lambda: f.read(1 << 20), b""))
+            os.remove(path)
+
+        return key
+
+    def get(self, key: str, verify: bool = False) -> bytes:
+
+        with open(self.path(key), "rb") as f:
+            data = f.read()
+
+        if verify and md5(data).hexdigest() != key:
+            raise ValueError(f"Blob {key} is corrupted, content does not match its hash")
+
+        return data
+
+    def open(self, key: str) -> BinaryIO:
+        return open(self.path(key), "rb")
+
+    def open_mmap(self, key: str) -> mmap.mmap:
+
+        """
+        Read-only memory map of the blob, pages are read from disk on access.
+        Use as a context manager, or close it when done.
+        """
+
+        with open(self.path(key), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # empty files can not be mapped
+                return mmap.mmap(-1, 1)
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def keys(self) -> Iterator[str]:
+        for _, _, files in os.walk(self.root):
+            for name in files:
+                if _KEY_PATTERN.match(name):
+                    yield name
+
+    def _tmp_path(self, directory: str) -> str:
+        return os.path.join(directory, f".tmp-{os.getpid()}-{threading.get_ident()}-{uuid.uuid4().hex}")
+
+    def _write(self, key: str, chunks: Iterable[bytes]) -> None:
+
+        path = self.path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        tmp = self._tmp_path(directory)
+        try:
+            with open(tmp, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
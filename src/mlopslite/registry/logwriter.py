@@ -0,0 +1,218 @@
+import atexit
+import logging
+import os
+import pickle
+import queue
+import threading
+import uuid
+from glob import glob
+from time import monotonic
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+BACKPRESSURE_POLICIES = ["block", "drop", "spill"]
+
+_STOP = object()
+
+
+class LogWriter:
+
+    """
+    Background writer of execution logs.
+
+    Entries are put on a bounded queue and drained by a worker thread, which writes them in bulk
+    once batch_size rows are pending or flush_interval seconds passed since the first pending entry.
+    When the queue is full, backpressure decides what happens to new entries:
+    - block: caller waits for free space
+    - drop: entry is discarded (counted in stats)
+    - spill: entry is pickled to spill_dir and written by the worker once it catches up
+
+    close() (also registered atexit) drains the queue and spilled entries before returning.
+    """
+
+    def __init__(
+            self,
+            write: Callable[[list[Any]], None],
+            batch_size: int = 10000,
+            flush_interval: float = 1.0,
+            queue_size: int = 1000,
+            backpressure: str = "block",
+            spill_dir: str | None = None,
+            size: Callable[[Any], int] = lambda entry: 1
+    ) -> None:
+
+        if backpressure not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Invalid backpressure policy {backpressure}, expected one of {BACKPRESSURE_POLICIES}")
+
+        if backpressure == "spill":
+            if spill_dir is None:
+                raise ValueError("Backpressure policy 'spill' requires spill_dir")
+            os.makedirs(spill_dir, exist_ok=True)
+
+        self.write = write
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.backpressure = backpressure
+        self.spill_dir = spill_dir
+        self.size = size
+
+        self.stats = {"submitted": 0, "written": 0, "dropped": 0, "spilled": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        # closed check + enqueue (put or spill) are atomic, so no entry is accepted after _STOP
+        self._lock = threading.Lock()
+        # one drain of spill_dir at a time in this process, flush waits for the worker's
+        self._spill_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="mlopslite-log-writer", daemon=True)
+        self._thread.start()
+
+        # drain on interpreter shutdown
+        atexit.register(self.close)
+
+    def submit(self, entry) -> bool:
+
+        """
+        Queue entry for writing, returns False if it was dropped.
+        """
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("LogWriter is closed")
+
+            self._count("submitted")
+
+            if self.backpressure == "block":
+                self._queue.put(entry)
+                return True
+
+            try:
+                self._queue.put_nowait(entry)
+                return True
+            except queue.Full:
+                pass
+
+            if self.backpressure == "drop":
+                self._count("dropped")
+                return False
+
+            self._spill(entry)
+            return True
+
+    def flush(self) -> None:
+
+        """
+        Block until all entries submitted so far are written, spilled entries included.
+        """
+
+        self._queue.join()
+        self._write_spilled()
+
+    def close(self) -> None:
+
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        # every accepted entry was queued or spilled before (under the lock)
+        self._queue.put(_STOP)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def _run(self) -> None:
+
+        stop = False
+        while not stop:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._write_spilled()
+                continue
+
+            if first is _STOP:
+                self._queue.task_done()
+                break
+
+            batch, rows = [first], self.size(first)
+            deadline = monotonic() + self.flush_interval
+
+            while rows < self.batch_size:
+                timeout = deadline - monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stop = True
+                    self._queue.task_done()
+                    break
+                batch.append(entry)
+                rows += self.size(entry)
+
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+            if self._queue.empty():
+                self._write_spilled()
+
+        self._write_spilled()
+
+    def _write(self, batch: list) -> None:
+        try:
+            self.write(batch)
+            self._count("written", len(batch))
+        except Exception:
+            self._count("failed", len(batch))
+            logger.exception(f"Failed writing {len(batch)} execution log entries")
+            if self.backpressure == "spill":
+                for entry in batch:
+                    self._spill(entry)
+
+    def _spill(self, entry) -> None:
+        path = os.path.join(self.spill_dir, f"spill-{uuid.uuid4().hex}.pkl")
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump(entry, f)
+        os.replace(path + ".tmp", path)
+        self._count("spilled")
+
+    def _write_spilled(self) -> None:
+
+        if self.spill_dir is None:
+            return
+
+        with self._spill_lock:
+            self._drain_spilled()
+
+    def _drain_spilled(self) -> None:
+
+        batch, rows = [], 0
+        for path in sorted(glob(os.path.join(self.spill_dir, "spill-*.pkl")), key=os.path.getmtime):
+            # claim the file, spill_dir can be shared between processes
+            claimed = f"{path}.{uuid.uuid4().hex}.writing"
+            try:
+                os.rename(path, claimed)
+            except FileNotFoundError:
+                continue
+
+            with open(claimed, "rb") as f:
+                entry = pickle.load(f)
+            os.remove(claimed)
+
+            batch.append(entry)
+            rows += self.size(entry)
+            if rows >= self.batch_size:
+                self._write(batch)
+                batch, rows = [], 0
+
+        if len(batch) > 0:
+            self._write(batch)
@@ -59,6 +59,16 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # connection handed over by the registry (DataBase._upgrade_db), so the migration runs
+    # on the registry engine (pool, pragmas, in-memory databases)
+    connection = config.attributes.get("connection", None)
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -0,0 +1,34 @@
+"""1792367700_update
+
+Revision ID: 0a7e3c5f9b1d
+Revises: f1c6d8a2b5e7
+Create Date: 2026-10-19 00:35:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0a7e3c5f9b1d'
+down_revision = 'f1c6d8a2b5e7'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns)
+INDEXES = [
+    ('ix_model_execution_log_deployable_id', 'model_execution_log', ['deployable_id', 'id']),
+    ('ix_execution_batch_log_deployable_id', 'execution_batch_log', ['deployable_id', 'id']),
+]
+
+
+def upgrade() -> None:
+    # log ids of one deployable in id order (keyset pages of replay, retention batches)
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
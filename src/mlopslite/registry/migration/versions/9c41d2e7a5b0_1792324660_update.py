@@ -0,0 +1,32 @@
+"""1792324660_update
+
+Revision ID: 9c41d2e7a5b0
+Revises: 2f3ce3aad699
+Create Date: 2026-10-18 12:37:40.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c41d2e7a5b0'
+down_revision = '2f3ce3aad699'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # binary dataset storage, legacy rows keep their JSON payload with data_format = 'json'
+    with op.batch_alter_table('dataset_registry') as batch_op:
+        batch_op.add_column(sa.Column('data_format', sa.String(), server_default='json', nullable=False))
+        batch_op.add_column(sa.Column('data_blob', sa.LargeBinary(), nullable=True))
+        batch_op.alter_column('data', existing_type=sa.JSON(), nullable=True)
+
+
+def downgrade() -> None:
+    # binary rows can not be represented in the legacy layout, they have to be removed first
+    with op.batch_alter_table('dataset_registry') as batch_op:
+        batch_op.alter_column('data', existing_type=sa.JSON(), nullable=False)
+        batch_op.drop_column('data_blob')
+        batch_op.drop_column('data_format')
@@ -0,0 +1,36 @@
+"""1792331720_update
+
+Revision ID: b7d3f1a9c2e4
+Revises: 5e8a0b6c13f2
+Create Date: 2026-10-18 14:35:20.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d3f1a9c2e4'
+down_revision = '5e8a0b6c13f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # references to blobs in the artifact filesystem, payload columns stay empty for these rows
+    with op.batch_alter_table('dataset_registry') as batch_op:
+        batch_op.add_column(sa.Column('storage_ref', sa.String(), nullable=True))
+
+    with op.batch_alter_table('deployable_registry') as batch_op:
+        batch_op.add_column(sa.Column('storage_ref', sa.String(), nullable=True))
+        batch_op.alter_column('deployable', existing_type=sa.LargeBinary(), nullable=True)
+
+
+def downgrade() -> None:
+    # rows stored in the filesystem have to be moved back to the DB first
+    with op.batch_alter_table('deployable_registry') as batch_op:
+        batch_op.alter_column('deployable', existing_type=sa.LargeBinary(), nullable=False)
+        batch_op.drop_column('storage_ref')
+
+    with op.batch_alter_table('dataset_registry') as batch_op:
+        batch_op.drop_column('storage_ref')
@@ -0,0 +1,27 @@
+"""1792338920_update
+
+Revision ID: c4e8a2d6f1b3
+Revises: b7d3f1a9c2e4
+Create Date: 2026-10-18 16:35:20.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a2d6f1b3'
+down_revision = 'b7d3f1a9c2e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # serialized column sketches (distinct count, quantiles, frequent values), optional per column
+    with op.batch_alter_table('dataset_registry_columns') as batch_op:
+        batch_op.add_column(sa.Column('sketch', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('dataset_registry_columns') as batch_op:
+        batch_op.drop_column('sketch')
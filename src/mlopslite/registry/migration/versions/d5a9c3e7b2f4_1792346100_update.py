@@ -0,0 +1,49 @@
+"""1792346100_update
+
+Revision ID: d5a9c3e7b2f4
+Revises: c4e8a2d6f1b3
+Create Date: 2026-10-18 18:35:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a9c3e7b2f4'
+down_revision = 'c4e8a2d6f1b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # monitoring aggregates of the execution log, see registry.monitoring
+    op.create_table('monitoring_window',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('deployable_id', sa.Integer(), nullable=False),
+    sa.Column('window_seconds', sa.Integer(), nullable=False),
+    sa.Column('window_start', sa.DateTime(), nullable=False),
+    sa.Column('variable', sa.String(), nullable=False),
+    sa.Column('converted_dtype', sa.String(), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('null_count', sa.Integer(), nullable=False),
+    sa.Column('sketch', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['deployable_id'], ['deployable_registry.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('deployable_id', 'window_seconds', 'window_start', 'variable')
+    )
+    op.create_table('monitoring_watermark',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('source', sa.String(), nullable=False),
+    sa.Column('window_seconds', sa.Integer(), nullable=False),
+    sa.Column('last_log_id', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source', 'window_seconds')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('monitoring_watermark')
+    op.drop_table('monitoring_window')
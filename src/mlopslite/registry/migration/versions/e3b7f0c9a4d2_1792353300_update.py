@@ -0,0 +1,39 @@
+"""1792353300_update
+
+Revision ID: e3b7f0c9a4d2
+Revises: d5a9c3e7b2f4
+Create Date: 2026-10-18 20:35:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3b7f0c9a4d2'
+down_revision = 'd5a9c3e7b2f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # time-bucketed execution metrics, see registry.rollup
+    op.create_table('execution_rollup',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('deployable_id', sa.Integer(), nullable=False),
+    sa.Column('bucket_seconds', sa.Integer(), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(), nullable=False),
+    sa.Column('requests', sa.Integer(), nullable=False),
+    sa.Column('rows', sa.Integer(), nullable=False),
+    sa.Column('request_size_max', sa.Integer(), nullable=False),
+    sa.Column('request_size_sketch', sa.LargeBinary(), nullable=False),
+    sa.Column('output_sums', sa.JSON(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['deployable_id'], ['deployable_registry.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('deployable_id', 'bucket_seconds', 'bucket_start')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('execution_rollup')
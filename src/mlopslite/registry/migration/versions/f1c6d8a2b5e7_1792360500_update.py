@@ -0,0 +1,45 @@
+"""1792360500_update
+
+Revision ID: f1c6d8a2b5e7
+Revises: e3b7f0c9a4d2
+Create Date: 2026-10-18 22:35:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c6d8a2b5e7'
+down_revision = 'e3b7f0c9a4d2'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns), hash lookups already use the unique constraint indexes
+INDEXES = [
+    ('ix_dataset_registry_columns_dataset_registry_id', 'dataset_registry_columns', ['dataset_registry_id']),
+    ('ix_deployable_registry_name_dataset_target', 'deployable_registry', ['name', 'dataset_registry_id', 'target', 'version']),
+    ('ix_deployable_registry_name_version', 'deployable_registry', ['name', 'version']),
+    ('ix_model_execution_log_deployable_time', 'model_execution_log', ['deployable_id', 'request_time']),
+    ('ix_execution_items_execution_log_id', 'execution_items', ['execution_log_id']),
+    ('ix_execution_items_reference_id', 'execution_items', ['reference_id']),
+    ('ix_request_items_execution_items_id', 'request_items', ['execution_items_id']),
+    ('ix_response_items_execution_items_id', 'response_items', ['execution_items_id']),
+    ('ix_execution_batch_log_deployable_time', 'execution_batch_log', ['deployable_id', 'request_time']),
+    ('ix_execution_batch_references_execution_batch_id', 'execution_batch_references', ['execution_batch_id']),
+    ('ix_execution_batch_references_reference_id', 'execution_batch_references', ['reference_id']),
+    ('ix_monitoring_window_seconds_start', 'monitoring_window', ['window_seconds', 'window_start']),
+    ('ix_execution_rollup_seconds_start', 'execution_rollup', ['bucket_seconds', 'bucket_start']),
+]
+
+
+def upgrade() -> None:
+    # secondary indexes of the registry lookups and execution log reads (foreign keys, time ranges, reference ids)
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
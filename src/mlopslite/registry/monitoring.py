@@ -0,0 +1,347 @@
+"""
+Monitoring over the execution log: logged inputs and outputs are aggregated per deployable, time window
+and variable into mergeable column sketches (see artifacts.sketches), stored in monitoring_window.
+
+Monitor.update only reads log rows past a watermark (the last aggregated log id), so it can run
+periodically at a cost proportional to the new traffic. Each run stops at a settled log id, the max log id
+observed config.log_settle_seconds before (see DataBase.get_settled_log_id): every log row whose insert
+commits within log_settle_seconds of getting its id is aggregated exactly once, later commits below the
+watermark are skipped. With a settle time, new rows are aggregated one to two settle times after insert. Windows are compared against the training
+data of the deployable with PSI (population stability index) and KS (max CDF distance).
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from mlopslite.artifacts.profiling import non_null_values
+from mlopslite.artifacts.sketches import ColumnSketch
+from mlopslite.registry.registry import (LOG_INPUT_PREFIX, LOG_OUTPUT_PREFIX, Registry,
+                                         dataset_metadata_from_registry)
+
+# numpy dtype of the values a sketch of the converted dtype is built from (as in profiling)
+SKETCH_VALUE_DTYPES = {"int": np.int64, "float": np.float64, "bool": bool, "str": object}
+# share of empty bins in PSI, avoids log(0)
+PSI_EPSILON = 1e-4
+QUANTILE_GRID = np.linspace(0, 1, 101)
+
+
+class Monitor:
+
+    """
+    Window aggregates of the execution log in config.log_format, with window_seconds wide windows
+    (config.monitoring_window_seconds by default). Monitors with different window sizes keep separate
+    aggregates and watermarks.
+    """
+
+    def __init__(self, registry: Registry, window_seconds: int | None = None, batch_logs: int | None = None) -> None:
+        self.registry = registry
+        self.db = registry.db
+        self.source = registry.config.log_format
+        self.window_seconds = registry.config.monitoring_window_seconds if window_seconds is None else window_seconds
+        self.batch_logs = registry.config.monitoring_batch_logs if batch_logs is None else batch_logs
+
+        # deployable id -> {variable: converted dtype} / {variable: training ColumnSketch}
+        self._variables = {}
+        self._baselines = {}
+
+    def update(self) -> dict:
+
+        """
+        Aggregate log rows past the watermark into the stored windows, batch_logs log ids at a time.
+        Each batch is merged into the windows and moves the watermark in one transaction.
+        """
+
+        stats = {"logs": 0, "rows": 0, "windows": 0}
+        previous = self.db.get_monitoring_watermark(self.source, self.window_seconds)
+        last = self.db.get_settled_log_id(
+            self.source, self.source, self.window_seconds, self.registry.config.log_settle_seconds
+        )
+
+        watermark = 0 if previous is None else previous
+        while last is not None and watermark < last:
+            until = min(watermark + self.batch_logs, last)
+            frame = self.registry.read_execution_log(log_format=self.source, after_id=watermark, until_id=until)
+
+            inserts, updates = self._merge_stored(self.aggregate(frame))
+            self.db.save_monitoring_windows(inserts, updates, self.source, self.window_seconds, until, previous)
+
+            stats["logs"] += frame["log_id"].nunique()
+            stats["rows"] += len(frame)
+            stats["windows"] += len(inserts) + len(updates)
+            previous = watermark = until
+
+        stats["last_log_id"] = watermark
+        return stats
+
+    def aggregate(self, frame: pd.DataFrame) -> dict[tuple, dict]:
+
+        """
+        Window aggregates of an execution log frame (see Registry.read_execution_log),
+        keyed by (deployable_id, window_start, variable).
+        """
+
+        out = {}
+        if len(frame) == 0:
+            return out
+
+        frame = frame.assign(window_start=pd.to_datetime(frame["request_time"]).dt.floor(f"{self.window_seconds}s"))
+        variables = self.deployable_variables([int(i) for i in frame["deployable_id"].unique()])
+        output_columns = [i for i in frame.columns if i == LOG_OUTPUT_PREFIX.rstrip(":") or i.startswith(LOG_OUTPUT_PREFIX)]
+
+        for (deployable_id, window_start), group in frame.groupby(["deployable_id", "window_start"]):
+
+            columns = {f"{LOG_INPUT_PREFIX}{k}": v for k, v in variables[int(deployable_id)].items()}
+            # frames of several deployables have the output columns of all of them
+            columns.update({i: "float" for i in output_columns if group[i].notna().any()})
+
+            for variable, converted_dtype in columns.items():
+                if variable in group.columns:
+                    values, null_count = sketch_values(group[variable], converted_dtype)
+                else:
+                    values, null_count = np.empty(0, dtype=SKETCH_VALUE_DTYPES[converted_dtype]), len(group)
+
+                sketch = ColumnSketch(converted_dtype)
+                sketch.update(values)
+                out[(int(deployable_id), window_start.to_pydatetime(), variable)] = {
+                    "converted_dtype": converted_dtype,
+                    "row_count": len(group),
+                    "null_count": null_count,
+                    "sketch": sketch
+                }
+
+        return out
+
+    def _merge_stored(self, windows: dict[tuple, dict]) -> tuple[list[dict], list[dict]]:
+
+        # windows already stored (e.g. the current hour, seen by the previous update) are merged
+        if len(windows) == 0:
+            return [], []
+
+        stored = self.db.select_monitoring_windows(
+            self.window_seconds,
+            deployable_id=list({i[0] for i in windows}),
+            window_starts=list({i[1] for i in windows})
+        )
+        stored = {(i["deployable_id"], i["window_start"], i["variable"]): i for i in stored}
+
+        inserts, updates = [], []
+        for key, window in windows.items():
+            if key in stored:
+                row = stored[key]
+                updates.append({
+                    "id": row["id"],
+                    "row_count": row["row_count"] + window["row_count"],
+                    "null_count": row["null_count"] + window["null_count"],
+                    "sketch": ColumnSketch.from_bytes(row["sketch"]).merge(window["sketch"]).to_bytes()
+                })
+            else:
+                deployable_id, window_start, variable = key
+                inserts.append({
+                    "deployable_id": deployable_id,
+                    "window_seconds": self.window_seconds,
+                    "window_start": window_start,
+                    "variable": variable,
+                    **window,
+                    "sketch": window["sketch"].to_bytes()
+                })
+
+        return inserts, updates
+
+    def deployable_variables(self, ids: list[int]) -> dict[int, dict]:
+
+        missing = [i for i in ids if i not in self._variables]
+        if len(missing) > 0:
+            for i in self.db.select_deployable_variables(missing):
+                self._variables[i["id"]] = i
+        return {i: self._variables[i]["variables"] for i in ids}
+
+    def baseline(self, deployable_id: int) -> dict[str, ColumnSketch]:
+
+        """
+        Sketches of the deployable inputs in its training dataset: the stored column sketches
+        (datasets bound with sketch=True), otherwise built from the dataset columns once.
+        """
+
+        if deployable_id in self._baselines:
+            return self._baselines[deployable_id]
+
+        self.deployable_variables([deployable_id])
+        item = self._variables[deployable_id]
+        variables = item["variables"]
+
+        metadata = dataset_metadata_from_registry(self.db.select_dataset_metadata_by_id(item["dataset_registry_id"]))
+        sketches = {i.column_name: i.sketch for i in metadata.column_metadata if i.column_name in variables}
+
+        missing = [k for k, v in sketches.items() if v is None]
+        if len(missing) > 0:
+            data = self.registry.pull_dataset_from_registry(item["dataset_registry_id"], lazy=True).load(columns=missing)
+            for name in missing:
+                sketches[name] = ColumnSketch(variables[name])
+                sketches[name].update(non_null_values(data[name])[0])
+
+        self._baselines[deployable_id] = sketches
+        return sketches
+
+    def windows(
+            self,
+            deployable_id: int | str | None = None,
+            start: datetime | None = None,
+            end: datetime | None = None
+    ) -> pd.DataFrame:
+
+        """
+        Stored windows, one row per deployable, window and variable: counts, null rate, distinct count
+        and quantiles (numeric variables, e.g. the prediction distribution of output:<class>).
+        """
+
+        if deployable_id is not None:
+            deployable_id = self.registry.resolve_deployable_id(deployable_id)
+
+        rows = []
+        for i in self.db.select_monitoring_windows(self.window_seconds, deployable_id=deployable_id, start=start, end=end):
+            sketch = ColumnSketch.from_bytes(i["sketch"])
+            p05, p50, p95 = sketch.quantiles([0.05, 0.5, 0.95]) if sketch.kll is not None else [np.nan] * 3
+            rows.append({
+                "deployable_id": i["deployable_id"],
+                "window_start": i["window_start"],
+                "variable": i["variable"],
+                "converted_dtype": i["converted_dtype"],
+                "row_count": i["row_count"],
+                "null_rate": i["null_count"] / i["row_count"],
+                "distinct_count": sketch.distinct_count(),
+                "p05": p05,
+                "p50": p50,
+                "p95": p95
+            })
+
+        return pd.DataFrame(rows, columns=WINDOW_COLUMNS)
+
+    def drift(
+            self,
+            deployable_id: int | str,
+            start: datetime | None = None,
+            end: datetime | None = None,
+            bins: int = 10,
+            combine: bool = False
+    ) -> pd.DataFrame:
+
+        """
+        PSI and KS of each window and input variable against the training data.
+        Numeric variables are binned at the training deciles (bins quantile bins),
+        categorical ones by the bins most frequent training values plus the rest, KS is numeric only.
+        combine=True merges the windows between start and end into one before comparing.
+        """
+
+        deployable_id = self.registry.resolve_deployable_id(deployable_id)
+        baseline = self.baseline(deployable_id)
+
+        windows = [
+            i for i in self.db.select_monitoring_windows(self.window_seconds, deployable_id=deployable_id, start=start, end=end)
+            if i["variable"].startswith(LOG_INPUT_PREFIX)
+        ]
+        for i in windows:
+            i["sketch"] = ColumnSketch.from_bytes(i["sketch"])
+
+        if combine:
+            windows = combine_windows(windows)
+
+        rows = []
+        for i in windows:
+            reference = baseline[i["variable"][len(LOG_INPUT_PREFIX):]]
+            rows.append({
+                "deployable_id": deployable_id,
+                "window_start": i["window_start"],
+                "variable": i["variable"],
+                "row_count": i["row_count"],
+                "null_rate": i["null_count"] / i["row_count"],
+                "psi": population_stability_index(reference, i["sketch"], bins=bins),
+                "ks": ks_statistic(reference, i["sketch"])
+            })
+
+        return pd.DataFrame(rows, columns=DRIFT_COLUMNS)
+
+
+WINDOW_COLUMNS = [
+    "deployable_id", "window_start", "variable", "converted_dtype", "row_count", "null_rate", "distinct_count", "p05", "p50", "p95"
+]
+DRIFT_COLUMNS = ["deployable_id", "window_start", "variable", "row_count", "null_rate", "psi", "ks"]
+
+
+### Function block
+
+def sketch_values(column: pd.Series, converted_dtype: str) -> tuple[np.ndarray, int]:
+
+    """
+    Non-null values and null count of a logged column, as the dtype training columns are sketched with
+    (the normalized log stores inputs as strings, compact log columns with nulls come back as float/object).
+    """
+
+    if converted_dtype in ["int", "float"]:
+        column = pd.to_numeric(column, errors="coerce")
+    elif converted_dtype == "bool" and column.dtype == object:
+        column = column.map({"True": True, "False": False, True: True, False: False})
+
+    values, null_count = non_null_values(column)
+    return values.astype(SKETCH_VALUE_DTYPES[converted_dtype]), null_count
+
+
+def combine_windows(windows: list[dict]) -> list[dict]:
+
+    combined = {}
+    for i in windows:
+        if i["variable"] not in combined:
+            combined[i["variable"]] = {**i, "sketch": ColumnSketch(i["converted_dtype"]).merge(i["sketch"])}
+        else:
+            out = combined[i["variable"]]
+            out["row_count"] += i["row_count"]
+            out["null_count"] += i["null_count"]
+            out["sketch"].merge(i["sketch"])
+
+    return list(combined.values())
+
+
+def bin_shares(reference: ColumnSketch, sketch: ColumnSketch, bins: int = 10) -> tuple[np.ndarray, np.ndarray]:
+
+    """
+    Shares of reference and sketch values in bins defined by the reference:
+    quantile bins for numeric sketches, most frequent values + the rest otherwise.
+    """
+
+    if reference.kll is not None:
+        edges = np.unique(reference.quantiles(np.linspace(0, 1, bins + 1)[1:-1]))
+        expected = np.diff(np.concatenate([[0.0], reference.cdf(edges), [1.0]]))
+        actual = np.diff(np.concatenate([[0.0], sketch.cdf(edges), [1.0]]))
+        return expected, actual
+
+    categories = [k for k, _ in reference.top_values(bins)]
+    expected = np.array([reference.frequent.counters.get(k, 0) for k in categories]) / reference.frequent.n
+    actual = np.array([sketch.frequent.counters.get(k, 0) for k in categories]) / sketch.frequent.n
+    return np.append(expected, 1 - expected.sum()), np.append(actual, 1 - actual.sum())
+
+
+def population_stability_index(reference: ColumnSketch, sketch: ColumnSketch, bins: int = 10) -> float:
+
+    # sum over bins of (actual - expected) * ln(actual / expected), NaN without values to compare
+    if is_empty(reference) or is_empty(sketch):
+        return np.nan
+
+    expected, actual = bin_shares(reference, sketch, bins=bins)
+    expected = np.clip(expected, PSI_EPSILON, None)
+    actual = np.clip(actual, PSI_EPSILON, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def ks_statistic(reference: ColumnSketch, sketch: ColumnSketch) -> float:
+
+    # max distance of the two CDFs, evaluated at the quantiles of both
+    if reference.kll is None or is_empty(reference) or is_empty(sketch):
+        return np.nan
+
+    grid = np.unique(np.concatenate([reference.quantiles(QUANTILE_GRID), sketch.quantiles(QUANTILE_GRID)]))
+    return float(np.max(np.abs(reference.cdf(grid) - sketch.cdf(grid))))
+
+
+def is_empty(sketch: ColumnSketch) -> bool:
+    return (sketch.kll.n if sketch.kll is not None else sketch.frequent.n) == 0
@@ -1,73 +1,204 @@
+import os
+import tempfile
+from dataclasses import dataclass
+from numbers import Integral
+from typing import Callable, Iterable
+
+import numpy as np
 import pandas as pd
 
-from mlopslite.artifacts.metadata import DatasetMetadata
-from mlopslite.artifacts.dataset import Dataset
-from mlopslite.artifacts.deployable import Deployable, restore_deployable
+from mlopslite.artifacts.metadata import ColumnMetadata, DatasetMetadata
+from mlopslite.artifacts.dataset import Dataset, LazyDataset
+from mlopslite.artifacts.ingest import ingest_chunks
+from mlopslite.artifacts.sketches import ColumnSketch
+from mlopslite.artifacts.storage import BINARY_FORMATS, DATASET_FORMATS, decode_dataset, encode_dataset
+from mlopslite.artifacts.deployable import Deployable, PredictionBatch
 from mlopslite.registry import datamodel
+from mlopslite.registry.cache import DeployableCache
+from mlopslite.registry.columncache import DatasetColumnCache
 from mlopslite.registry.db import DataBase
+from mlopslite.registry.filesystem import FS_TYPES, FileSystem
+from mlopslite.registry.logwriter import LogWriter
+
 from mlopslite.registry.registryconfig import RegistryConfig
 from datetime import datetime
 
+LOG_FORMATS = ["normalized", "compact"]
+LOG_PAYLOAD_FORMAT = "npz"
+LOG_INPUT_PREFIX = "input:"
+LOG_OUTPUT_PREFIX = "output:"
+LOG_COLUMNS = ['log_id', 'deployable_id', 'request_time', 'row_index', 'reference_id']
+# reference ids per query of read_predictions, within the bound parameter limits of every backend
+REFERENCE_LOOKUP_CHUNK = 1000
+
 
 class Registry:
     def __init__(self, config: RegistryConfig):
         self.db = DataBase(config=config)
         self.config = config
 
-    # db: DataBase
-    # fs: FileSystem
-    # config: RegistryConfig
+        self.deployable_cache = DeployableCache(
+            max_items=config.deployable_cache_items,
+            max_bytes=config.deployable_cache_bytes,
+            cache_dir=config.deployable_cache_dir
+        )
 
-    def pull_dataset_from_registry(self, id: int) -> Dataset:
-        ds = self.db.select_dataset_by_id(id)
+        self._deployable_ids = {}
 
-        dataset = ds["dataset"]["data"]
+        if config.fs_type not in FS_TYPES:
+            raise ValueError(f"Invalid fs_type {config.fs_type}, expected one of {FS_TYPES}")
+        self.fs = FileSystem(root=config.fs_root) if config.fs_type == "local" else None
+        self._dataset_cache = None
 
-        dtype_map = {i["column_name"]: i["original_dtype"] for i in ds["columns"]}
-        dataset = pd.DataFrame(dataset).astype(dtype=dtype_map)
+        self.log_writer = None
+        if config.log_async:
+            self.log_writer = LogWriter(
+                write=self.write_execution_logs,
+                batch_size=config.log_batch_size,
+                flush_interval=config.log_flush_interval,
+                queue_size=config.log_queue_size,
+                backpressure=config.log_backpressure,
+                spill_dir=config.log_spill_dir,
+                size=len
+            )
 
-        metadata = DatasetMetadata.create(
-            data = dataset, 
-            name = ds["dataset"]["name"], 
-            version = ds["dataset"]["version"], 
-            id = ds['dataset']['id'],
-            description=ds["dataset"]["description"]
-        )
+    def pull_dataset_from_registry(self, id: int, lazy: bool = False, mmap: bool = False) -> Dataset:
+
+        """
+        Dataset with metadata from the stored column profiles. 
+        lazy=True returns a LazyDataset, that fetches the data on first access.
+        mmap=True reads the data from memory mapped column files in config.dataset_cache_dir,
+        spilled there on first pull (see registry.columncache).
+        """
+
+        ds = self.db.select_dataset_metadata_by_id(id)
+        metadata = dataset_metadata_from_registry(ds)
+
+        if mmap:
+            hash = ds["dataset"]["hash"]
+            loader = lambda columns: self.load_dataset_mmap(metadata, hash, columns)
+        else:
+            loader = lambda columns: self.load_dataset_data(metadata, columns)
+
+        dataset = LazyDataset(metadata=metadata, loader=loader)
+
+        return dataset if lazy else Dataset(data=dataset.data, metadata=metadata)
+
+    def load_dataset_data(self, metadata: DatasetMetadata, columns: list[str] | None = None) -> pd.DataFrame:
+
+        ds = self.db.select_dataset_data_by_id(metadata.id)
+        return decode_registry_dataset(ds, metadata, columns=columns, fs=self._get_fs)
+
+    @property
+    def dataset_cache(self) -> DatasetColumnCache:
+        if self._dataset_cache is None:
+            self._dataset_cache = DatasetColumnCache(root=self.config.dataset_cache_dir)
+        return self._dataset_cache
+
+    def load_dataset_mmap(self, metadata: DatasetMetadata, hash: str, columns: list[str] | None = None) -> pd.DataFrame:
+
+        self._spill_dataset(metadata, hash)
+        dataset = self.dataset_cache.read_frame(hash, columns=columns)
+
+        # cast only what differs, astype on an unchanged column would copy it out of the map
+        dtype_map = {
+            i.column_name: i.original_dtype for i in metadata.column_metadata 
+            if i.column_name in dataset.columns and str(dataset[i.column_name].dtype) != i.original_dtype
+        }
+        return dataset.astype(dtype=dtype_map) if len(dtype_map) > 0 else dataset
+
+    def pull_dataset_arrays(self, id: int, columns: list[str] | None = None) -> dict[str, np.ndarray]:
+
+        """
+        Columns of a dataset as read-only numpy arrays, memory mapped from config.dataset_cache_dir.
+        """
+
+        ds = self.db.select_dataset_metadata_by_id(id)
+        hash = ds["dataset"]["hash"]
+
+        self._spill_dataset(dataset_metadata_from_registry(ds), hash)
+        return self.dataset_cache.read_arrays(hash, columns=columns)
 
-        return Dataset(data=dataset, metadata=metadata)
+    def _spill_dataset(self, metadata: DatasetMetadata, hash: str) -> None:
+        if hash not in self.dataset_cache:
+            self.dataset_cache.write(hash, self.load_dataset_data(metadata))
 
     def push_dataset_to_registry(self, dataset: Dataset) -> dict:
         """
         Add new Dataset to the registry
         """
 
-        hash = dataset.get_data_hash()        
-        registry_ref = self.db.get_dataset_reference_by_hash(hash)
-        if registry_ref is not None:
-            print("Dataset already exists, returning referenced Dataset instead of pushing!")
-            return registry_ref
+        data_format = self.config.dataset_format
+        if data_format not in DATASET_FORMATS:
+            raise ValueError(f"Invalid dataset format {data_format}, expected one of {DATASET_FORMATS}")
+
+        hash = dataset.get_data_hash(mode=self.config.dataset_hash)
 
-        # Dataset table
-
-        dr = datamodel.DatasetRegistry(
-            name=dataset.metadata.name,
-            version=self.db.get_dataset_version_increment(dataset.metadata.name),
-            description=dataset.metadata.description,
-            data=dataset.convert_to_dict(),
-            size_rows=dataset.metadata.size_rows,
-            size_cols=dataset.metadata.size_cols,
-            hash=hash,
-            created_at=datetime.utcnow()
+        return push_registry_dataset(
+            dataset.metadata, 
+            hash, 
+            data_format, 
+            encode=lambda: encode_registry_dataset(dataset, data_format, fs=self.fs),
+            get_reference_by_hash=self.db.get_dataset_reference_by_hash,
+            insert_dataset=self.db.insert_dataset,
+            discard_blobs=self._discard_blobs
         )
+    
+    def push_dataset_stream(
+            self, 
+            chunks: Iterable[pd.DataFrame], 
+            name: str, 
+            description: str = "", 
+            exact_unique: bool = False,
+            sketch: bool = False
+    ) -> dict:
 
-        for i in dataset.metadata.column_metadata:
-            drc = datamodel.DatasetRegistryColumns(**i.__dict__, data = dr)
-            dr.columns.append(drc)
+        """
+        Add a Dataset from DataFrame chunks, without holding it in memory (see artifacts.ingest).
+        Chunks are encoded into a spool file while profiled and hashed, the file is moved into 
+        the local filesystem (fs_type='local') or read into the registry row only if the dataset is new.
+        """
 
-        registry_ref = self.db.insert_dataset_returning_reference(dr)
+        data_format = self.config.dataset_format
+        if data_format not in BINARY_FORMATS:
+            raise ValueError(f"Streaming ingestion requires a binary dataset format, expected one of {BINARY_FORMATS}")
+        if self.config.dataset_hash != "chunked":
+            raise ValueError("Streaming ingestion requires dataset_hash='chunked'")
+
+        # spooled next to the blobs, so storing it is a rename
+        spool = tempfile.NamedTemporaryFile(dir=self.fs.root if self.fs is not None else None, prefix=".tmp-ingest-", delete=False)
+
+        try:
+            with spool:
+                metadata, hash = ingest_chunks(
+                    chunks, 
+                    name, 
+                    description=description, 
+                    exact_unique=exact_unique, 
+                    sink=spool, 
+                    data_format=data_format, 
+                    sketch=sketch
+                )
+
+            return push_registry_dataset(
+                metadata, 
+                hash, 
+                data_format, 
+                encode=lambda: self._store_spool(spool.name),
+                get_reference_by_hash=self.db.get_dataset_reference_by_hash,
+                insert_dataset=self.db.insert_dataset,
+                discard_blobs=self._discard_blobs
+            )
+        finally:
+            if os.path.exists(spool.name):
+                os.remove(spool.name)
+
+    def _store_spool(self, path: str) -> dict:
+        if self.fs is not None:
+            return {"data": None, "data_blob": None, "storage_ref": self.fs.put_file(path)}
+        with open(path, "rb") as f:
+            return {"data": None, "data_blob": f.read(), "storage_ref": None}
 
-        return registry_ref
-    
     def push_deployable_to_registry(self, deployable: Deployable) -> dict:
 
         hash = deployable.get_data_hash()
@@ -75,81 +206,468 @@ class Registry:
         if registry_ref is not None:
             print("Model already exists, returning referenced model instead of pushing!")
             return registry_ref
+
+        blob = deployable.serialize_deployable()
+        storage_ref = None
+        if self.fs is not None:
+            storage_ref, blob = self.fs.put(blob), None
         
-        mr = datamodel.DeployableRegistry(
-            dataset_registry_id = deployable.metadata.dataset_registry_id,
-            name=deployable.metadata.name, 
-            version=self.db.get_deployable_version_increment(
+        try:
+            version = self.db.get_deployable_version_increment(
                 name = deployable.metadata.name, 
                 dataset_id=deployable.metadata.dataset_registry_id, 
                 target = deployable.metadata.target
-            ),
-            target = deployable.metadata.target, 
-            target_mapping=deployable.metadata.target_mapping, 
-            description=deployable.metadata.description,
-            estimator_type=deployable.metadata.estimator_type, 
-            estimator_class=deployable.metadata.estimator_class,
-            deployable=deployable.serialize_deployable(),
-            variables = deployable.metadata.variables,
-            hash=hash,
-            created_at=datetime.utcnow()
-        )
+            )
+            mr = deployable_registry_model(deployable, version=version, hash=hash, blob=blob, storage_ref=storage_ref)
 
-        registry_ref = self.db.insert_deployable_returning_reference(mr=mr)
+            registry_ref = self.db.insert_deployable_returning_reference(mr=mr)
+        except BaseException:
+            self._discard_blobs([storage_ref])
+            raise
 
         return registry_ref
+
+    def _discard_blobs(self, storage_refs: list[str | None]) -> None:
+        discard_registry_blobs(storage_refs, self.fs, self.db.is_blob_referenced)
     
     def pull_deployable_from_registry(self, id: int) -> Deployable:
+
+        return self.deployable_cache.get(id, load=self.select_deployable_item, get_hash=self.db.get_deployable_hash)
+
+    def select_deployable_item(self, id: int) -> dict:
+
         registry_item = self.db.select_deployable_by_id(id)
-        return restore_deployable(registry_item)
+        if registry_item["storage_ref"] is not None:
+            registry_item["deployable"] = self._get_fs().get(registry_item["storage_ref"], verify=True)
+
+        return registry_item
+
+    def _get_fs(self) -> FileSystem:
+        # rows stored in the filesystem can still be read by a registry configured with fs_type='db'
+        return self.fs if self.fs is not None else FileSystem(root=self.config.fs_root)
+
+    def resolve_deployable_id(self, reference: int | str) -> int:
+
+        """
+        Registry id from an id, 'name@version' or 'name' (most recently registered).
+        """
+
+        return resolve_deployable_reference(reference, self._deployable_ids, self.db.get_deployable_id_by_name)
     
-    def log_execution(self, deployable_id: int, input: dict, output: dict) -> None:
+    def log_execution(
+            self, 
+            deployable_id: int, 
+            input: list[dict] | pd.DataFrame, 
+            output: list[dict] | PredictionBatch
+    ) -> None:
 
         """
-        Map deployable results to ORM
+        Log deployable inputs + results. With config.log_async the entry is handed to the background 
+        writer and mapped to rows there, so input/output must not be modified after the call.
         """
         
         #TODO some additional validation, sanity check, logging etc goes here before sending to DB
 
-        root_entry = datamodel.ModelExecutionLog(
+        entry = ExecutionLogEntry(
             deployable_id=deployable_id, 
-            request_time=datetime.utcnow(),
-            request_size=len(input)
+            request_time=datetime.utcnow(), 
+            input=input, 
+            output=output
         )
 
-        for item in zip(input, output):
+        if self.log_writer is not None:
+            self.log_writer.submit(entry)
+        else:
+            self.write_execution_logs([entry])
+
+    def write_execution_logs(self, entries: list["ExecutionLogEntry"]) -> None:
+
+        if self.config.log_format == "compact":
+            self.db.insert_execution_batches([i.to_batch_row() for i in entries])
+        elif self.config.log_format == "normalized":
+            self.db.insert_execution_logs([i.to_rows() for i in entries])
+        else:
+            raise ValueError(f"Invalid log format {self.config.log_format}, expected one of {LOG_FORMATS}")
+
+    def read_execution_log(
+            self, 
+            deployable_id: int | None = None, 
+            start: datetime | None = None, 
+            end: datetime | None = None,
+            log_format: str | None = None,
+            after_id: int | None = None,
+            until_id: int | None = None,
+            reference_ids: list[str] | None = None
+    ) -> pd.DataFrame:
 
-            execution_items_link = datamodel.ExecutionItems(
-                    reference_id=item[1]['reference_id'],
-                    execution_log_item = root_entry
-                )
+        """
+        Execution log as a DataFrame, one row per prediction:
+        log_id, deployable_id, request_time, row_index, reference_id, input:<variable>..., output:<class>...
+        Inputs of the normalized layout are returned as stored (strings).
+        after_id / until_id select a range of log ids (exclusive / inclusive), reference_ids the rows with these 
+        reference ids (one IN list, see read_predictions for any number of them).
+        """
 
-            root_entry.execution_log.append(execution_items_link)
-            
-            for k,v in item[0].items():
+        log_format = self.config.log_format if log_format is None else log_format
+        filters = dict(start=start, end=end, after_id=after_id, until_id=until_id, reference_ids=reference_ids)
 
-                if k not in ['reference_id']:
+        if log_format == "compact":
+            frame = read_compact_log(self.db.select_execution_batches(deployable_id, **filters))
+            if reference_ids is not None:
+                # batches are decoded whole, only the requested rows are kept
+                frame = frame[frame['reference_id'].isin(reference_ids)].reset_index(drop=True)
+            return frame
+        if log_format == "normalized":
+            return read_normalized_log(self.db.select_execution_log_items(deployable_id, **filters))
 
-                    request = datamodel.RequestItems(
-                        varname=k,
-                        in_value=v, 
-                        data=execution_items_link
-                    )
+        raise ValueError(f"Invalid log format {log_format}, expected one of {LOG_FORMATS}")
 
-                    execution_items_link.request_items.append(request)
+    def read_predictions(self, reference_ids: Iterable[str], log_format: str | None = None) -> pd.DataFrame:
 
-            for k,v in item[1]['results'].items():
+        """
+        Logged predictions by reference id, with the name and version of the deployable that made them: 
+        the columns of read_execution_log plus name, version, in log order. Ids are looked up 
+        REFERENCE_LOOKUP_CHUNK at a time through the reference_id indexes, ids logged more than once
+        return a row per prediction.
+        """
 
-                response = datamodel.ResponseItems(
-                    classname=str(k),
-                    out_value=v,
-                    data = execution_items_link
-                )
+        reference_ids = list(dict.fromkeys(str(i) for i in reference_ids))
+        frames = [
+            self.read_execution_log(log_format=log_format, reference_ids=reference_ids[i:i + REFERENCE_LOOKUP_CHUNK])
+            for i in range(0, len(reference_ids), REFERENCE_LOOKUP_CHUNK)
+        ]
+        frames = [i for i in frames if len(i) > 0]
+
+        if len(frames) == 0:
+            return pd.DataFrame(columns=LOG_COLUMNS[:2] + ['name', 'version'] + LOG_COLUMNS[2:])
+
+        out = pd.concat(frames, ignore_index=True).sort_values(['log_id', 'row_index'], kind='stable', ignore_index=True)
+
+        versions = pd.DataFrame(
+            self.db.select_deployable_versions([int(i) for i in out['deployable_id'].unique()])
+        ).set_index('id')
+        out.insert(2, 'name', out['deployable_id'].map(versions['name']))
+        out.insert(3, 'version', out['deployable_id'].map(versions['version']))
+        return out
+
+    def close(self) -> None:
+        # drains pending logs
+        if self.log_writer is not None:
+            self.log_writer.close()
+
+
+def dataset_registry_rows(metadata: DatasetMetadata, hash: str, data_format: str) -> tuple[dict, list[dict]]:
+
+    # dataset row (without payload columns) and column metadata rows, see DataBase.insert_dataset
+    row = dict(
+        name=metadata.name,
+        description=metadata.description,
+        size_rows=metadata.size_rows,
+        size_cols=metadata.size_cols,
+        hash=hash,
+        created_at=datetime.utcnow(),
+        data_format=data_format
+    )
+    columns = [
+        {**i.__dict__, "sketch": i.sketch.to_bytes() if i.sketch is not None else None} 
+        for i in metadata.column_metadata
+    ]
+
+    return row, columns
+
+
+def encode_registry_dataset(dataset: Dataset, data_format: str, fs: FileSystem | None = None) -> dict:
+
+    # payload columns of the dataset row, only built once the dataset is known to be new
+    if data_format == "json":
+        return {"data": dataset.convert_to_dict(), "data_blob": None, "storage_ref": None}
+
+    data_blob = encode_dataset(dataset.data, format=data_format)
+    if fs is not None:
+        return {"data": None, "data_blob": None, "storage_ref": fs.put(data_blob)}
+
+    return {"data": None, "data_blob": data_blob, "storage_ref": None}
+
+
+def push_registry_dataset(
+        metadata: DatasetMetadata,
+        hash: str,
+        data_format: str,
+        encode: Callable[[], dict],
+        get_reference_by_hash: Callable[[str], dict | None],
+        insert_dataset: Callable[..., tuple[dict, bool]],
+        discard_blobs: Callable[[list[str | None]], None]
+) -> dict:
+
+    """
+    Dataset push shared by Registry and AsyncRegistry, with the DB calls passed in. The hash is looked up first, 
+    encode() builds (and stores) the payload columns outside of the insert transaction, then the row is inserted. 
+    A blob stored for a row that is not inserted (error, or the same hash pushed concurrently) is discarded.
+    """
+
+    # checked upfront, so an existing dataset is not encoded
+    registry_ref = get_reference_by_hash(hash)
+    if registry_ref is None:
+        row, columns = dataset_registry_rows(metadata, hash, data_format)
+        payload = encode()
+        try:
+            registry_ref, inserted = insert_dataset(row, columns, payload=payload)
+        except BaseException:
+            discard_blobs([payload["storage_ref"]])
+            raise
+        if inserted:
+            return registry_ref
+        discard_blobs([payload["storage_ref"]])
+
+    print("Dataset already exists, returning referenced Dataset instead of pushing!")
+    return registry_ref
+
+
+def discard_registry_blobs(
+        storage_refs: list[str | None], 
+        fs: FileSystem | None, 
+        is_blob_referenced: Callable[[str], bool]
+) -> None:
+
+    # blobs stored for a row that was not inserted, unless another row uses the same content
+    for i in storage_refs:
+        if i is not None and not is_blob_referenced(i):
+            fs.delete(i)
+
+
+def resolve_deployable_reference(
+        reference: int | str, 
+        ids: dict[tuple[str, int], int], 
+        get_id_by_name: Callable[..., int | None]
+) -> int:
+
+    """
+    Registry id from an id, 'name@version' or 'name' (most recently registered). Pinned versions never change, 
+    their ids are cached in ids; get_id_by_name is the DB lookup (DataBase.get_deployable_id_by_name).
+    """
+
+    if isinstance(reference, Integral):
+        return int(reference)
+
+    name, _, version = reference.partition("@")
+    key = (name, int(version)) if version else None
+
+    if key in ids:
+        return ids[key]
+
+    id = get_id_by_name(name, version=int(version) if version else None)
+    if id is None:
+        raise ValueError(f"Deployable {reference} not found in the registry")
+
+    if key is not None:
+        ids[key] = id
+
+    return id
+
+
+def decode_registry_dataset(
+        ds: dict, 
+        metadata: DatasetMetadata, 
+        columns: list[str] | None = None, 
+        fs: Callable[[], FileSystem] | None = None
+) -> pd.DataFrame:
+
+    # ds as returned by DataBase.select_dataset_data_by_id, fs() returns the FileSystem of storage_ref rows
+    if ds["data_format"] == "json":
+        # legacy rows, dict-of-lists
+        dataset = pd.DataFrame(ds["data"])
+        if columns is not None:
+            dataset = dataset[columns]
+    elif ds["storage_ref"] is not None:
+        # decoded from the mapped pages: parquet/arrow read the mapping in place, npy/npz copy one frame
+        # at a time (np.load reads through io.BytesIO), never the whole blob
+        with fs().open_mmap(ds["storage_ref"]) as blob:
+            dataset = decode_dataset(blob, format=ds["data_format"], columns=columns)
+    else:
+        dataset = decode_dataset(ds["data_blob"], format=ds["data_format"], columns=columns)
+
+    dtype_map = {i.column_name: i.original_dtype for i in metadata.column_metadata if i.column_name in dataset.columns}
+    return dataset.astype(dtype=dtype_map)
+
+
+def deployable_registry_model(
+        deployable: Deployable, 
+        version: int, 
+        hash: str, 
+        blob: bytes | None, 
+        storage_ref: str | None = None
+) -> datamodel.DeployableRegistry:
+
+    return datamodel.DeployableRegistry(
+        dataset_registry_id = deployable.metadata.dataset_registry_id,
+        name=deployable.metadata.name, 
+        version=version,
+        target = deployable.metadata.target, 
+        target_mapping=deployable.metadata.target_mapping, 
+        description=deployable.metadata.description,
+        estimator_type=deployable.metadata.estimator_type, 
+        estimator_class=deployable.metadata.estimator_class,
+        deployable=blob,
+        variables = deployable.metadata.variables,
+        hash=hash,
+        created_at=datetime.utcnow(),
+        storage_ref=storage_ref
+    )
+
+
+def dataset_metadata_from_registry(ds: dict) -> DatasetMetadata:
+
+    # ds as returned by DataBase.select_dataset_metadata_by_id
+    return DatasetMetadata(
+        name=ds["dataset"]["name"], 
+        version=ds["dataset"]["version"], 
+        id=ds["dataset"]["id"], 
+        description=ds["dataset"]["description"], 
+        size_cols=ds["dataset"]["size_cols"], 
+        size_rows=ds["dataset"]["size_rows"], 
+        column_metadata=[
+            ColumnMetadata(**{
+                k: (ColumnSketch.from_bytes(v) if k == "sketch" and v is not None else v) 
+                for k, v in i.items() if k in ColumnMetadata.__annotations__.keys()
+            }) 
+            for i in ds["columns"]
+        ]
+    )
+
+
+@dataclass
+class ExecutionLogEntry:
+
+    deployable_id: int
+    request_time: datetime
+    input: list[dict] | pd.DataFrame
+    output: list[dict] | PredictionBatch
+
+    def __len__(self) -> int:
+        return len(self.input)
+
+    def to_rows(self) -> dict:
+
+        """
+        Map deployable results to execution log rows
+        """
+
+        input = self.input.to_dict('records') if isinstance(self.input, pd.DataFrame) else self.input
+        output = self.output.to_records() if isinstance(self.output, PredictionBatch) else self.output
+
+        items = []
+        for request, response in zip(input, output):
+
+            results = response['results']
+            if not isinstance(results, dict):
+                # regressors return a single value
+                results = {None: results}
+
+            items.append({
+                'reference_id': response['reference_id'],
+                'request': [
+                    (k, str(v)) for k, v in request.items() if k != 'reference_id' and not pd.isna(v)
+                ],
+                'response': [
+                    (None if k is None else str(k), float(v)) for k, v in results.items()
+                ]
+            })
+
+        return {
+            'deployable_id': self.deployable_id, 
+            'request_time': self.request_time, 
+            'request_size': len(input), 
+            'items': items
+        }
+
+    def to_batch_row(self) -> dict:
+
+        """
+        Map deployable results to a compact execution log row
+        """
+
+        input = self.input if isinstance(self.input, pd.DataFrame) else pd.DataFrame(self.input)
+        output = self.output if isinstance(self.output, PredictionBatch) else PredictionBatch.from_records(self.output)
+
+        payload = {
+            f"{LOG_INPUT_PREFIX}{k}": log_input_column(v) for k, v in input.items() if k != 'reference_id'
+        }
+        if output.classes is None:
+            payload[LOG_OUTPUT_PREFIX.rstrip(":")] = output.results
+        else:
+            for i, c in enumerate(output.classes):
+                payload[f"{LOG_OUTPUT_PREFIX}{c}"] = output.results[:, i]
+
+        return {
+            'deployable_id': self.deployable_id, 
+            'request_time': self.request_time, 
+            'request_size': len(input), 
+            'payload_format': LOG_PAYLOAD_FORMAT,
+            'payload': encode_dataset(pd.DataFrame(payload), format=LOG_PAYLOAD_FORMAT),
+            'references': [(i, str(r)) for i, r in enumerate(output.reference_id) if r is not None]
+        }
+
+
+### Function block
+
+def log_input_column(column: pd.Series) -> np.ndarray:
+
+    """
+    Raw input column as stored in a compact log payload. Object columns that are not all strings 
+    (e.g. mixed numbers and strings sent to predict) are logged as str per value, as in the normalized layout.
+    """
+
+    values = column.to_numpy()
+    if values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) not in ["string", "empty"]:
+        mask = pd.isna(values)
+        values = np.array([None if null else str(v) for v, null in zip(values, mask)], dtype=object)
+    return values
+
+
+def read_compact_log(batches: list[dict]) -> pd.DataFrame:
+
+    if len(batches) == 0:
+        return pd.DataFrame(columns=LOG_COLUMNS)
+
+    frames = [decode_dataset(i['payload'], format=i['payload_format']) for i in batches]
+    sizes = [len(i) for i in frames]
+    offsets = np.cumsum([0] + sizes[:-1])
+
+    # header columns built once for all batches, not per batch
+    reference_id = np.full(sum(sizes), None, dtype=object)
+    for batch, offset in zip(batches, offsets):
+        for row_index, ref in batch['references']:
+            reference_id[offset + row_index] = ref
+
+    header = pd.DataFrame({
+        'log_id': np.repeat([i['id'] for i in batches], sizes),
+        'deployable_id': np.repeat([i['deployable_id'] for i in batches], sizes),
+        'request_time': np.repeat(np.array([i['request_time'] for i in batches], dtype='datetime64[us]'), sizes),
+        'row_index': np.concatenate([np.arange(i) for i in sizes]),
+        'reference_id': reference_id
+    })
+
+    return pd.concat([header, pd.concat(frames, ignore_index=True)], axis=1)
+
+
+def read_normalized_log(log: dict) -> pd.DataFrame:
 
-                execution_items_link.response_items.append(response)
+    items = pd.DataFrame(log['items'])
+    if len(items) == 0:
+        return pd.DataFrame(columns=LOG_COLUMNS)
 
-        self.db.log_execution(root_entry)
+    # numbered in the query when only some items of each entry are selected
+    if 'row_index' not in items.columns:
+        items['row_index'] = items.groupby('log_id').cumcount()
 
-                
+    request = pd.DataFrame(log['request'], columns=['item_id', 'varname', 'in_value'])
+    request = request.pivot(index='item_id', columns='varname', values='in_value').add_prefix(LOG_INPUT_PREFIX)
 
+    response = pd.DataFrame(log['response'], columns=['item_id', 'classname', 'out_value'])
+    response['classname'] = response['classname'].fillna('')
+    response = response.pivot(index='item_id', columns='classname', values='out_value').add_prefix(LOG_OUTPUT_PREFIX)
+    response = response.rename(columns={LOG_OUTPUT_PREFIX: LOG_OUTPUT_PREFIX.rstrip(":")})
 
+    out = items.join(request, on='item_id').join(response, on='item_id')
+    out.columns.name = None
+    return out[LOG_COLUMNS + [i for i in out.columns if i not in LOG_COLUMNS + ['item_id']]]
@@ -2,13 +2,72 @@ import os
 from dataclasses import dataclass
 
 DEFAULT_SQLITE_URL = "sqlite:///mlops-lite.db"
+DEFAULT_DATASET_FORMAT = "npz"
+DEFAULT_FS_ROOT = "mlops-lite-artifacts"
+DEFAULT_DATASET_CACHE_DIR = "mlops-lite-datasets"
+DEFAULT_LOG_ARCHIVE_DIR = "mlops-lite-log-archive"
 
 
 @dataclass
 class RegistryConfig:
     db_constring: str = DEFAULT_SQLITE_URL
-    # fs_type: str
-    # fs_root: str
+    # connection pool, clients with the same engine settings in one process share the engine (see registry.engine)
+    pool_size: int = 5
+    pool_max_overflow: int = 10
+    pool_pre_ping: bool = False
+    pool_recycle: int = -1  # seconds, -1 keeps connections open indefinitely
+    pool_timeout: float = 30.0
+    share_engine: bool = True
+    # SQLite pragmas, applied to every new connection (None keeps the SQLite default)
+    # WAL + synchronous=NORMAL survives application crashes, a power loss can drop the last commits
+    sqlite_journal_mode: str | None = "WAL"
+    sqlite_synchronous: str | None = "NORMAL"
+    sqlite_mmap_size: int | None = 256 * 1024 * 1024  # bytes
+    sqlite_cache_size: int | None = -64000  # negative: KiB, positive: pages
+    sqlite_busy_timeout: int | None = 5000  # ms
+    # storage format of pushed datasets, one of mlopslite.artifacts.storage.DATASET_FORMATS
+    dataset_format: str = DEFAULT_DATASET_FORMAT
+    # 'chunked' content hash, or 'legacy' to deduplicate against datasets pushed by earlier versions
+    dataset_hash: str = "chunked"
+    # execution logging, log_async writes logs in bulk from a background thread (see registry.logwriter)
+    log_async: bool = False
+    log_batch_size: int = 10000  # rows (predictions) per bulk write
+    log_flush_interval: float = 1.0  # seconds
+    log_queue_size: int = 1000  # pending requests
+    log_backpressure: str = "block"  # block, drop, spill
+    log_spill_dir: str | None = None
+    # 'normalized' (row per feature/class) or 'compact' (row per request, columnar payload)
+    log_format: str = "normalized"
+    # restored deployables kept in memory (LRU by count and serialized size), optional on-disk artifact cache
+    deployable_cache_items: int = 8
+    deployable_cache_bytes: int | None = None
+    deployable_cache_dir: str | None = None
+    # where dataset and deployable bytes are stored: 'db' (in the registry rows) or 'local' 
+    # (content-addressed files under fs_root, rows hold a reference, see registry.filesystem)
+    fs_type: str = "db"
+    fs_root: str = DEFAULT_FS_ROOT
+    # local per-column cache of datasets pulled with mmap=True (see registry.columncache)
+    dataset_cache_dir: str = DEFAULT_DATASET_CACHE_DIR
+    # execution log monitoring (see registry.monitoring): window width, log ids (requests) read per update step
+    monitoring_window_seconds: int = 3600
+    monitoring_batch_logs: int = 1000
+    # execution metric rollups (see registry.rollup): bucket sizes kept, log ids (requests) read per update step
+    rollup_bucket_seconds: tuple[int, ...] = (60, 3600, 86400)
+    rollup_batch_logs: int = 10000
+    # monitoring and rollups only aggregate log ids observed at least log_settle_seconds before, so log inserts
+    # in flight (lower ids committing later, several writers on Postgres) are counted. None: 0 on SQLite, 
+    # 60 otherwise (see DataBase.get_settled_log_id)
+    log_settle_seconds: float | None = None
+    # execution log retention (see registry.retention): days kept per deployable ('name' or 'name@version'),
+    # log_retention_days for the rest (None keeps everything). Expired rows are archived to log_archive_dir
+    # (None prunes without archiving) in log_archive_format, and deleted log_prune_batch_size requests at a time
+    log_retention_days: int | None = None
+    log_retention: dict[str, int | None] | None = None
+    log_archive_dir: str | None = DEFAULT_LOG_ARCHIVE_DIR
+    log_archive_format: str = "parquet"
+    log_prune_batch_size: int = 1000
+    # replay of logged requests (see registry.replay): log ids (requests) read and re-scored per chunk
+    replay_batch_logs: int = 1000
     # db_constring: str = field(init=False)
 
 
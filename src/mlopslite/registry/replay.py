@@ -0,0 +1,131 @@
+"""
+Replay of logged requests: the inputs of execution log entries are read back a range of log ids at a time
+and re-scored by another deployable (e.g. a candidate version), next to the outputs that were logged,
+for backtesting over the production traffic.
+"""
+
+import os
+from collections import deque
+from datetime import datetime
+from typing import Callable, Iterator
+
+import pandas as pd
+
+from mlopslite.artifacts.bulk import PredictionSink, predict_chunks
+from mlopslite.artifacts.deployable import Deployable
+from mlopslite.registry.registry import LOG_COLUMNS, LOG_INPUT_PREFIX, LOG_OUTPUT_PREFIX, Registry
+
+REPLAY_PREFIX = "replay:"
+
+
+def replay(
+        registry: Registry,
+        deployable: Deployable,
+        source_id: int,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        sink: str | Callable[[pd.DataFrame], None] | None = None,
+        workers: int | None = None,
+        batch_logs: int | None = None
+) -> pd.DataFrame | int:
+
+    """
+    Re-score the logged inputs of deployable source_id (start <= request_time < end) with deployable,
+    batch_logs log ids per chunk, across the process pool of predict_chunks (workers=0 scores in this process).
+
+    Each chunk has the columns log_id, deployable_id, request_time, row_index, reference_id, the logged
+    output:<class> columns and replay:<class> columns (replay for regressors). sink is a CSV/Parquet path
+    or a callable(chunk), chunks are written in log order and the number of rows is returned.
+    Without a sink, the chunks are returned as one DataFrame.
+    """
+
+    batch_logs = registry.config.replay_batch_logs if batch_logs is None else batch_logs
+    variables = deployable.input_schema.variables
+
+    # log rows of the chunks in flight, predict_chunks yields in input order
+    pending = deque()
+
+    def inputs() -> Iterator[pd.DataFrame]:
+        for frame in read_log_chunks(registry, source_id, start=start, end=end, batch_logs=batch_logs):
+            pending.append(frame)
+            yield logged_inputs(frame, variables)
+
+    frames = []
+    rows = 0
+
+    writer = PredictionSink(sink) if isinstance(sink, (str, os.PathLike)) else None
+    write = writer.write_frame if writer is not None else sink
+
+    try:
+        for _, output in predict_chunks(deployable, inputs(), workers=workers):
+            frame = pending.popleft()
+            logged = [i for i in frame.columns if i == LOG_OUTPUT_PREFIX.rstrip(":") or i.startswith(LOG_OUTPUT_PREFIX)]
+
+            replayed = output.to_frame().drop(columns="reference_id")
+            replayed.columns = [REPLAY_PREFIX.rstrip(":") if i == "prediction" else f"{REPLAY_PREFIX}{i}" for i in replayed.columns]
+
+            chunk = pd.concat([frame[LOG_COLUMNS + logged].reset_index(drop=True), replayed], axis=1)
+            if write is None:
+                frames.append(chunk)
+            else:
+                write(chunk)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if write is not None:
+        return rows
+    if len(frames) == 0:
+        return pd.DataFrame(columns=LOG_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+### Function block
+
+def read_log_chunks(
+        registry: Registry,
+        deployable_id: int,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch_logs: int = 1000
+) -> Iterator[pd.DataFrame]:
+
+    """
+    Execution log of a deployable, batch_logs of its log entries at a time (keyset pages over its log ids),
+    up to the last entry at the time of the call.
+    """
+
+    log_format = registry.config.log_format
+    last = registry.db.get_max_log_id(log_format)
+    after = 0
+    while last is not None:
+        ids = registry.db.select_log_ids(
+            log_format, deployable_id, start=start, end=end, after_id=after, until_id=last, limit=batch_logs
+        )
+        if len(ids) == 0:
+            return
+
+        # the first ids matching the filter, so the id range holds exactly these entries
+        yield registry.read_execution_log(deployable_id, start=start, end=end, after_id=after, until_id=ids[-1])
+        after = ids[-1]
+
+
+def logged_inputs(frame: pd.DataFrame, variables: dict[str, str]) -> pd.DataFrame:
+
+    """
+    Deployable input (variables and reference_id) from execution log rows. Variables that were not logged
+    are left out (validated as missing), bool values of the normalized layout are mapped back from strings.
+    """
+
+    out = {}
+    for name, converted_dtype in variables.items():
+        column = frame.get(f"{LOG_INPUT_PREFIX}{name}")
+        if column is None:
+            continue
+        if converted_dtype == "bool" and column.dtype == object:
+            column = column.map({"True": True, "False": False, True: True, False: False})
+        out[name] = column
+
+    out["reference_id"] = frame["reference_id"]
+    return pd.DataFrame(out, index=frame.index)
@@ -0,0 +1,162 @@
+"""
+Execution log retention: log entries older than the retention period of their deployable
+(RegistryConfig.log_retention / log_retention_days) are written to archive files and deleted,
+log_prune_batch_size entries per transaction, so pruning never holds long write locks.
+
+Archives are laid out as <log_archive_dir>/db-<database>/<log format>/deployable_id=<id>/log-<first id>-<last id>.<format>,
+one file per pruned batch, with the columns of Registry.read_execution_log (see read_log_archive). <database> identifies
+the registry database (see log_archive_root), so registries sharing log_archive_dir keep apart the archives of
+their (overlapping) deployable and log ids.
+Entries not yet aggregated by monitoring or rollups (past their watermarks) are kept until they are,
+as is the newest entry of the log.
+"""
+
+import os
+from datetime import datetime, timedelta
+from hashlib import md5
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy.engine import URL
+
+from mlopslite.artifacts.storage import decode_dataset, encode_dataset
+from mlopslite.registry.registry import LOG_COLUMNS, Registry
+
+ARCHIVE_FORMATS = ["parquet", "arrow"]
+
+
+class LogRetention:
+
+    def __init__(self, registry: Registry) -> None:
+
+        if registry.config.log_archive_format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Invalid log archive format {registry.config.log_archive_format}, expected one of {ARCHIVE_FORMATS}")
+
+        self.registry = registry
+        self.db = registry.db
+        self.config = registry.config
+        self.log_format = registry.config.log_format
+
+    def retention_days(self, name: str, version: int) -> int | None:
+
+        policies = self.config.log_retention or {}
+        for key in [f"{name}@{version}", name]:
+            if key in policies:
+                return policies[key]
+        return self.config.log_retention_days
+
+    def run(self, now: datetime | None = None) -> dict:
+
+        """
+        Archive and delete the expired log entries of every deployable with a retention period.
+        """
+
+        now = datetime.utcnow() if now is None else now
+
+        # the newest entry is kept: SQLite reuses the ids above the highest remaining one,
+        # new entries would get ids behind the watermarks
+        last = self.db.get_max_log_id(self.log_format)
+        if last is None:
+            return {"deployables": 0, "logs": 0, "rows": 0, "files": 0}
+
+        watermark = self.db.get_min_watermark([self.log_format, f"rollup:{self.log_format}"])
+        until_id = last - 1 if watermark is None else min(watermark, last - 1)
+
+        stats = {"deployables": 0, "logs": 0, "rows": 0, "files": 0}
+        for deployable in self.db.list_deployables():
+            days = self.retention_days(deployable["name"], deployable["version"])
+            if days is None:
+                continue
+
+            pruned = self.prune(deployable["id"], end=now - timedelta(days=days), until_id=until_id)
+            stats["deployables"] += pruned["logs"] > 0
+            for k in ["logs", "rows", "files"]:
+                stats[k] += pruned[k]
+
+        return stats
+
+    def prune(self, deployable_id: int, end: datetime, until_id: int | None = None) -> dict:
+
+        """
+        Archive and delete the log entries of a deployable with request_time before end (and id up to until_id).
+        Each batch is archived before it is deleted, an interrupted run leaves at most a file that is rewritten
+        by the next one.
+        """
+
+        stats = {"logs": 0, "rows": 0, "files": 0}
+        while True:
+            ids = self.db.select_expired_log_ids(
+                self.log_format, deployable_id, end, until_id=until_id, limit=self.config.log_prune_batch_size
+            )
+            if len(ids) == 0:
+                return stats
+
+            if self.config.log_archive_dir is not None:
+                # the first ids matching the filter, so the id range holds exactly these entries
+                frame = self.registry.read_execution_log(
+                    deployable_id, end=end, log_format=self.log_format, after_id=ids[0] - 1, until_id=ids[-1]
+                )
+                self.write_archive(deployable_id, ids[0], ids[-1], frame)
+                stats["rows"] += len(frame)
+                stats["files"] += 1
+
+            self.db.delete_execution_logs(self.log_format, ids)
+            stats["logs"] += len(ids)
+
+    def write_archive(self, deployable_id: int, first_id: int, last_id: int, frame: pd.DataFrame) -> Path:
+
+        root = log_archive_root(self.config.log_archive_dir, self.db.engine.url)
+        directory = root / self.log_format / f"deployable_id={deployable_id}"
+        directory.mkdir(parents=True, exist_ok=True)
+
+        path = directory / f"log-{first_id:012d}-{last_id:012d}.{self.config.log_archive_format}"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(encode_dataset(frame, format=self.config.log_archive_format))
+        os.replace(tmp, path)
+        return path
+
+
+### Function block
+
+def log_archive_root(log_archive_dir: str, url: URL) -> Path:
+
+    """
+    Archive directory of the registry database at url: log_archive_dir/db-<hash of the database location>,
+    the absolute file path for SQLite, backend, host, port and database name otherwise (no credentials or driver).
+    """
+
+    if url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:"):
+        location = f"sqlite:{os.path.abspath(url.database)}"
+    else:
+        location = f"{url.get_backend_name()}://{url.host or ''}:{url.port or ''}/{url.database or ''}"
+
+    return Path(log_archive_dir) / f"db-{md5(location.encode('utf-8')).hexdigest()[:16]}"
+
+
+def read_log_archive(
+        root: str,
+        log_format: str,
+        deployable_id: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None
+) -> pd.DataFrame:
+
+    """
+    Archived execution log entries (all deployables by default), in log id order. root is the archive
+    directory of one registry database (see log_archive_root).
+    """
+
+    pattern = "deployable_id=*" if deployable_id is None else f"deployable_id={deployable_id}"
+    paths = [i for i in sorted((Path(root) / log_format).glob(f"{pattern}/log-*")) if i.suffix[1:] in ARCHIVE_FORMATS]
+
+    frames = [decode_dataset(i.read_bytes(), format=i.suffix[1:]) for i in paths]
+    if len(frames) == 0:
+        return pd.DataFrame(columns=LOG_COLUMNS)
+
+    out = pd.concat(frames, ignore_index=True)
+    if start is not None:
+        out = out[out["request_time"] >= start]
+    if end is not None:
+        out = out[out["request_time"] < end]
+
+    return out.sort_values(["log_id", "row_index"], kind="stable", ignore_index=True)
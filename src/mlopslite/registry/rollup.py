@@ -0,0 +1,271 @@
+"""
+Rollups of the execution log: requests, rows, request size distribution and summed predictions
+per deployable and time bucket, stored in execution_rollup for each of config.rollup_bucket_seconds.
+
+Rollup.update aggregates log rows past a watermark (one per bucket size), metrics answers from the rollup
+rows of the coarsest bucket size that fits the query, so its cost depends on the number of buckets
+in the range, not on the number of logged predictions.
+
+As in monitoring, each update stops at the settled log id (see DataBase.get_settled_log_id): log rows whose
+insert commits within config.log_settle_seconds of getting its id are aggregated exactly once.
+"""
+
+from datetime import datetime
+
+import pandas as pd
+
+from mlopslite.artifacts.sketches import KLLSketch
+from mlopslite.artifacts.storage import decode_dataset
+from mlopslite.registry.registry import LOG_OUTPUT_PREFIX, Registry
+
+LOG_OUTPUT = LOG_OUTPUT_PREFIX.rstrip(":")
+EPOCH = datetime(1970, 1, 1)
+
+
+class Rollup:
+
+    def __init__(self, registry: Registry, bucket_seconds: list[int] | None = None, batch_logs: int | None = None) -> None:
+        self.registry = registry
+        self.db = registry.db
+        self.log_format = registry.config.log_format
+        self.source = f"rollup:{self.log_format}"
+        self.bucket_seconds = sorted(registry.config.rollup_bucket_seconds if bucket_seconds is None else bucket_seconds)
+        self.batch_logs = registry.config.rollup_batch_logs if batch_logs is None else batch_logs
+
+        # deployable id -> output columns of its compact log payloads
+        self._outputs = {}
+
+    def update(self) -> dict:
+
+        """
+        Aggregate log rows past the watermarks into the stored buckets, batch_logs log ids at a time.
+        Each batch is read once for all bucket sizes, merged and moves the watermarks in one transaction.
+        A bucket size added later starts from the beginning of the log.
+        """
+
+        stats = {"logs": 0, "buckets": 0}
+        previous = {i: self.db.get_monitoring_watermark(self.source, i) for i in self.bucket_seconds}
+        watermarks = {k: 0 if v is None else v for k, v in previous.items()}
+        # one observation for all bucket sizes (window_seconds 0)
+        last = self.db.get_settled_log_id(self.log_format, self.source, 0, self.registry.config.log_settle_seconds)
+
+        while last is not None and min(watermarks.values()) < last:
+            after = min(watermarks.values())
+            until = min(after + self.batch_logs, last)
+            logs = self.read_logs(after, until)
+
+            inserts, updates, moves = [], [], []
+            for bucket_seconds, watermark in watermarks.items():
+                if watermark >= until:
+                    continue
+
+                new = aggregate_logs(logs[logs["log_id"] > watermark], bucket_seconds)
+                bucket_inserts, bucket_updates = self._merge_stored(bucket_seconds, new)
+                inserts += bucket_inserts
+                updates += bucket_updates
+                moves.append((self.source, bucket_seconds, until, previous[bucket_seconds]))
+
+            self.db.save_execution_rollups(inserts, updates, moves)
+
+            stats["logs"] += len(logs)
+            stats["buckets"] += len(inserts) + len(updates)
+            for _, bucket_seconds, _, _ in moves:
+                previous[bucket_seconds] = watermarks[bucket_seconds] = until
+
+        stats["last_log_id"] = min(watermarks.values())
+        return stats
+
+    def read_logs(self, after_id: int, until_id: int) -> pd.DataFrame:
+
+        """
+        One row per log entry (request): log_id, deployable_id, request_time, request_size and the sum of
+        the predictions per output column.
+        """
+
+        if self.log_format == "compact":
+            rows = []
+            for i in self.db.select_execution_batches(after_id=after_id, until_id=until_id, references=False):
+                # output columns of a deployable are fixed, only those are decoded once known
+                outputs = self._outputs.get(i["deployable_id"])
+                payload = decode_dataset(i["payload"], format=i["payload_format"], columns=outputs)
+                if outputs is None:
+                    outputs = [c for c in payload.columns if c == LOG_OUTPUT or c.startswith(LOG_OUTPUT_PREFIX)]
+                    self._outputs[i["deployable_id"]] = outputs
+                rows.append({
+                    "log_id": i["id"],
+                    "deployable_id": i["deployable_id"],
+                    "request_time": i["request_time"],
+                    "request_size": i["request_size"],
+                    **payload[outputs].sum().to_dict()
+                })
+
+            if len(rows) == 0:
+                return pd.DataFrame(columns=LOG_ENTRY_COLUMNS)
+            return pd.DataFrame(rows)
+
+        log = self.db.select_execution_log_outputs(after_id=after_id, until_id=until_id)
+        logs = pd.DataFrame(log["logs"], columns=LOG_ENTRY_COLUMNS)
+        if len(logs) == 0:
+            return logs
+
+        outputs = pd.DataFrame(log["outputs"], columns=["log_id", "classname", "out_sum"])
+        outputs["column"] = [LOG_OUTPUT if i is None else f"{LOG_OUTPUT_PREFIX}{i}" for i in outputs["classname"]]
+        outputs = outputs.pivot(index="log_id", columns="column", values="out_sum")
+        outputs.columns.name = None
+        return logs.join(outputs, on="log_id")
+
+    def _merge_stored(self, bucket_seconds: int, buckets: dict[tuple, dict]) -> tuple[list[dict], list[dict]]:
+
+        if len(buckets) == 0:
+            return [], []
+
+        stored = self.db.select_execution_rollups(
+            bucket_seconds,
+            deployable_id=list({i[0] for i in buckets}),
+            bucket_starts=list({i[1] for i in buckets})
+        )
+        stored = {(i["deployable_id"], i["bucket_start"]): i for i in stored}
+
+        inserts, updates = [], []
+        for key, bucket in buckets.items():
+            if key in stored:
+                row = stored[key]
+                updates.append({
+                    "id": row["id"],
+                    "requests": row["requests"] + bucket["requests"],
+                    "rows": row["rows"] + bucket["rows"],
+                    "request_size_max": max(row["request_size_max"], bucket["request_size_max"]),
+                    "request_size_sketch": KLLSketch.from_bytes(row["request_size_sketch"]).merge(bucket["request_size_sketch"]).to_bytes(),
+                    "output_sums": add_sums(row["output_sums"], bucket["output_sums"])
+                })
+            else:
+                deployable_id, bucket_start = key
+                inserts.append({
+                    "deployable_id": deployable_id,
+                    "bucket_seconds": bucket_seconds,
+                    "bucket_start": bucket_start,
+                    **bucket,
+                    "request_size_sketch": bucket["request_size_sketch"].to_bytes()
+                })
+
+        return inserts, updates
+
+    def metrics(
+            self,
+            deployable_id: int | str | None = None,
+            start: datetime | None = None,
+            end: datetime | None = None,
+            freq: int | None = None,
+            quantiles: tuple[float, ...] = (0.5, 0.99)
+    ) -> pd.DataFrame:
+
+        """
+        Metrics per deployable (all by default) and freq seconds wide interval, or the whole range with freq=None:
+        requests, rows, mean / max / quantiles of the request size and the mean prediction per output column.
+        start / end select buckets by their start, so they are exact if aligned to a bucket size
+        (and freq a multiple of it), otherwise rounded to the smallest bucket size.
+        """
+
+        if deployable_id is not None:
+            deployable_id = self.registry.resolve_deployable_id(deployable_id)
+
+        bucket_seconds = choose_bucket_seconds(self.bucket_seconds, freq=freq, start=start, end=end)
+        rows = pd.DataFrame(self.db.select_execution_rollups(
+            bucket_seconds, deployable_id=deployable_id, start=start, end=end, sketches=len(quantiles) > 0
+        ))
+
+        quantile_columns = [f"request_size_p{i * 100:g}" for i in quantiles]
+        if len(rows) == 0:
+            return pd.DataFrame(columns=METRIC_COLUMNS + quantile_columns)
+
+        if freq is None:
+            rows["interval_start"] = rows.groupby("deployable_id")["bucket_start"].transform("min")
+        else:
+            rows["interval_start"] = pd.to_datetime(rows["bucket_start"]).dt.floor(f"{freq}s")
+
+        groups = rows.groupby(["deployable_id", "interval_start"], sort=True)
+        out = groups.agg(requests=("requests", "sum"), rows=("rows", "sum"), request_size_max=("request_size_max", "max"))
+        out.insert(2, "request_size_mean", out["rows"] / out["requests"])
+
+        if len(quantiles) > 0:
+            merged = groups["request_size_sketch"].apply(merged_quantiles, q=quantiles)
+            out[quantile_columns] = pd.DataFrame(merged.tolist(), index=merged.index)
+
+        sums = pd.DataFrame(rows["output_sums"].tolist(), index=rows.index)
+        sums = sums.groupby([rows["deployable_id"], rows["interval_start"]]).sum(min_count=1)
+        out = out.join(sums.div(out["rows"], axis=0)[sorted(sums.columns)])
+
+        return out.reset_index()
+
+
+LOG_ENTRY_COLUMNS = ["log_id", "deployable_id", "request_time", "request_size"]
+METRIC_COLUMNS = ["deployable_id", "interval_start", "requests", "rows", "request_size_mean", "request_size_max"]
+
+
+### Function block
+
+def aggregate_logs(logs: pd.DataFrame, bucket_seconds: int) -> dict[tuple, dict]:
+
+    """
+    Rollup buckets of log entries (see Rollup.read_logs), keyed by (deployable_id, bucket_start).
+    """
+
+    out = {}
+    if len(logs) == 0:
+        return out
+
+    logs = logs.assign(bucket_start=pd.to_datetime(logs["request_time"]).dt.floor(f"{bucket_seconds}s"))
+    outputs = [i for i in logs.columns if i == LOG_OUTPUT or i.startswith(LOG_OUTPUT_PREFIX)]
+
+    groups = logs.groupby(["deployable_id", "bucket_start"], sort=False)
+    stats = groups["request_size"].agg(["size", "sum", "max"])
+    # frames of several deployables have the output columns of all of them, NaN sums are dropped
+    sums = groups[outputs].sum(min_count=1).to_dict("index")
+    sizes = logs["request_size"].to_numpy()
+
+    for (deployable_id, bucket_start), index in groups.indices.items():
+        sketch = KLLSketch()
+        sketch.update(sizes[index])
+
+        row = stats.loc[(deployable_id, bucket_start)]
+        out[(int(deployable_id), bucket_start.to_pydatetime())] = {
+            "requests": int(row["size"]),
+            "rows": int(row["sum"]),
+            "request_size_max": int(row["max"]),
+            "request_size_sketch": sketch,
+            "output_sums": {k: float(v) for k, v in sums[(deployable_id, bucket_start)].items() if not pd.isna(v)}
+        }
+
+    return out
+
+
+def add_sums(left: dict, right: dict) -> dict:
+    return {k: left.get(k, 0.0) + right.get(k, 0.0) for k in left.keys() | right.keys()}
+
+
+def merged_quantiles(blobs: pd.Series, q: tuple[float, ...]) -> list[float]:
+
+    sketch = KLLSketch()
+    for i in blobs:
+        sketch.merge(KLLSketch.from_bytes(i))
+    return sketch.quantiles(q).tolist()
+
+
+def choose_bucket_seconds(
+        bucket_seconds: list[int],
+        freq: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None
+) -> int:
+
+    """
+    Coarsest bucket size that freq is a multiple of and start / end are aligned to, the smallest one otherwise.
+    """
+
+    def aligned(size: int) -> bool:
+        if freq is not None and freq % size != 0:
+            return False
+        return all(t is None or (t - EPOCH).total_seconds() % size == 0 for t in [start, end])
+
+    candidates = [i for i in bucket_seconds if aligned(i)]
+    return max(candidates) if len(candidates) > 0 else min(bucket_seconds)
@@ -1,11 +1,8 @@
-from sklearn.datasets import load_iris, load_wine
 import pandas as pd
 import numpy as np
 from mlopslite.alembic_setup import get_migration_script_location, get_alembic_ini
 import os
 from glob import glob
-from alembic.config import Config
-from alembic import command
 from mlopslite.registry.registryconfig import RegistryConfig
 from sqlalchemy import create_engine
 from time import time
@@ -13,13 +10,14 @@ from time import time
 # these are dev utils, and probably should be removed at some point
 
 def sklearn_dataset_to_dataframe(x: str):
+    from sklearn.datasets import load_iris, load_wine
 
     sklearn_datasets = {
-        'iris': load_iris(), 
-        'wine': load_wine()
+        'iris': load_iris, 
+        'wine': load_wine
     }
 
-    dataset = sklearn_datasets[x]
+    dataset = sklearn_datasets[x]()
 
     #iris_raw = load_iris(as_frame=True)
     out = pd.DataFrame(data= np.c_[dataset['data'], dataset['target']],
@@ -28,6 +26,8 @@ def sklearn_dataset_to_dataframe(x: str):
     return out
 
 def reset_registry(regconf: RegistryConfig):
+    from alembic import command
+    from alembic.config import Config
 
     # remove migrations scripts
     migration_scripts = get_migration_script_location()
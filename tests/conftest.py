@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+
+from mlopslite.registry.registryconfig import RegistryConfig
+
+
+@pytest.fixture
+def sqlite_config(tmp_path) -> RegistryConfig:
+    return RegistryConfig(db_constring=f"sqlite:///{tmp_path / 'mlops-lite.db'}")
+
+
+@pytest.fixture(scope="session")
+def train_data() -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    return pd.DataFrame(
+        {
+            "x1": rng.normal(size=200),
+            "x2": rng.normal(size=200),
+            "target": rng.choice(["a", "b", "c"], size=200),
+        }
+    )
+
+
+@pytest.fixture(scope="session")
+def model(train_data):
+    return make_pipeline(
+        ColumnTransformer([("num", SimpleImputer(), ["x1", "x2"])]),
+        LogisticRegression()
+    ).fit(train_data[["x1", "x2"]], train_data["target"])
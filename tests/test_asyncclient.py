@@ -0,0 +1,44 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from mlopslite.client import MlopsLite
+
+pytest.importorskip("aiosqlite")
+
+from mlopslite.asyncclient import AsyncMlopsLite  # noqa: E402
+
+
+class TestAsyncClient:
+
+    def test_roundtrip(self, sqlite_config, train_data, model):
+
+        async def main():
+            async with AsyncMlopsLite(config=sqlite_config) as client:
+                await client.bind_dataset(train_data, name="train")
+                await client.bind_deployable(model, name="m", target="target")
+
+                input = train_data[["x1", "x2"]].head(5).assign(reference_id=[f"r{i}" for i in range(5)])
+                outputs = await asyncio.gather(*[client.predict(input, log=True, deployable_id="m") for _ in range(4)])
+
+                return client.dataset, outputs, await client.list_deployables(), await client.read_execution_log()
+
+        dataset, outputs, deployables, log = asyncio.run(main())
+
+        pd.testing.assert_frame_equal(dataset.data, train_data)
+        assert deployables["name"].tolist() == ["m"]
+        assert len(log) == 20
+
+        # same registry, same results as the sync client
+        client = MlopsLite(config=sqlite_config)
+        client.pull_deployable(1)
+        assert all(i == client.predict(train_data[["x1", "x2"]].head(5).assign(reference_id=[f"r{i}" for i in range(5)])) for i in outputs)
+
+    def test_fresh_registry(self, sqlite_config):
+
+        async def main():
+            async with AsyncMlopsLite(config=sqlite_config) as client:
+                return await client.list_datasets()
+
+        assert len(asyncio.run(main())) == 0
@@ -0,0 +1,95 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlopslite.artifacts.batching import MicroBatcher
+from mlopslite.artifacts.dataset import create_dataset
+from mlopslite.artifacts.deployable import create_deployable
+
+
+@pytest.fixture(scope="module")
+def deployable(train_data, model):
+    return create_deployable(model, dataset=create_dataset(train_data, name="train"), name="m", target="target")
+
+
+def make_request(i: int) -> list[dict]:
+    return [{"x1": i * 0.1, "x2": -i * 0.1, "reference_id": f"r{i}-{j}"} for j in range(i % 4 + 1)]
+
+
+class TestMicroBatcher:
+
+    def test_scatter_matches_predict(self, deployable):
+        requests = [make_request(i) for i in range(50)]
+
+        with MicroBatcher(deployable, max_batch_size=32, max_wait=0.05) as batcher:
+            with ThreadPoolExecutor(8) as pool:
+                outputs = list(pool.map(batcher.predict, requests))
+            metrics = batcher.metrics()
+
+        for request, output in zip(requests, outputs):
+            expected = deployable.predict(request)
+            assert [i["reference_id"] for i in output] == [i["reference_id"] for i in request]
+            assert np.allclose(
+                [list(i["results"].values()) for i in expected],
+                [list(i["results"].values()) for i in output]
+            )
+
+        assert metrics["requests"] == 50
+        assert metrics["rows"] == sum(len(i) for i in requests)
+        assert metrics["batches"] < 50
+        assert metrics["max_batch_rows"] <= 32
+        assert metrics["queue_depth"] == 0
+
+    def test_mixed_inputs_and_outputs(self, deployable):
+        frame = pd.DataFrame({"x1": [0.5, 1.0], "x2": [0.0, None]})
+        array = frame.to_numpy(dtype=float)
+
+        with MicroBatcher(deployable, max_wait=0.05) as batcher:
+            futures = [
+                batcher.submit(make_request(3)),
+                batcher.submit(frame, output="arrays"),
+                batcher.submit(array, output="arrays"),
+            ]
+            records, from_frame, from_array = [i.result() for i in futures]
+
+        assert len(records) == 4 and records[0]["reference_id"] == "r3-0"
+        assert from_frame.reference_id == [None, None]
+        assert np.allclose(from_frame.results, deployable.predict(frame, output="arrays").results)
+        assert np.allclose(from_frame.results, from_array.results)
+
+    def test_invalid_request_fails_alone(self, deployable):
+        with MicroBatcher(deployable, max_wait=0.05) as batcher:
+            good = batcher.submit(make_request(1))
+            bad = batcher.submit([{"x1": 1.0, "x3": 1.0}])
+            assert len(good.result()) == 2
+            with pytest.raises(ValueError):
+                bad.result()
+
+        assert batcher.stats["failed"] == 1
+
+    def test_closed(self, deployable):
+        batcher = MicroBatcher(deployable)
+        batcher.close()
+        with pytest.raises(RuntimeError):
+            batcher.submit(make_request(1))
+
+    def test_close_while_submitting(self, deployable):
+        batcher = MicroBatcher(deployable, max_wait=0.001)
+
+        def submit(i):
+            try:
+                return batcher.submit(make_request(i))
+            except RuntimeError:
+                return None
+
+        with ThreadPoolExecutor(8) as pool:
+            submitted = [pool.submit(submit, i) for i in range(200)]
+            batcher.close()
+            futures = [i.result() for i in submitted]
+
+        # every accepted request is scored, none is left behind _STOP
+        for future in futures:
+            if future is not None:
+                assert len(future.result(timeout=5)) > 0
@@ -0,0 +1,72 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlopslite.artifacts.bulk import predict_batch, read_chunks
+from mlopslite.artifacts.dataset import create_dataset
+from mlopslite.artifacts.deployable import create_deployable
+
+
+@pytest.fixture(scope="module")
+def deployable(train_data, model):
+    return create_deployable(model, dataset=create_dataset(train_data, name="train"), name="m", target="target")
+
+
+@pytest.fixture(scope="module")
+def input(train_data):
+    return train_data[["x1", "x2"]].assign(reference_id=[f"r{i}" for i in range(len(train_data))])
+
+
+class TestBulk:
+
+    def test_pickle_drops_input_schema(self, deployable):
+        deployable.predict([{"x1": 1.0, "x2": 2.0}])
+        restored = pickle.loads(pickle.dumps(deployable))
+        assert restored._input_schema is None
+        assert restored.input_schema is deployable.input_schema
+
+    def test_read_chunks(self, input, tmp_path):
+        input.to_csv(tmp_path / "input.csv", index=False)
+        input.to_parquet(tmp_path / "input.parquet", index=False)
+
+        for source in [input, str(tmp_path / "input.csv"), str(tmp_path / "input.parquet")]:
+            chunks = list(read_chunks(source, chunk_size=64))
+            assert [len(i) for i in chunks] == [64, 64, 64, 8]
+            assert chunks[-1]["reference_id"].tolist()[-1] == "r199"
+
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_ordered_results(self, deployable, input, workers):
+        expected = deployable.predict(input, output="arrays").to_frame()
+        actual = predict_batch(deployable, input, chunk_size=30, workers=workers)
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_file_sink(self, deployable, input, tmp_path):
+        input.to_parquet(tmp_path / "input.parquet", index=False)
+        chunks = []
+
+        rows = predict_batch(
+            deployable,
+            str(tmp_path / "input.parquet"),
+            sink=str(tmp_path / "output.csv"),
+            chunk_size=50,
+            workers=2,
+            on_chunk=lambda chunk, output: chunks.append(len(output))
+        )
+
+        output = pd.read_csv(tmp_path / "output.csv")
+        assert rows == len(output) == 200
+        assert chunks == [50] * 4
+        assert output["reference_id"].tolist() == input["reference_id"].tolist()
+        assert np.allclose(output[["a", "b", "c"]].sum(axis=1), 1)
+
+    def test_parquet_sink_null_reference_ids(self, deployable, input, tmp_path):
+        # first chunk without reference ids, its column is typed null
+        source = input.assign(reference_id=[None] * 100 + input["reference_id"].tolist()[100:])
+
+        rows = predict_batch(deployable, source, sink=str(tmp_path / "output.parquet"), chunk_size=100, workers=0)
+
+        output = pd.read_parquet(tmp_path / "output.parquet")
+        assert rows == len(output) == 200
+        assert output["reference_id"].tolist() == source["reference_id"].tolist()
@@ -0,0 +1,105 @@
+import pickle
+from dataclasses import asdict
+from hashlib import md5
+
+import pytest
+
+from mlopslite.artifacts.dataset import create_dataset
+from mlopslite.artifacts.deployable import create_deployable
+from mlopslite.registry.cache import DeployableCache
+
+
+@pytest.fixture(scope="module")
+def registry_items(train_data, model):
+    dataset = create_dataset(train_data, name="train")
+    deployable = create_deployable(model, dataset=dataset, name="m", target="target")
+    blob = pickle.dumps(model)
+
+    items = {}
+    for id in range(1, 4):
+        item = {**asdict(deployable.metadata), "id": id, "version": id, "deployable": blob}
+        item["hash"] = md5(blob).hexdigest()
+        items[id] = item
+    return items
+
+
+class Loader:
+
+    def __init__(self, items):
+        self.items = items
+        self.calls = []
+        self.hash_calls = []
+
+    def __call__(self, id):
+        self.calls.append(id)
+        return self.items[id]
+
+    def hash(self, id):
+        self.hash_calls.append(id)
+        return self.items[id]["hash"]
+
+
+class TestDeployableCache:
+
+    def test_memory_hit(self, registry_items, tmp_path):
+        cache, load = DeployableCache(cache_dir=str(tmp_path)), Loader(registry_items)
+        first = cache.get(1, load, load.hash)
+        assert cache.get(1, load, load.hash) is first
+        assert load.calls == [1]
+        # the hash is only looked up on a memory miss, for the on-disk cache
+        assert load.hash_calls == [1]
+        assert first.metadata.hash == registry_items[1]["hash"]
+
+    def test_evict_by_count(self, registry_items):
+        cache, load = DeployableCache(max_items=2), Loader(registry_items)
+        for id in [1, 2, 1, 3]:
+            cache.get(id, load, load.hash)
+
+        assert 2 not in cache
+        assert 1 in cache and 3 in cache
+        assert load.hash_calls == []
+
+    def test_evict_by_bytes(self, registry_items):
+        size = len(registry_items[1]["deployable"])
+        cache, load = DeployableCache(max_bytes=int(size * 2.5)), Loader(registry_items)
+        for id in [1, 2, 3]:
+            cache.get(id, load, load.hash)
+
+        assert len(cache) == 2
+        assert cache.size_bytes <= size * 2.5
+
+    def test_disk_warm_start(self, registry_items, tmp_path):
+        first = Loader(registry_items)
+        DeployableCache(cache_dir=str(tmp_path)).get(1, first, first.hash)
+
+        load = Loader(registry_items)
+        cache = DeployableCache(cache_dir=str(tmp_path))
+        cache.get(1, load, load.hash)
+        assert load.calls == []
+        assert cache.stats["disk_hits"] == 1
+
+    def test_disk_entry_checked_against_hash(self, registry_items, tmp_path):
+        first = Loader(registry_items)
+        DeployableCache(cache_dir=str(tmp_path)).get(1, first, first.hash)
+
+        path = next(tmp_path.iterdir())
+        item = pickle.loads(path.read_bytes())
+        item["deployable"] = item["deployable"][:-1]
+        path.write_bytes(pickle.dumps(item))
+
+        load = Loader(registry_items)
+        DeployableCache(cache_dir=str(tmp_path)).get(1, load, load.hash)
+        assert load.calls == [1]
+
+    def test_disk_entry_keyed_by_hash(self, registry_items, tmp_path):
+        # e.g. a cache_dir shared with another registry, which stored a different artifact under id 1
+        other = {**registry_items[1], "deployable": registry_items[1]["deployable"] + b"."}
+        other["hash"] = md5(other["deployable"]).hexdigest()
+        first = Loader({1: other})
+        DeployableCache(cache_dir=str(tmp_path)).get(1, first, first.hash)
+
+        load = Loader(registry_items)
+        cache = DeployableCache(cache_dir=str(tmp_path))
+        cache.get(1, load, load.hash)
+        assert load.calls == [1]
+        assert cache.stats["disk_hits"] == 0
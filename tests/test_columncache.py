@@ -0,0 +1,50 @@
+import mmap
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+
+from mlopslite.client import MlopsLite
+from mlopslite.registry.columncache import DatasetColumnCache
+
+
+def is_mapped(array: np.ndarray) -> bool:
+    while array is not None and not isinstance(array, mmap.mmap):
+        array = array.base
+    return array is not None
+
+
+class TestDatasetColumnCache:
+
+    def test_roundtrip(self, tmp_path):
+        data = pd.DataFrame(
+            {
+                "f": [0.5, np.nan, 2.0],
+                "i": [1, 2, 3],
+                "s": ["a", None, "c"],
+                "t": pd.date_range("2023-01-01", periods=3),
+            }
+        )
+        cache = DatasetColumnCache(root=str(tmp_path))
+        cache.write("h", data)
+
+        assert "h" in cache
+        out = cache.read_frame("h")
+        assert out.equals(data)
+        assert all(is_mapped(out[i].to_numpy()) for i in ["f", "i", "t"])
+        assert cache.read_frame("h", columns=["s"])["s"].tolist() == ["a", None, "c"]
+
+    def test_pull_dataset_mmap(self, sqlite_config, tmp_path, train_data):
+        config = replace(sqlite_config, dataset_cache_dir=str(tmp_path / "datasets"))
+        client = MlopsLite(config=config)
+        client.bind_dataset(train_data, name="train")
+        id = client.dataset.metadata.id
+
+        client.pull_dataset(id, mmap=True)
+        assert client.dataset.data.equals(train_data)
+        assert is_mapped(client.dataset.data["x1"].to_numpy())
+        assert client.dataset.load(columns=["x2"], rows=slice(0, 5)).equals(train_data[["x2"]].head(5))
+
+        arrays = client.registry.pull_dataset_arrays(id, columns=["x1"])
+        np.testing.assert_array_equal(arrays["x1"], train_data["x1"].to_numpy())
+        assert not arrays["x1"].flags.writeable
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+
+from mlopslite.artifacts.dataset import create_dataset
+from mlopslite.artifacts.deployable import create_deployable
+from mlopslite.artifacts.validation import InputSchema
+
+rng = np.random.default_rng(1)
+train = pd.DataFrame(
+    {
+        "x1": rng.normal(size=200),
+        "x2": rng.normal(size=200),
+        "target": rng.choice(["a", "b", "c"], size=200),
+    }
+)
+
+model = make_pipeline(
+    ColumnTransformer([("num", SimpleImputer(), ["x1", "x2"])]),
+    LogisticRegression()
+).fit(train[["x1", "x2"]], train["target"])
+
+dataset = create_dataset(train, name="train")
+deployable = create_deployable(model, dataset=dataset, name="m", target="target")
+
+records = [
+    {"x1": 0.1, "x2": 1.0, "reference_id": "r1"},
+    {"x1": -2, "x2": None},
+    {"x1": "0.5", "x2": 3},
+]
+
+
+class TestDeployable:
+
+    def test_schema_compiled_once(self):
+        assert deployable.input_schema is deployable.input_schema
+        assert deployable.construct_pydantic_model() is deployable.input_schema.model
+
+    def test_frame_matches_records(self):
+        expected = deployable.predict(records)
+        actual = deployable.predict(pd.DataFrame(records))
+
+        assert [i["reference_id"] for i in actual] == ["r1", None, None]
+        for e, a in zip(expected, actual):
+            assert e["results"].keys() == a["results"].keys()
+            assert np.allclose(list(e["results"].values()), list(a["results"].values()))
+
+    def test_array_input(self):
+        array = np.array([[0.1, 1.0], [-2.0, np.nan]])
+        expected = deployable.predict(records[:2])
+        actual = deployable.predict(array)
+        assert np.allclose(
+            [list(i["results"].values()) for i in expected],
+            [list(i["results"].values()) for i in actual]
+        )
+
+    def test_extra_keys_rejected(self):
+        with pytest.raises(ValueError):
+            deployable.predict(pd.DataFrame({"x1": [1.0], "x2": [1.0], "x3": [1.0]}))
+        with pytest.raises(ValueError):
+            deployable.predict([{"x1": 1.0, "x2": 1.0, "x3": 1.0}])
+
+    def test_invalid_dtype_rejected(self):
+        with pytest.raises(ValueError):
+            deployable.predict(pd.DataFrame({"x1": ["abc"], "x2": [1.0]}))
+
+    def test_bool_strings_match_records(self):
+        schema = InputSchema({"b": "bool"})
+        values = ["False", "0", "no", "YES", "t", 1, 0.0, True, None]
+
+        frame, _ = schema.validate_frame(pd.DataFrame({"b": values}))
+        records, _ = schema.validate_records([{"b": i} for i in values])
+        assert frame["b"].tolist() == records["b"].tolist() == [False, False, False, True, True, True, False, True, None]
+
+        with pytest.raises(ValueError):
+            schema.validate_frame(pd.DataFrame({"b": ["maybe"]}))
+
+    def test_strict_validation(self):
+        frame = pd.DataFrame({"x1": [1.0, None]})
+        deployable.input_schema.validate_frame(frame)
+        with pytest.raises(ValueError):
+            deployable.input_schema.validate_frame(frame, strict=True)
+
+    def test_arrays_output(self):
+        batch = deployable.predict(pd.DataFrame(records), output="arrays")
+        assert batch.results.shape == (3, 3)
+        assert list(batch.classes) == ["a", "b", "c"]
+        assert batch.reference_id == ["r1", None, None]
+        assert batch.to_records()[0]["results"].keys() == {"a", "b", "c"}
+
+    def test_arrow_input(self):
+        pa = pytest.importorskip("pyarrow")
+        frame = pd.DataFrame(records[:2])
+        batch = deployable.predict(pa.Table.from_pandas(frame), output="arrays")
+        assert np.allclose(batch.results, deployable.predict(frame, output="arrays").results)
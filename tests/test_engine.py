@@ -0,0 +1,38 @@
+from dataclasses import replace
+
+from sqlalchemy import text
+
+from mlopslite.client import MlopsLite
+from mlopslite.registry.engine import get_engine
+
+
+def pragma(engine, name: str):
+    with engine.connect() as connection:
+        return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+
+class TestEngine:
+
+    def test_shared_engine(self, sqlite_config):
+        first, second = MlopsLite(config=sqlite_config), MlopsLite(config=replace(sqlite_config))
+        assert first.registry.db.engine is second.registry.db.engine
+
+        # different settings, different engine
+        assert get_engine(replace(sqlite_config, pool_size=2)) is not first.registry.db.engine
+        assert get_engine(replace(sqlite_config, share_engine=False)) is not first.registry.db.engine
+
+    def test_sqlite_pragmas(self, sqlite_config, tmp_path):
+        engine = get_engine(sqlite_config)
+        assert pragma(engine, "journal_mode") == "wal"
+        assert pragma(engine, "synchronous") == 1  # NORMAL
+        assert pragma(engine, "cache_size") == -64000
+
+        # journal mode is persisted in the database file
+        config = replace(sqlite_config, db_constring=f"sqlite:///{tmp_path / 'default.db'}")
+        engine = get_engine(replace(config, sqlite_journal_mode=None, sqlite_synchronous=None))
+        assert pragma(engine, "journal_mode") == "delete"
+
+    def test_in_memory(self, sqlite_config, train_data):
+        client = MlopsLite(config=replace(sqlite_config, db_constring="sqlite://"))
+        client.bind_dataset(train_data, name="train")
+        assert len(client.list_datasets()) == 1
@@ -0,0 +1,93 @@
+import os
+from dataclasses import replace
+from hashlib import md5
+
+import pandas as pd
+import pytest
+from sqlalchemy import select
+
+from mlopslite.artifacts.dataset import create_dataset
+from mlopslite.client import MlopsLite
+from mlopslite.registry import datamodel
+from mlopslite.registry.filesystem import FileSystem
+
+
+class TestFileSystem:
+
+    def test_put_get(self, tmp_path):
+        fs = FileSystem(root=str(tmp_path))
+        key = fs.put(b"payload")
+
+        assert key == md5(b"payload").hexdigest()
+        assert fs.path(key) == os.path.join(str(tmp_path), key[:2], key[2:4], key)
+        assert fs.get(key, verify=True) == b"payload"
+        with fs.open_mmap(key) as blob:
+            assert blob[:] == b"payload"
+
+    def test_dedup(self, tmp_path):
+        fs = FileSystem(root=str(tmp_path))
+        key = fs.put(b"payload")
+        mtime = os.path.getmtime(fs.path(key))
+
+        assert fs.put(b"payload") == key
+        assert fs.put_stream([b"pay", b"load"]) == key
+        assert os.path.getmtime(fs.path(key)) == mtime
+        # no temporary files left behind
+        assert [i for _, _, files in os.walk(tmp_path) for i in files] == [key]
+
+    def test_corrupted_blob(self, tmp_path):
+        fs = FileSystem(root=str(tmp_path))
+        key = fs.put(b"payload")
+        with open(fs.path(key), "wb") as f:
+            f.write(b"tampered")
+
+        with pytest.raises(ValueError):
+            fs.get(key, verify=True)
+
+    def test_invalid_key(self, tmp_path):
+        fs = FileSystem(root=str(tmp_path))
+        with pytest.raises(ValueError):
+            fs.get("../../etc/passwd")
+
+    def test_registry_rows_hold_references(self, sqlite_config, tmp_path, train_data, model):
+        config = replace(sqlite_config, fs_type="local", fs_root=str(tmp_path / "artifacts"))
+        client = MlopsLite(config=config)
+        client.bind_dataset(train_data, name="train")
+        client.bind_deployable(model, name="m", target="target")
+
+        dataset_row = client.registry.db.execute_select_query(select(*datamodel.DatasetRegistry.__table__.columns))[0]
+        deployable_row = client.registry.db.execute_select_query(select(*datamodel.DeployableRegistry.__table__.columns))[0]
+        assert dataset_row["data_blob"] is None and client.registry.fs.exists(dataset_row["storage_ref"])
+        assert deployable_row["deployable"] is None and deployable_row["storage_ref"] == deployable_row["hash"]
+
+        # a fresh client reads both back from the filesystem
+        client = MlopsLite(config=config)
+        client.pull_dataset(dataset_row["id"])
+        pd.testing.assert_frame_equal(client.dataset.data, train_data)
+        client.pull_deployable(deployable_row["id"])
+        assert len(client.predict(train_data[["x1", "x2"]].head(3))) == 3
+
+    def test_failed_insert_discards_blob(self, sqlite_config, tmp_path, train_data, monkeypatch):
+        config = replace(sqlite_config, fs_type="local", fs_root=str(tmp_path / "artifacts"))
+        client = MlopsLite(config=config)
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("insert failed")
+
+        monkeypatch.setattr(client.registry.db, "_insert_returning_ids", fail)
+        with pytest.raises(RuntimeError):
+            client.bind_dataset(train_data, name="train")
+
+        assert list(client.registry.fs.keys()) == []
+
+    def test_concurrent_push_returns_existing(self, sqlite_config, tmp_path, train_data, monkeypatch):
+        config = replace(sqlite_config, fs_type="local", fs_root=str(tmp_path / "artifacts"))
+        registry = MlopsLite(config=config).registry
+        first = registry.push_dataset_to_registry(create_dataset(train_data, name="train"))
+
+        # the hash lookup ran before the first push committed
+        monkeypatch.setattr(registry.db, "get_dataset_reference_by_hash", lambda hash: None)
+        again = registry.push_dataset_to_registry(create_dataset(train_data, name="train"))
+
+        assert (again["id"], again["version"]) == (first["id"], first["version"])
+        assert len(list(registry.fs.keys())) == 1
@@ -0,0 +1,57 @@
+import json
+from hashlib import md5
+
+import numpy as np
+import pandas as pd
+
+from mlopslite.artifacts.dataset import create_dataset
+from mlopslite.artifacts.hashing import DatasetHasher, hash_dataframe
+
+testcase1 = pd.DataFrame(
+    {
+        "a": [1, 2, 3, 4, 5],
+        "b": [1.1, 2.1, 2.2, 2.3, 2.4],
+        "c": ["a", "b", "c", "d", None],
+        "d": [1, None, None, None, 2],
+        "t": [0, 1, 1, 1, 0],
+    }
+)
+dtypes = {"a": "int", "b": "float", "c": "str", "d": "float", "t": "int"}
+
+
+class TestHashing:
+
+    def test_chunking_does_not_change_digest(self):
+        full = hash_dataframe(testcase1, dtypes)
+        assert hash_dataframe(testcase1, dtypes, chunk_rows=2) == full
+
+        hasher = DatasetHasher(dtypes)
+        hasher.update(testcase1.iloc[:3])
+        hasher.update(testcase1.iloc[3:])
+        assert hasher.hexdigest() == full
+
+    def test_column_order_does_not_change_digest(self):
+        reordered = testcase1[["t", "d", "c", "b", "a"]]
+        assert hash_dataframe(reordered, dtypes) == hash_dataframe(testcase1, dtypes)
+
+    def test_content_changes_digest(self):
+        changed = testcase1.copy()
+        changed.loc[4, "c"] = ""
+        assert hash_dataframe(changed, dtypes) != hash_dataframe(testcase1, dtypes)
+
+        shifted = testcase1.copy()
+        shifted["c"] = ["ab", "", "c", "d", None]
+        assert hash_dataframe(shifted, dtypes) != hash_dataframe(testcase1, dtypes)
+
+    def test_null_canonical_form(self):
+        with_none = pd.DataFrame({"x": [1.0, None]})
+        with_nan = pd.DataFrame({"x": [1.0, np.nan]})
+        assert hash_dataframe(with_none, {"x": "float"}) == hash_dataframe(with_nan, {"x": "float"})
+
+    def test_legacy_mode(self):
+        dataset = create_dataset(testcase1, name="t")
+        expected = md5(
+            json.dumps(dataset.convert_to_dict(), indent=2, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        assert dataset.get_data_hash(mode="legacy") == expected
+        assert dataset.get_data_hash() != expected
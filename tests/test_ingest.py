@@ -0,0 +1,122 @@
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlopslite.artifacts.dataset import create_dataset
+from mlopslite.artifacts.ingest import ingest_chunks
+from mlopslite.artifacts.metadata import translate_type_to_primitive
+from mlopslite.artifacts.profiling import ColumnProfile, profile_column
+from mlopslite.client import MlopsLite
+
+rng = np.random.default_rng(1)
+data = pd.DataFrame(
+    {
+        "a": rng.integers(0, 50, size=1000),
+        "b": np.where(rng.random(1000) < 0.1, np.nan, rng.normal(size=1000)),
+        "c": pd.Series(rng.integers(0, 30, size=1000)).map("cat_{}".format).where(rng.random(1000) > 0.05),
+    }
+)
+
+
+def chunks(size: int):
+    return (data.iloc[i:i + size] for i in range(0, len(data), size))
+
+
+class TestIngest:
+
+    @pytest.mark.parametrize("exact_unique", [True, False])
+    def test_merged_profile_matches_column(self, exact_unique):
+        for name, column in data.items():
+            dtype = translate_type_to_primitive(column.dtype)
+            left, right = ColumnProfile(dtype, exact_unique), ColumnProfile(dtype, exact_unique)
+            left.update(column.iloc[:300])
+            right.update(column.iloc[300:600])
+            right.update(column.iloc[600:])
+
+            assert left.merge(right).summary() == profile_column(column, dtype, exact_unique=exact_unique)
+
+    def test_matches_create_dataset(self):
+        dataset = create_dataset(data, name="d")
+        metadata, hash = ingest_chunks(chunks(128), name="d", exact_unique=True)
+
+        assert metadata == dataset.metadata
+        assert hash == dataset.get_data_hash()
+
+    def test_dtype_change_rejected(self):
+        # int column with nulls in a later chunk, earlier chunks are already hashed as int
+        with pytest.raises(ValueError, match="explicit dtypes"):
+            ingest_chunks([data.iloc[:10], data.iloc[10:20].astype({"a": float}).assign(a=np.nan)], name="d")
+
+    def test_compatible_chunks_cast(self):
+        parts = [
+            data.iloc[:100],
+            data.iloc[100:200].assign(c=np.nan),                                  # all-null string column
+            data.iloc[200:300].assign(b=data["b"].iloc[200:300].fillna(0).round().astype(int)),   # int of float
+            data.iloc[300:].astype({"a": float}),                                 # whole floats of int
+        ]
+        expected = pd.concat(parts).astype({"a": int, "c": object})
+        expected.loc[expected.index[100:200], "c"] = None
+
+        dataset = create_dataset(expected.reset_index(drop=True), name="d")
+        metadata, hash = ingest_chunks(parts, name="d", exact_unique=True)
+
+        assert metadata == dataset.metadata
+        assert hash == dataset.get_data_hash()
+
+    def test_stream_null_chunk(self, sqlite_config, tmp_path):
+        # the last CSV chunk has no values in the string column, read as float64
+        data.assign(c=data["c"].where(data.index < 900)).to_csv(tmp_path / "data.csv", index=False)
+
+        client = MlopsLite(config=sqlite_config)
+        client.bind_dataset_stream(str(tmp_path / "data.csv"), name="d", chunk_size=100)
+
+        assert client.dataset.metadata.column_metadata[2].converted_dtype == "str"
+        assert client.dataset.data["c"].iloc[900:].isna().all()
+
+    def test_stream_dtype(self, sqlite_config):
+        parts = [data.iloc[:500], data.iloc[500:].assign(a=data["a"].iloc[500:].where(data.index[500:] < 900))]
+
+        client = MlopsLite(config=sqlite_config)
+        with pytest.raises(ValueError):
+            client.bind_dataset_stream(iter(parts), name="d")
+
+        client.bind_dataset_stream(iter(parts), name="d", dtype={"a": "float64"})
+        assert client.dataset.metadata.column_metadata[0].converted_dtype == "float"
+        assert client.dataset.data["a"].isna().sum() == 100
+
+    @pytest.mark.parametrize("fs_type", ["db", "local"])
+    def test_push_dataset_stream(self, sqlite_config, tmp_path, fs_type):
+        config = replace(sqlite_config, fs_type=fs_type, fs_root=str(tmp_path / "fs"))
+        data.to_csv(tmp_path / "data.csv", index=False)
+
+        client = MlopsLite(config=config)
+        client.bind_dataset_stream(str(tmp_path / "data.csv"), name="d", chunk_size=100)
+
+        expected = pd.read_csv(tmp_path / "data.csv")
+
+        assert not client.dataset.is_loaded
+        assert client.dataset.metadata.size_rows == len(data)
+        pd.testing.assert_frame_equal(client.dataset.data, expected)
+
+        # same content, nothing new stored
+        first = client.dataset.metadata.id
+        client.bind_dataset(expected, name="d")
+        assert client.dataset.metadata.id == first
+        if fs_type == "local":
+            assert len(list(client.registry.fs.keys())) == 1
+            assert not any(i.name.startswith(".tmp") for i in (tmp_path / "fs").iterdir())
+
+    def test_predict_stream(self, sqlite_config, train_data, model):
+        client = MlopsLite(config=sqlite_config)
+        client.bind_dataset(train_data, name="train")
+        client.bind_deployable(model, name="m", target="target")
+
+        records = ({"x1": x1, "x2": x2, "reference_id": str(i)} for i, (x1, x2) in enumerate(train_data[["x1", "x2"]].values))
+        output = list(client.predict_stream(records, batch_size=64, log=True))
+
+        expected = client.predict(train_data[["x1", "x2"]], output="arrays")
+        assert [i["reference_id"] for i in output] == [str(i) for i in range(len(train_data))]
+        assert np.allclose([list(i["results"].values()) for i in output], expected.results)
+        assert len(client.read_execution_log()) == len(train_data)
@@ -0,0 +1,81 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from mlopslite.registry.logwriter import LogWriter
+
+
+class TestLogWriter:
+
+    def test_batches_and_drains_on_close(self):
+        batches = []
+        writer = LogWriter(write=batches.append, batch_size=10, flush_interval=0.05, size=len)
+        for i in range(25):
+            writer.submit([i] * 2)
+        writer.close()
+
+        assert sum(len(b) for b in batches) == 25
+        assert all(sum(len(e) for e in b) <= 10 for b in batches)
+        assert writer.stats["written"] == 25
+
+    def test_flush(self):
+        batches = []
+        writer = LogWriter(write=batches.append, batch_size=1000, flush_interval=0.01)
+        writer.submit("a")
+        writer.flush()
+        assert batches == [["a"]]
+        writer.close()
+
+    def test_drop_when_full(self):
+        release = threading.Event()
+        writer = LogWriter(write=lambda batch: release.wait(), batch_size=1, queue_size=1, backpressure="drop")
+        results = [writer.submit(i) for i in range(10)]
+        release.set()
+        writer.close()
+
+        assert results.count(False) == writer.stats["dropped"] > 0
+        assert writer.stats["written"] + writer.stats["dropped"] == 10
+
+    def test_spill_when_full(self, tmp_path):
+        release = threading.Event()
+        written = []
+
+        def write(batch):
+            release.wait()
+            time.sleep(0.01)
+            written.extend(batch)
+
+        writer = LogWriter(
+            write=write, batch_size=1, queue_size=1, backpressure="spill", spill_dir=str(tmp_path)
+        )
+        for i in range(10):
+            assert writer.submit(i)
+        assert writer.stats["spilled"] > 0
+
+        release.set()
+        # read-your-writes: spilled entries are written by flush, not only by close
+        writer.flush()
+        assert sorted(written) == list(range(10))
+        assert list(tmp_path.iterdir()) == []
+
+        writer.close()
+        assert sorted(written) == list(range(10))
+
+    def test_close_while_submitting(self):
+        written = []
+        writer = LogWriter(write=written.extend, batch_size=10, flush_interval=0.001, queue_size=5)
+
+        def submit(i):
+            try:
+                return writer.submit(i)
+            except RuntimeError:
+                return False
+
+        with ThreadPoolExecutor(8) as pool:
+            submitted = [pool.submit(submit, i) for i in range(500)]
+            writer.close()
+            accepted = [i for i, future in enumerate(submitted) if future.result()]
+
+        # every accepted entry is written, none is left behind _STOP
+        assert sorted(written) == accepted
+        writer.flush()
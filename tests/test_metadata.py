@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from mlopslite.artifacts.metadata import ColumnMetadata, DatasetMetadata
+from mlopslite.artifacts.profiling import approximate_unique
+
+testcase1 = pd.DataFrame(
+    {
+        "a": [1, 2, 3, 4, 5],
+        "b": [1.1, 2.1, 2.2, 2.3, 2.4],
+        "c": ["a", "b", "c", "d", None],
+        "d": [1, None, None, None, 2],
+        "t": [0, 1, 1, 1, 0],
+    }
+)
+
+
+def legacy_column_summary(column: pd.Series, converted_dtype: str) -> dict:
+    # reference implementation, as ColumnMetadata.create was originally written
+    summary = {
+        "null_count": len([i for i in column if pd.isna(i)]),
+        "unique_count": len(set([i for i in column if not pd.isna(i)])),
+    }
+    if converted_dtype in ["int", "float"]:
+        summary["min_value_num"] = float(min([i for i in column if not pd.isna(i)]))
+        summary["max_value_num"] = float(max([i for i in column if not pd.isna(i)]))
+    else:
+        summary["min_value_num"] = None
+        summary["max_value_num"] = None
+    return summary
+
+
+class TestProfiling:
+
+    def test_matches_legacy_summary(self):
+        metadata = DatasetMetadata.create(testcase1, name="t", version=None, description="")
+
+        for col in metadata.column_metadata:
+            expected = legacy_column_summary(testcase1[col.column_name], col.converted_dtype)
+            actual = {k: getattr(col, k) for k in expected.keys()}
+            assert actual == expected
+
+    def test_column_create(self):
+        col = ColumnMetadata.create("c", testcase1["c"])
+        assert col.converted_dtype == "str"
+        assert col.null_count == 1
+        assert col.unique_count == 4
+
+    def test_parallel_equals_serial(self):
+        serial = DatasetMetadata.create(testcase1, name="t", version=None, description="")
+        parallel = DatasetMetadata.create(testcase1, name="t", version=None, description="", parallel=True)
+        assert serial == parallel
+
+    def test_approximate_unique(self):
+        values = np.arange(100_000) % 25_000
+        estimate = approximate_unique(values)
+        assert abs(estimate - 25_000) / 25_000 < 0.05
+
+        strings = np.array([f"id-{i}" for i in range(1000)], dtype=object)
+        assert abs(approximate_unique(strings) - 1000) / 1000 < 0.05
@@ -0,0 +1,137 @@
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import update
+
+from mlopslite.client import MlopsLite
+from mlopslite.registry.datamodel import MonitoringWatermark
+from mlopslite.registry.monitoring import Monitor, population_stability_index
+from mlopslite.artifacts.sketches import ColumnSketch
+
+rng = np.random.default_rng(3)
+
+
+def bound_client(config, train_data, model, sketch=False) -> MlopsLite:
+    client = MlopsLite(config=config)
+    client.bind_dataset(train_data, name="train", sketch=sketch)
+    client.bind_deployable(model, name="m", target="target")
+    return client
+
+
+class TestMonitoring:
+
+    @pytest.mark.parametrize("log_format", ["normalized", "compact"])
+    def test_update_watermark(self, sqlite_config, train_data, model, log_format):
+        client = bound_client(replace(sqlite_config, log_format=log_format), train_data, model)
+        monitor = Monitor(client.registry, window_seconds=3600, batch_logs=2)
+
+        for i in range(5):
+            client.predict(train_data[["x1", "x2"]].iloc[i * 10:(i + 1) * 10], log=True)
+
+        stats = monitor.update()
+        assert (stats["logs"], stats["rows"]) == (5, 50)
+
+        # nothing new, nothing read
+        assert monitor.update()["rows"] == 0
+
+        client.predict(train_data[["x1", "x2"]].iloc[50:60], log=True)
+        assert monitor.update()["rows"] == 10
+
+        windows = monitor.windows("m")
+        assert set(windows["variable"]) == {"input:x1", "input:x2", "output:a", "output:b", "output:c"}
+        assert (windows["row_count"] == 60).all()
+
+        # merged across updates, same as aggregating the whole log at once
+        merged = ColumnSketch.from_bytes(
+            [i for i in client.registry.db.select_monitoring_windows(3600) if i["variable"] == "input:x1"][0]["sketch"]
+        )
+        whole = ColumnSketch("float")
+        whole.update(train_data["x1"].iloc[:60].to_numpy())
+        assert merged.kll.n == 60
+        assert merged.distinct_count() == whole.distinct_count()
+
+    def test_update_settled_log_ids(self, sqlite_config, train_data, model):
+        client = bound_client(replace(sqlite_config, log_settle_seconds=60), train_data, model)
+        monitor = Monitor(client.registry, window_seconds=3600)
+
+        def age_observation():
+            with client.registry.db.session.begin() as session:
+                session.execute(
+                    update(MonitoringWatermark).where(MonitoringWatermark.source == "normalized:observed")
+                    .values(updated_at=datetime.utcnow() - timedelta(seconds=61))
+                )
+
+        for i in range(3):
+            client.predict(train_data[["x1", "x2"]].iloc[i * 10:(i + 1) * 10], log=True)
+
+        # the max log id is observed, not aggregated yet
+        assert monitor.update()["rows"] == 0
+
+        client.predict(train_data[["x1", "x2"]].iloc[30:40], log=True)
+        age_observation()
+        stats = monitor.update()
+        assert (stats["rows"], stats["last_log_id"]) == (30, 3)
+
+        age_observation()
+        assert monitor.update()["rows"] == 10
+
+    def test_windows(self, sqlite_config, train_data, model):
+        client = bound_client(sqlite_config, train_data, model)
+        monitor = Monitor(client.registry, window_seconds=60)
+
+        start = datetime(2026, 1, 1, 10, 0, 30)
+        logged = pd.DataFrame({
+            "log_id": [1, 2, 3],
+            "deployable_id": client.deployable.metadata.id,
+            "request_time": [start, start + timedelta(seconds=20), start + timedelta(seconds=40)],
+            "row_index": 0,
+            "reference_id": None,
+            "input:x1": ["1.5", "2.5", None],
+            "input:x2": ["0.1", "0.2", "0.3"],
+            "output:a": [0.1, 0.2, 0.3],
+        })
+        aggregates = monitor.aggregate(logged)
+
+        minute = datetime(2026, 1, 1, 10, 0)
+        x1 = aggregates[(client.deployable.metadata.id, minute, "input:x1")]
+        assert (x1["row_count"], x1["null_count"]) == (2, 0)
+        assert aggregates[(client.deployable.metadata.id, minute + timedelta(minutes=1), "input:x1")]["null_count"] == 1
+        assert x1["sketch"].quantiles([0, 1]).tolist() == [1.5, 2.5]
+
+    def test_drift(self, sqlite_config, train_data, model):
+        client = bound_client(sqlite_config, train_data, model, sketch=True)
+
+        client.predict(train_data[["x1", "x2"]], log=True)
+        shifted = train_data[["x1", "x2"]].assign(x1=lambda i: i["x1"] + 2 * i["x1"].std())
+        client.predict(shifted, log=True)
+
+        drift = client.drift(combine=True)
+        assert drift["variable"].tolist() == ["input:x1", "input:x2"]
+        assert drift["row_count"].tolist() == [400, 400]
+
+        x1, x2 = drift["psi"].tolist()
+        assert x1 > 0.5 and x2 < 0.05
+        assert drift["ks"].iloc[0] > 0.3
+
+    def test_drift_without_stored_sketch(self, sqlite_config, train_data, model):
+        # baseline built from the training data when the dataset was bound without sketches
+        client = bound_client(sqlite_config, train_data, model)
+        client.predict(train_data[["x1", "x2"]], log=True)
+
+        drift = client.drift()
+        assert len(drift) == 2
+        assert (drift["psi"] < 0.01).all()
+        assert (drift["ks"] < 0.05).all()
+
+    def test_categorical_psi(self):
+        reference, same, shifted = ColumnSketch("str"), ColumnSketch("str"), ColumnSketch("str")
+        reference.update(rng.choice(["a", "b", "c"], size=5000, p=[0.5, 0.3, 0.2]).astype(object))
+        same.update(rng.choice(["a", "b", "c"], size=5000, p=[0.5, 0.3, 0.2]).astype(object))
+        shifted.update(rng.choice(["a", "b", "d"], size=5000, p=[0.2, 0.3, 0.5]).astype(object))
+
+        assert population_stability_index(reference, same) < 0.01
+        assert population_stability_index(reference, shifted) > 1
+        assert np.isnan(population_stability_index(reference, ColumnSketch("str")))
@@ -0,0 +1,184 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+from sqlalchemy import func, select
+
+from mlopslite.artifacts.dataset import create_dataset
+from mlopslite.client import MlopsLite
+from mlopslite.registry import datamodel
+
+
+def count(client: MlopsLite, table) -> int:
+    return client.registry.db.execute_select_query_single(select(func.count()).select_from(table))
+
+
+class TestRegistry:
+
+    def test_dataset_roundtrip(self, sqlite_config, train_data):
+        client = MlopsLite(config=sqlite_config)
+        client.bind_dataset(train_data, name="train")
+
+        pd.testing.assert_frame_equal(client.dataset.data, train_data)
+        assert client.list_datasets()["name"].tolist() == ["train"]
+
+        # same content is not pushed twice
+        client.bind_dataset(train_data, name="train")
+        assert len(client.list_datasets()) == 1
+
+    def test_push_dataset_versions(self, sqlite_config, train_data):
+        client = MlopsLite(config=sqlite_config)
+        registry = client.registry
+        first = registry.push_dataset_to_registry(create_dataset(train_data, name="train"))
+        second = registry.push_dataset_to_registry(create_dataset(train_data.head(100), name="train"))
+        other = registry.push_dataset_to_registry(create_dataset(train_data.head(50), name="other"))
+
+        assert [first["version"], second["version"], other["version"]] == [1, 2, 1]
+        assert count(client, datamodel.DatasetRegistryColumns) == 9
+
+        # existing hash, nothing inserted
+        again = registry.push_dataset_to_registry(create_dataset(train_data.head(100), name="renamed"))
+        assert (again["id"], again["name"], again["version"]) == (second["id"], "train", 2)
+        assert isinstance(again["created_at"], datetime)
+        assert count(client, datamodel.DatasetRegistry) == 3
+
+    def test_pull_dataset_lazy(self, sqlite_config, train_data):
+        client = MlopsLite(config=sqlite_config)
+        client.bind_dataset(train_data, name="train")
+        pushed = client.dataset.metadata
+
+        client.pull_dataset(pushed.id)
+        assert not client.dataset.is_loaded
+        # metadata comes from the stored column profiles, not recomputed
+        assert client.dataset.metadata == pushed
+        assert client.dataset.info()["column_name"].tolist() == ["x1", "x2", "target"]
+        assert not client.dataset.is_loaded
+
+        projected = client.dataset.load(columns=["x2"], rows=slice(10, 20))
+        pd.testing.assert_frame_equal(projected, train_data[["x2"]].iloc[10:20])
+        assert len(client.dataset.load(sample=0.5, random_state=1)) == len(train_data) // 2
+        assert not client.dataset.is_loaded
+
+        pd.testing.assert_frame_equal(client.dataset.data, train_data)
+        assert client.dataset.is_loaded
+
+    def test_predict_log(self, sqlite_config, train_data, model):
+        client = MlopsLite(config=sqlite_config)
+        client.bind_dataset(train_data, name="train")
+        client.bind_deployable(model, name="m", target="target")
+
+        input = train_data[["x1", "x2"]].head(5).assign(reference_id=[f"r{i}" for i in range(5)])
+        client.predict(input, log=True)
+
+        assert count(client, datamodel.ExecutionLog) == 1
+        assert count(client, datamodel.ExecutionItems) == 5
+        assert count(client, datamodel.RequestItems) == 10
+        assert count(client, datamodel.ResponseItems) == 15
+
+    def test_predict_log_async(self, sqlite_config, train_data, model):
+        client = MlopsLite(config=replace(sqlite_config, log_async=True, log_flush_interval=0.01))
+        client.bind_dataset(train_data, name="train")
+        client.bind_deployable(model, name="m", target="target")
+
+        for _ in range(3):
+            client.predict(train_data[["x1", "x2"]].head(5), log=True)
+        client.close()
+
+        assert count(client, datamodel.ExecutionLog) == 3
+        assert count(client, datamodel.ExecutionItems) == 15
+
+    def test_predict_batched(self, sqlite_config, train_data, model):
+        client = MlopsLite(config=sqlite_config)
+        client.bind_dataset(train_data, name="train")
+        client.bind_deployable(model, name="m", target="target")
+
+        inputs = [train_data[["x1", "x2"]].iloc[i:i + 2] for i in range(0, 20, 2)]
+        with ThreadPoolExecutor(4) as pool:
+            outputs = list(pool.map(lambda i: client.predict_batched(i, log=True), inputs))
+
+        assert client.get_batcher() is client.get_batcher("m")
+        assert [len(i) for i in outputs] == [2] * 10
+        client.close()
+
+        assert count(client, datamodel.ExecutionLog) == 10
+        assert count(client, datamodel.ExecutionItems) == 20
+
+    def test_predict_batch_logs_chunks(self, sqlite_config, train_data, model):
+        client = MlopsLite(config=replace(sqlite_config, log_format="compact"))
+        client.bind_dataset(train_data, name="train")
+        client.bind_deployable(model, name="m", target="target")
+
+        output = client.predict_batch(train_data[["x1", "x2"]], chunk_size=64, workers=2, log=True)
+
+        assert len(output) == len(train_data)
+        assert count(client, datamodel.ExecutionBatch) == 4
+        assert len(client.read_execution_log()) == len(train_data)
+
+    def test_read_execution_log(self, sqlite_config, train_data, model):
+        frames = {}
+        for log_format in ["normalized", "compact"]:
+            client = MlopsLite(config=replace(sqlite_config, db_constring=sqlite_config.db_constring + log_format, log_format=log_format))
+            client.bind_dataset(train_data, name="train")
+            client.bind_deployable(model, name="m", target="target")
+
+            input = train_data[["x1", "x2"]].head(4).assign(reference_id=["r0", None, "r2", None])
+            client.predict(input, log=True)
+            client.predict(input.head(2), log=True)
+
+            frames[log_format] = client.read_execution_log(deployable_id=client.deployable.metadata.id)
+
+        normalized, compact = frames["normalized"], frames["compact"]
+        assert list(compact.columns) == list(normalized.columns)
+        assert len(compact) == 6
+        assert compact["reference_id"].tolist() == ["r0", None, "r2", None, "r0", None]
+        assert compact["row_index"].tolist() == [0, 1, 2, 3, 0, 1]
+        assert np.allclose(compact["input:x1"], normalized["input:x1"].astype(float))
+        assert np.allclose(compact[["output:a", "output:b", "output:c"]], normalized[["output:a", "output:b", "output:c"]])
+
+    def test_multi_model_routing(self, sqlite_config, train_data, model):
+        client = MlopsLite(config=sqlite_config)
+        client.bind_dataset(train_data, name="train")
+        client.bind_deployable(model, name="m", target="target")
+
+        canary = clone(model).set_params(logisticregression__C=0.01).fit(train_data[["x1", "x2"]], train_data["target"])
+        client.bind_deployable(canary, name="m", target="target")
+        assert client.deployable.metadata.version == 2
+
+        input = train_data[["x1", "x2"]].head(3)
+        v1 = client.predict(input, deployable_id="m@1", output="arrays")
+        v2 = client.predict(input, deployable_id="m", output="arrays")
+        assert np.allclose(v2.results, client.predict(input, output="arrays").results)
+        assert not np.allclose(v1.results, v2.results)
+
+        primary, shadow = client.predict_shadow(input, deployable_id="m@1", shadow_id="m@2", output="arrays", log=True)
+        assert np.allclose(primary.results, v1.results)
+        assert np.allclose(shadow.results, v2.results)
+        assert client.get_deployable("m@1").input_schema is client.get_deployable("m@2").input_schema
+
+        assert count(client, datamodel.ExecutionLog) == 2
+
+    def test_resolve_deployable_id(self, sqlite_config, train_data, model):
+        client = MlopsLite(config=sqlite_config)
+        client.bind_dataset(train_data, name="train")
+        client.bind_deployable(model, name="m", target="target")
+        refit = clone(model).set_params(logisticregression__C=0.1).fit(train_data[["x1", "x2"]], train_data["target"])
+        client.bind_deployable(refit, name="m", target="target")
+        older = client.deployable
+
+        # v1 on another dataset, registered last
+        client.bind_dataset(train_data.head(100), name="other")
+        other = clone(model).fit(train_data[["x1", "x2"]].head(100), train_data["target"].head(100))
+        client.bind_deployable(other, name="m", target="target")
+        newest = client.deployable
+        assert (older.metadata.version, newest.metadata.version) == (2, 1)
+
+        registry = client.registry
+        assert registry.resolve_deployable_id("m") == newest.metadata.id
+        assert registry.resolve_deployable_id("m@2") == older.metadata.id
+        assert registry.resolve_deployable_id(np.int64(older.metadata.id)) == older.metadata.id
+        with pytest.raises(ValueError, match="ambiguous"):
+            registry.resolve_deployable_id("m@1")
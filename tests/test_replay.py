@@ -0,0 +1,116 @@
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+
+from mlopslite.client import MlopsLite
+from mlopslite.registry.replay import read_log_chunks
+
+
+def logged_client(config, train_data, model) -> MlopsLite:
+    client = MlopsLite(config=config)
+    client.bind_dataset(train_data, name="train")
+    client.bind_deployable(model, name="m", target="target")
+    for i in range(0, 60, 10):
+        input = train_data[["x1", "x2"]].iloc[i:i + 10].assign(reference_id=[f"r{j}" for j in range(i, i + 10)])
+        client.predict(input, log=True)
+    return client
+
+
+class TestPredictionLookup:
+
+    @pytest.mark.parametrize("log_format", ["normalized", "compact"])
+    def test_get_prediction(self, sqlite_config, train_data, model, log_format):
+        client = logged_client(replace(sqlite_config, log_format=log_format), train_data, model)
+
+        prediction = client.get_prediction("r23")
+        expected = client.predict(train_data[["x1", "x2"]].iloc[[23]])[0]["results"]
+
+        assert (prediction["name"], prediction["version"], prediction["row_index"]) == ("m", 1, 3)
+        assert prediction["log_id"] == client.read_execution_log()["log_id"].unique()[2]
+        assert float(prediction["input"]["x1"]) == pytest.approx(train_data["x1"].iloc[23])
+        assert prediction["output"] == pytest.approx(expected)
+        assert client.get_prediction("missing") is None
+
+    def test_get_prediction_null_input(self, sqlite_config, train_data, model):
+        # the normalized layout does not store null values, the compact payload keeps every column
+        client = logged_client(replace(sqlite_config, log_format="compact"), train_data, model)
+        client.predict(pd.DataFrame({"x1": [0.5], "x2": [None], "reference_id": ["null"]}), log=True)
+
+        prediction = client.get_prediction("null")
+        assert prediction["input"]["x2"] is None
+        assert float(prediction["input"]["x1"]) == pytest.approx(0.5)
+        assert set(prediction["output"]) == {"a", "b", "c"}
+
+    @pytest.mark.parametrize("log_format", ["normalized", "compact"])
+    def test_get_predictions_bulk(self, sqlite_config, train_data, model, log_format, monkeypatch):
+        monkeypatch.setattr("mlopslite.registry.registry.REFERENCE_LOOKUP_CHUNK", 7)
+        client = logged_client(replace(sqlite_config, log_format=log_format), train_data, model)
+
+        ids = [f"r{i}" for i in [55, 3, 17, 40, 41, 9, 30]] + ["missing", "r3"]
+        predictions = client.get_predictions(ids)
+
+        log = client.read_execution_log()
+        expected = log[log["reference_id"].isin(ids)].reset_index(drop=True)
+        assert predictions["reference_id"].tolist() == expected["reference_id"].tolist()
+        assert predictions["row_index"].tolist() == [3, 9, 7, 0, 0, 1, 5]
+        pd.testing.assert_frame_equal(
+            predictions.drop(columns=["name", "version"]), expected, check_dtype=False
+        )
+
+
+class TestReplay:
+
+    @pytest.mark.parametrize("log_format", ["normalized", "compact"])
+    def test_replay_against_new_version(self, sqlite_config, train_data, model, log_format):
+        client = logged_client(replace(sqlite_config, log_format=log_format, replay_batch_logs=4), train_data, model)
+        first = client.deployable
+
+        refit = clone(model).set_params(logisticregression__C=0.01).fit(train_data[["x1", "x2"]], train_data["target"])
+        client.bind_deployable(refit, name="m", target="target")
+
+        out = client.replay("m@1", workers=0)
+        expected = client.predict(train_data[["x1", "x2"]].head(60), output="arrays")
+
+        assert len(out) == 60
+        assert out["reference_id"].tolist() == [f"r{i}" for i in range(60)]
+        assert np.allclose(out[["replay:a", "replay:b", "replay:c"]].to_numpy(), expected.results)
+        assert np.allclose(
+            out[["output:a", "output:b", "output:c"]].to_numpy(), 
+            first.predict(train_data[["x1", "x2"]].head(60), output="arrays").results
+        )
+
+    def test_replay_to_sink(self, sqlite_config, tmp_path, train_data, model):
+        client = logged_client(replace(sqlite_config, replay_batch_logs=2), train_data, model)
+        log = client.read_execution_log()
+
+        start = log["request_time"].iloc[20]
+        path = tmp_path / "replay.parquet"
+        assert client.replay("m", start=start, sink=str(path), workers=0) == 40
+
+        out = pd.read_parquet(path)
+        assert out["log_id"].tolist() == log["log_id"].iloc[20:].tolist()
+        assert np.allclose(out["replay:a"], out["output:a"])
+
+        chunks = []
+        assert client.replay("m", sink=chunks.append, workers=0) == 60
+        assert [len(i) for i in chunks] == [20, 20, 20]
+
+    def test_read_log_chunks_pages(self, sqlite_config, train_data, model):
+        client = logged_client(sqlite_config, train_data, model)
+        first = client.deployable
+
+        # interleaved with another deployable's entries
+        refit = clone(model).set_params(logisticregression__C=0.01).fit(train_data[["x1", "x2"]], train_data["target"])
+        client.bind_deployable(refit, name="m", target="target")
+        for i in range(5):
+            client.predict(train_data[["x1", "x2"]].iloc[:3], log=True)
+            client.predict(train_data[["x1", "x2"]].iloc[:3], deployable_id=first.metadata.id, log=True)
+
+        chunks = list(read_log_chunks(client.registry, first.metadata.id, batch_logs=4))
+        assert [i["log_id"].nunique() for i in chunks] == [4, 4, 3]
+        assert all((i["deployable_id"] == first.metadata.id).all() for i in chunks)
+        assert sum(len(i) for i in chunks) == 75
+
@@ -0,0 +1,137 @@
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+
+from mlopslite.client import MlopsLite
+from mlopslite.registry.registry import ExecutionLogEntry
+from mlopslite.registry.registryconfig import RegistryConfig
+from mlopslite.registry.retention import LogRetention
+
+
+def log_at(client: MlopsLite, deployable, input: pd.DataFrame, request_time: datetime) -> None:
+    output = deployable.predict(input, output="arrays")
+    client.registry.write_execution_logs([ExecutionLogEntry(deployable.metadata.id, request_time, input, output)])
+
+
+class TestRetention:
+
+    @pytest.mark.parametrize("log_format", ["normalized", "compact"])
+    def test_archive_and_prune(self, sqlite_config, tmp_path, train_data, model, log_format):
+        config = replace(
+            sqlite_config, log_format=log_format, log_retention_days=30, log_archive_dir=str(tmp_path / "archive"), log_prune_batch_size=2
+        )
+        client = MlopsLite(config=config)
+        client.bind_dataset(train_data, name="train")
+        client.bind_deployable(model, name="m", target="target")
+
+        now = datetime(2026, 6, 1)
+        input = train_data[["x1", "x2"]].head(3).assign(reference_id=["r0", None, "r2"])
+        for days in [90, 60, 45, 31, 10, 1]:
+            log_at(client, client.deployable, input, now - timedelta(days=days))
+        before = client.read_execution_log()
+
+        stats = client.prune_logs(now=now)
+        assert (stats["logs"], stats["rows"], stats["files"]) == (4, 12, 2)
+
+        kept = client.read_execution_log()
+        assert kept["request_time"].min() >= now - timedelta(days=30)
+        assert len(kept) == 6
+
+        archived = client.read_log_archive("m")
+        pd.testing.assert_frame_equal(
+            archived.drop(columns="request_time"),
+            before.head(12).drop(columns="request_time").reset_index(drop=True),
+            check_dtype=False
+        )
+        assert client.read_log_archive(start=now - timedelta(days=50))["log_id"].nunique() == 2
+
+        # nothing left to prune
+        assert client.prune_logs(now=now, vacuum=True)["logs"] == 0
+
+    def test_shared_archive_dir(self, tmp_path, train_data, model):
+        # two registries with the same deployable and log ids, one archive directory
+        now = datetime(2026, 6, 1)
+        clients = []
+        for name in ["a", "b"]:
+            config = RegistryConfig(
+                db_constring=f"sqlite:///{tmp_path / name}.db", log_retention_days=30, log_archive_dir=str(tmp_path / "archive")
+            )
+            client = MlopsLite(config=config)
+            client.bind_dataset(train_data, name="train")
+            client.bind_deployable(model, name="m", target="target")
+            rows = 2 if name == "a" else 3
+            for days in [60, 45, 1]:
+                log_at(client, client.deployable, train_data[["x1", "x2"]].head(rows), now - timedelta(days=days))
+            client.prune_logs(now=now)
+            clients.append(client)
+
+        assert [len(i.read_log_archive("m")) for i in clients] == [4, 6]
+
+    def test_retention_per_deployable(self, sqlite_config, train_data, model):
+        config = replace(
+            sqlite_config, log_retention={"m@1": 7, "other": None}, log_retention_days=60, log_archive_dir=None
+        )
+        client = MlopsLite(config=config)
+        client.bind_dataset(train_data, name="train")
+        client.bind_deployable(model, name="m", target="target")
+        first = client.deployable
+
+        refit = lambda c: clone(model).set_params(logisticregression__C=c).fit(train_data[["x1", "x2"]], train_data["target"])
+        client.bind_deployable(refit(0.1), name="m", target="target")
+        second = client.deployable
+        client.bind_deployable(refit(10.0), name="other", target="target")
+        other = client.deployable
+
+        now = datetime(2026, 6, 1)
+        for deployable in [first, second, other]:
+            for days in [90, 30, 1]:
+                log_at(client, deployable, train_data[["x1", "x2"]].head(2), now - timedelta(days=days))
+
+        retention = LogRetention(client.registry)
+        assert [retention.retention_days(i.metadata.name, i.metadata.version) for i in [first, second, other]] == [7, 60, None]
+
+        stats = retention.run(now=now)
+        assert (stats["deployables"], stats["logs"], stats["files"]) == (2, 3, 0)
+
+        counts = client.read_execution_log().groupby("deployable_id")["log_id"].nunique()
+        assert counts.to_dict() == {first.metadata.id: 1, second.metadata.id: 2, other.metadata.id: 3}
+
+    def test_prune_waits_for_watermarks(self, sqlite_config, train_data, model):
+        client = MlopsLite(config=replace(sqlite_config, log_retention_days=1, log_archive_dir=None))
+        client.bind_dataset(train_data, name="train")
+        client.bind_deployable(model, name="m", target="target")
+
+        now = datetime(2026, 6, 1)
+        for days in [5, 4]:
+            log_at(client, client.deployable, train_data[["x1", "x2"]].head(2), now - timedelta(days=days))
+        client.get_rollup().update()
+        log_at(client, client.deployable, train_data[["x1", "x2"]].head(2), now - timedelta(days=3))
+
+        # the last entry is not rolled up yet
+        assert client.prune_logs(now=now)["logs"] == 2
+
+        log_at(client, client.deployable, train_data[["x1", "x2"]].head(2), now)
+        assert client.metrics(freq=None, update=True)["requests"].item() == 4
+        assert client.prune_logs(now=now)["logs"] == 1
+        assert np.isclose(client.metrics(freq=None, update=False)["rows"].item(), 8)
+
+    def test_keeps_newest_entry(self, sqlite_config, train_data, model):
+        client = MlopsLite(config=replace(sqlite_config, log_retention_days=1, log_archive_dir=None))
+        client.bind_dataset(train_data, name="train")
+        client.bind_deployable(model, name="m", target="target")
+
+        now = datetime(2026, 6, 1)
+        for days in [5, 4]:
+            log_at(client, client.deployable, train_data[["x1", "x2"]].head(2), now - timedelta(days=days))
+        monitor = client.get_monitor()
+        monitor.update()
+
+        assert client.prune_logs(now=now)["logs"] == 1
+
+        # ids keep increasing, the new entry is past the watermark
+        log_at(client, client.deployable, train_data[["x1", "x2"]].head(2), now)
+        assert monitor.update()["logs"] == 1
@@ -0,0 +1,91 @@
+from dataclasses import replace
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlopslite.client import MlopsLite
+from mlopslite.registry.rollup import Rollup, choose_bucket_seconds
+
+
+def logged_client(config, train_data, model, sizes: list[int]) -> MlopsLite:
+    client = MlopsLite(config=config)
+    client.bind_dataset(train_data, name="train")
+    client.bind_deployable(model, name="m", target="target")
+    for i, size in enumerate(sizes):
+        client.predict(train_data[["x1", "x2"]].iloc[i:i + size], log=True)
+    return client
+
+
+class TestRollup:
+
+    @pytest.mark.parametrize("log_format", ["normalized", "compact"])
+    def test_metrics_match_log(self, sqlite_config, train_data, model, log_format):
+        sizes = [1, 5, 10, 2, 7, 30]
+        client = logged_client(replace(sqlite_config, log_format=log_format), train_data, model, sizes)
+
+        metrics = client.metrics(freq=None)
+        log = client.read_execution_log()
+
+        assert len(metrics) == 1
+        row = metrics.iloc[0]
+        assert (row["requests"], row["rows"], row["request_size_max"]) == (6, 55, 30)
+        assert row["request_size_mean"] == pytest.approx(55 / 6)
+        assert row["request_size_p50"] in sizes
+        for c in ["a", "b", "c"]:
+            assert row[f"output:{c}"] == pytest.approx(log[f"output:{c}"].mean())
+
+    def test_incremental_update(self, sqlite_config, train_data, model):
+        client = logged_client(sqlite_config, train_data, model, [3] * 5)
+        rollup = Rollup(client.registry, bucket_seconds=[60, 3600], batch_logs=2)
+
+        stats = rollup.update()
+        assert stats["logs"] == 5 and stats["last_log_id"] == 5
+        assert rollup.update()["logs"] == 0
+
+        client.predict(train_data[["x1", "x2"]].head(4), log=True)
+        assert rollup.update()["logs"] == 1
+
+        # same totals from either bucket size
+        minute = rollup.metrics(freq=None, quantiles=())
+        assert (minute["requests"].item(), minute["rows"].item()) == (6, 19)
+        rows = client.registry.db.select_execution_rollups(3600)
+        assert sum(i["rows"] for i in rows) == 19
+
+        # a bucket size added later is filled from the start of the log
+        assert Rollup(client.registry, bucket_seconds=[60, 3600, 86400]).update()["logs"] == 6
+        assert sum(i["rows"] for i in client.registry.db.select_execution_rollups(86400)) == 19
+
+    def test_metrics_intervals(self, sqlite_config, train_data, model):
+        client = logged_client(sqlite_config, train_data, model, [])
+        rollup = client.get_rollup()
+        id = client.deployable.metadata.id
+
+        # two hours of logs, written with explicit request times
+        for minute in [0, 30, 59, 60, 90]:
+            entry = pd.DataFrame({"x1": [0.0, 1.0], "x2": [1.0, 0.0]})
+            client.registry.db.insert_execution_logs([{
+                "deployable_id": id,
+                "request_time": datetime(2026, 1, 1, 10) + pd.Timedelta(minutes=minute),
+                "request_size": len(entry),
+                "items": [{"reference_id": None, "request": [], "response": [("a", 0.5)]}] * len(entry)
+            }])
+        rollup.update()
+
+        hourly = rollup.metrics("m", freq=3600)
+        assert hourly["interval_start"].tolist() == [datetime(2026, 1, 1, 10), datetime(2026, 1, 1, 11)]
+        assert hourly["requests"].tolist() == [3, 2]
+        assert np.allclose(hourly["output:a"], 0.5)
+
+        ranged = rollup.metrics(start=datetime(2026, 1, 1, 10, 30), end=datetime(2026, 1, 1, 11, 30), freq=None)
+        assert ranged["requests"].tolist() == [3]
+
+        assert rollup.metrics(start=datetime(2027, 1, 1)).empty
+
+    def test_choose_bucket_seconds(self):
+        levels = [60, 3600, 86400]
+        assert choose_bucket_seconds(levels) == 86400
+        assert choose_bucket_seconds(levels, freq=3600) == 3600
+        assert choose_bucket_seconds(levels, freq=86400, start=datetime(2026, 1, 1, 6)) == 3600
+        assert choose_bucket_seconds(levels, start=datetime(2026, 1, 1, 6, 30, 15)) == 60
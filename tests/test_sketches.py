@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlopslite.artifacts.dataset import create_dataset
+from mlopslite.artifacts.profiling import ColumnProfile
+from mlopslite.artifacts.sketches import ColumnSketch, FrequentItems, HyperLogLog, KLLSketch
+from mlopslite.client import MlopsLite
+
+rng = np.random.default_rng(1)
+
+
+class TestSketches:
+
+    def test_hll_merge(self):
+        values = np.arange(50_000) % 20_000
+        left, right, whole = HyperLogLog(), HyperLogLog(), HyperLogLog()
+        left.update(values[:25_000])
+        right.update(values[25_000:])
+        whole.update(values)
+
+        assert left.merge(right).estimate() == whole.estimate()
+        assert abs(whole.estimate() - 20_000) / 20_000 < 0.05
+
+    def test_kll_quantiles(self):
+        values = rng.normal(size=200_000)
+        sketch = KLLSketch()
+        for chunk in np.array_split(values, 7):
+            part = KLLSketch()
+            part.update(chunk)
+            sketch.merge(part)
+
+        q = np.array([0.01, 0.1, 0.5, 0.9, 0.99])
+        assert sketch.n == len(values)
+        assert sum(len(i) for i in sketch.levels) < 1000
+        # rank error, not value error
+        assert np.abs(np.searchsorted(np.sort(values), sketch.quantiles(q)) / len(values) - q).max() < 0.02
+        assert np.abs(sketch.cdf([-1.0, 0.0, 1.0]) - [0.1587, 0.5, 0.8413]).max() < 0.02
+
+    def test_frequent_items(self):
+        heavy = np.repeat(["a", "b", "c"], [5000, 3000, 2000])
+        noise = np.array([f"id-{i}" for i in range(20_000)])
+        values = rng.permutation(np.concatenate([heavy, noise]))
+
+        items = FrequentItems(capacity=16)
+        for chunk in np.array_split(values, 10):
+            items.update(chunk)
+
+        top = items.top(3)
+        assert [i[0] for i in top] == ["a", "b", "c"]
+        assert all(c <= true and c >= true - items.error for (_, c), true in zip(top, [5000, 3000, 2000]))
+        assert len(items.counters) <= 16
+
+    @pytest.mark.parametrize("dtype,values", [
+        ("float", rng.normal(size=1000)),
+        ("int", rng.integers(0, 100, size=1000)),
+        ("str", np.array([f"v{i % 37}" for i in range(1000)], dtype=object)),
+        ("bool", rng.random(1000) > 0.3),
+    ])
+    def test_column_sketch_roundtrip(self, dtype, values):
+        sketch = ColumnSketch(dtype)
+        sketch.update(values)
+        restored = ColumnSketch.from_bytes(sketch.to_bytes())
+
+        assert restored == sketch
+        assert restored.distinct_count() == sketch.distinct_count()
+        if dtype in ["int", "float"]:
+            assert np.array_equal(restored.quantiles([0.25, 0.75]), sketch.quantiles([0.25, 0.75]))
+        if dtype != "float":
+            assert restored.top_values(3) == sketch.top_values(3)
+
+    def test_profile_with_sketch(self):
+        column = pd.Series(rng.integers(0, 500, size=10_000)).astype(float).where(rng.random(10_000) > 0.1)
+        whole, left, right = (ColumnProfile("float", exact_unique=False, sketch=True) for _ in range(3))
+        whole.update(column)
+        left.update(column.iloc[:4000])
+        right.update(column.iloc[4000:])
+
+        merged = left.merge(right).summary()
+        assert merged["null_count"] == whole.summary()["null_count"]
+        assert merged["unique_count"] == whole.summary()["unique_count"]
+        assert abs(merged["sketch"].quantiles(0.5)[0] - column.median()) < 25
+
+    def test_registry_roundtrip(self, sqlite_config, train_data):
+        client = MlopsLite(config=sqlite_config)
+        client.bind_dataset(train_data, name="train", sketch=True)
+        pushed = create_dataset(train_data, name="train", sketch=True).metadata
+
+        pulled = client.dataset.metadata.column_metadata
+        assert [i.sketch for i in pulled] == [i.sketch for i in pushed.column_metadata]
+        assert pulled[2].sketch.top_values(3)[0][0] in ["a", "b", "c"]
+        assert np.isclose(pulled[0].sketch.quantiles(0.5)[0], train_data["x1"].median(), atol=0.1)
+
+        # no sketch, column stays null
+        client.bind_dataset(train_data.head(10), name="small")
+        assert all(i.sketch is None for i in client.dataset.metadata.column_metadata)
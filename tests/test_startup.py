@@ -0,0 +1,48 @@
+import json
+import subprocess
+import sys
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+from mlopslite.alembic_setup import get_alembic_ini, get_migration_script_location
+from mlopslite.client import MlopsLite
+from mlopslite.registry.db import SCHEMA_HEAD
+
+# import + client construction against an up to date registry, in a fresh interpreter
+STARTUP_BUDGET = 2.0  # seconds
+
+STARTUP_SCRIPT = """
+import json, sys
+from time import perf_counter
+
+start = perf_counter()
+from mlopslite.client import MlopsLite
+from mlopslite.registry.registryconfig import RegistryConfig
+MlopsLite(config=RegistryConfig(db_constring=sys.argv[1]))
+elapsed = perf_counter() - start
+
+heavy = [i for i in ["sklearn", "pydantic", "alembic", "scipy"] if i in sys.modules]
+print(json.dumps({"elapsed": elapsed, "heavy": heavy}))
+"""
+
+
+class TestStartup:
+
+    def test_schema_head(self):
+        config = Config(get_alembic_ini())
+        config.set_main_option("script_location", get_migration_script_location())
+        assert ScriptDirectory.from_config(config).get_heads() == [SCHEMA_HEAD]
+
+    def test_startup_budget(self, sqlite_config):
+        # registry created and migrated upfront
+        MlopsLite(config=sqlite_config)
+
+        out = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT, sqlite_config.db_constring], 
+            capture_output=True, text=True, check=True
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+
+        assert result["heavy"] == []
+        assert result["elapsed"] < STARTUP_BUDGET
@@ -0,0 +1,94 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlopslite.artifacts import storage
+from mlopslite.registry.columncache import DatasetColumnCache
+
+testcase1 = pd.DataFrame(
+    {
+        "a": [1, 2, 3, 4, 5],
+        "b": [1.1, 2.1, np.nan, 2.3, 2.4],
+        "c": ["a", "b", "c", "d", None],
+        "d": pd.to_datetime(["2023-01-01", None, "2023-01-03", "2023-01-04", "2023-01-05"]),
+        "t": [True, False, True, True, False],
+    }
+)
+
+
+class TestStorage:
+
+    @pytest.mark.parametrize("format", ["npy", "npz"])
+    def test_numpy_roundtrip(self, format):
+        blob = storage.encode_dataset(testcase1, format=format)
+        decoded = storage.decode_dataset(blob, format=format)
+        pd.testing.assert_frame_equal(decoded, testcase1)
+
+    @pytest.mark.parametrize("format", ["parquet", "arrow"])
+    def test_arrow_roundtrip(self, format):
+        pytest.importorskip("pyarrow")
+        blob = storage.encode_dataset(testcase1, format=format)
+        decoded = storage.decode_dataset(blob, format=format, columns=["a", "c"])
+        pd.testing.assert_frame_equal(decoded, testcase1[["a", "c"]])
+
+    def test_column_projection(self):
+        blob = storage.encode_dataset(testcase1, format="npz")
+        decoded = storage.decode_dataset(blob, format="npz", columns=["c", "a"])
+        pd.testing.assert_frame_equal(decoded, testcase1[["c", "a"]])
+
+    def test_multiple_frames(self):
+        blob = storage.encode_frame(testcase1.iloc[:2]) + storage.encode_frame(testcase1.iloc[2:])
+        decoded = storage.decode_dataset(blob, format="npy")
+        pd.testing.assert_frame_equal(decoded, testcase1)
+
+    def test_invalid_format(self):
+        with pytest.raises(ValueError):
+            storage.encode_dataset(testcase1, format="json")
+
+    @pytest.mark.parametrize("format", ["npy", "npz", "parquet", "arrow"])
+    def test_chunked_writer(self, format, tmp_path):
+        if format in ["parquet", "arrow"]:
+            pytest.importorskip("pyarrow")
+
+        with open(tmp_path / "data", "wb") as f:
+            writer = storage.DatasetWriter(f, format=format)
+            for start in range(0, len(testcase1), 2):
+                writer.write(testcase1.iloc[start:start + 2])
+            writer.close()
+
+        decoded = storage.decode_dataset((tmp_path / "data").read_bytes(), format=format)
+        pd.testing.assert_frame_equal(decoded, testcase1)
+
+    def test_variable_length_strings(self):
+        data = pd.DataFrame({"s": ["x" * 10_000, "", None, "ünïcode"] + ["a"] * 996})
+        frame = storage.encode_frame(data)
+        parts = storage.column_to_arrays(data["s"])
+
+        assert parts["values"].dtype == np.uint8
+        assert parts["values"].nbytes == 10_000 + len("ünïcode".encode("utf-8")) + 996
+        assert len(frame) < 100_000
+        pd.testing.assert_frame_equal(storage.decode_dataset(frame, format="npy"), data)
+
+    def test_nullable_bool_column(self, tmp_path):
+        # as read by pd.read_csv from a bool column with a blank cell
+        data = pd.read_csv(io.StringIO("a,b\n1,True\n2,\n3,False\n"))
+        assert data["b"].dtype == object
+
+        parts = storage.column_to_arrays(data["b"])
+        assert parts["values"].dtype == bool and parts["mask"].tolist() == [False, True, False]
+
+        decoded = storage.decode_dataset(storage.encode_dataset(data, format="npz"), format="npz")
+        assert decoded["b"].tolist() == [True, None, False]
+
+        cache = DatasetColumnCache(str(tmp_path))
+        cache.write("h", data)
+        assert cache.read_frame("h")["b"].tolist() == [True, None, False]
+
+    def test_mixed_object_column(self):
+        data = pd.DataFrame({"m": [1, "a", None, 2.5]})
+
+        decoded = storage.decode_dataset(storage.encode_dataset(data, format="npz"), format="npz")
+        # stored as the column's 'str' primitive, as Dataset.convert_to_dict
+        assert decoded["m"].tolist() == ["1", "a", None, "2.5"]